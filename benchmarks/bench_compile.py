@@ -0,0 +1,108 @@
+"""Compare the compiled :meth:`cion.Schema.validate` with the interpreted field loop it replaced
+
+Run with ``python benchmarks/bench_compile.py``
+"""
+import sys
+from collections import defaultdict
+from timeit import repeat
+from typing import Any
+
+sys.path.insert(0, ".")
+
+import cion
+from cion.options import ExtraFields
+
+
+def interpreted_validate(schema: cion.Schema, data: dict[Any, Any]) -> dict[Any, Any]:
+    """The field loop that :meth:`cion.Schema.validate` ran before schemas were compiled"""
+    errors = defaultdict(list)
+    filtered: dict[str, Any] = {}
+
+    def raise_error(field_name: str, error_message: str, *, delete_field: bool = True):
+        if delete_field is True:
+            data.pop(field_name, None)
+        if schema.options.stop_on_error is True:
+            raise cion.ValidationError({field_name: [error_message]}, {})
+        errors[field_name].append(error_message)
+
+    for name, options in schema.fields.items():
+        try:
+            value = data[name]
+        except KeyError:
+            if options.required is True and options.default is None:
+                raise_error(name, "This field is required", delete_field=False)
+                continue
+            if options.default is not None:
+                value = options.default
+            else:
+                continue
+
+        if value is None:
+            if options.nullable is not True:
+                raise_error(name, "This field is not allowed to be None")
+                continue
+
+        for filter_ in options.filters:
+            if value is not None:
+                try:
+                    value = filter_(value)
+                except Exception as error:
+                    if isinstance(error, cion.ValidatorError):
+                        raise_error(name, error.message)
+                    continue
+
+        filtered[name] = value
+
+    if schema.options.extra is ExtraFields.COMBINE:
+        filtered = filtered | {key: value for key, value in data.items() if key not in schema.fields}
+
+    if schema.options.extra is ExtraFields.ERROR:
+        extra = [key for key in data if key not in schema.fields]
+        if extra:
+            raise_error(cion.schema.RESERVED_ERROR_KEY, f"Found extra data: {', '.join(extra)}", delete_field=False)
+
+    if bool(errors):
+        raise cion.ValidationError(errors, filtered)
+
+    return filtered
+
+
+def narrow_schema() -> tuple[cion.Schema, dict[str, Any]]:
+    schema = cion.Schema(
+        fields={
+            "username": cion.Field(filters=[cion.types.string(), cion.validators.length(3, 64)], required=True),
+            "password": cion.Field(filters=[cion.types.string(), cion.validators.length(8, 1024)], required=True),
+            "age": cion.Field(filters=[cion.types.integer(), cion.validators.range_(0, 150)], default=18),
+        }
+    )
+    return schema, {"username": "meizuflux", "password": "password1234"}
+
+
+def wide_schema(width: int = 120) -> tuple[cion.Schema, dict[str, Any]]:
+    fields = {}
+    data = {}
+    for i in range(width):
+        if i % 2 == 0:
+            fields[f"field_{i}"] = cion.Field(filters=[cion.types.string(), cion.validators.length(1, 32)])
+            data[f"field_{i}"] = f"value {i}"
+        else:
+            fields[f"field_{i}"] = cion.Field(filters=[cion.types.integer(), cion.validators.range_(0, 1000)])
+            data[f"field_{i}"] = i
+    return cion.Schema(fields=fields), data
+
+
+def bench(name: str, schema: cion.Schema, data: dict[str, Any], number: int) -> None:
+    compiled = schema.compile()
+    interpreted = min(repeat(lambda: interpreted_validate(schema, dict(data)), number=number, repeat=5))
+    generated = min(repeat(lambda: compiled(dict(data)), number=number, repeat=5))
+
+    print(
+        f"{name:<8} interpreted {interpreted / number * 1e6:8.2f}us  "
+        f"compiled {generated / number * 1e6:8.2f}us  "
+        f"speedup {interpreted / generated:5.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    bench("narrow", *narrow_schema(), number=100_000)
+    bench("wide", *wide_schema(), number=5_000)
@@ -0,0 +1,35 @@
+"""Compare the regex engines of :func:`cion.validators.email` and :func:`cion.validators.url` with the ones that
+don't use the regex engine, on common and on long hostile values
+
+Run with ``python benchmarks/bench_engines.py``
+"""
+import sys
+from timeit import repeat
+from typing import Any, Callable
+
+sys.path.insert(0, ".")
+
+import cion
+
+EMAIL = {"regex": cion.validators.email().check, "fast": cion.validators.email(engine="fast").check}
+URL = {"regex": cion.validators.url().check, "parse": cion.validators.url(engine="parse").check}
+
+
+def bench(name: str, engines: dict[str, Callable[[Any], Any]], value: str, number: int = 100_000) -> None:
+    (regex, engine), (other, fast) = engines.items()
+    slow = min(repeat(lambda: engine(value), number=number, repeat=5))
+    quick = min(repeat(lambda: fast(value), number=number, repeat=5))
+
+    print(
+        f"{name:<16} {regex} {slow / number * 1e6:6.2f}us  "
+        f"{other} {quick / number * 1e6:6.2f}us  speedup {slow / quick:5.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    bench("email", EMAIL, "hello@meizuflux.com")
+    bench("email too long", EMAIL, "a" * 10_000)
+    bench("email hostile", EMAIL, "a" * 200 + "@" + "b." * 25 + "!")
+    bench("url", URL, "https://example.com")
+    bench("url too long", URL, "https://" + "a" * 10_000)
+    bench("url hostile", URL, "https://" + "a" * 250 + "!")
@@ -0,0 +1,54 @@
+"""Compare the failure path of filters that return :class:`cion.Invalid` with filters that raise
+
+Run with ``python benchmarks/bench_failures.py``
+"""
+import sys
+from timeit import repeat
+from typing import Any, Callable
+
+sys.path.insert(0, ".")
+
+import cion
+
+
+def raising(filter_: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Hide the filter's ``check``, so that the schema has to catch the ValidatorError it raises"""
+    return lambda value: filter_(value)
+
+
+def filters() -> dict[str, list[Callable[[Any], Any]]]:
+    return {
+        "name": [cion.types.string(), cion.validators.length(3, 64)],
+        "age": [cion.types.integer(), cion.validators.range_(0, 150)],
+        "role": [cion.validators.one_of("admin", "user")],
+    }
+
+
+CHECKED = cion.Schema(fields={name: cion.Field(filters=chain) for name, chain in filters().items()})
+RAISING = cion.Schema(
+    fields={name: cion.Field(filters=[raising(f) for f in chain]) for name, chain in filters().items()}
+)
+
+
+def validate(schema: cion.Schema, data: dict[str, Any]) -> None:
+    try:
+        schema.validate(data)
+    except cion.ValidationError:
+        pass
+
+
+def bench(name: str, data: dict[str, Any], number: int = 100_000) -> None:
+    raised = min(repeat(lambda: validate(RAISING, dict(data)), number=number, repeat=5))
+    returned = min(repeat(lambda: validate(CHECKED, dict(data)), number=number, repeat=5))
+
+    print(
+        f"{name:<8} raising {raised / number * 1e6:6.2f}us  "
+        f"returning Invalid {returned / number * 1e6:6.2f}us  speedup {raised / returned:5.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    bench("valid", {"name": "meizuflux", "age": 20, "role": "admin"})
+    bench("invalid", {"name": "m", "age": 200, "role": "root"})
+    CHECKED.options.stop_on_error = RAISING.options.stop_on_error = True
+    bench("stop", {"name": "m", "age": 200, "role": "root"})
@@ -0,0 +1,56 @@
+"""Compare :meth:`cion.Schema.validate_json` with ``json.loads`` followed by :meth:`cion.Schema.validate`
+
+Run with ``python benchmarks/bench_json.py``, with and without orjson installed
+"""
+import json
+import sys
+from timeit import repeat
+
+sys.path.insert(0, ".")
+
+import cion
+
+LOGIN = cion.Schema(
+    fields={
+        "username": cion.Field(filters=[cion.types.string(), cion.validators.length(3, 64)], required=True),
+        "password": cion.Field(filters=[cion.types.string(), cion.validators.length(8, 1024)], required=True),
+    }
+)
+LOGIN_PAYLOAD = json.dumps({"username": "meizuflux", "password": "password1234", "remember": True}).encode()
+
+ITEM = cion.Schema(
+    fields={
+        "sku": cion.Field(filters=[cion.types.string(), cion.validators.length(equal_to=8)], required=True),
+        "quantity": cion.Field(filters=[cion.types.integer(), cion.validators.range_(1, 100)], required=True),
+    }
+)
+ORDER = cion.Schema(
+    fields={
+        "customer": cion.Field(filters=[cion.validators.email()], required=True),
+        "currency": cion.Field(filters=[cion.validators.one_of("EUR", "USD", "GBP")], default="EUR"),
+        "items": cion.Field(items=ITEM, required=True),
+    }
+)
+ORDER_PAYLOAD = json.dumps(
+    {
+        "customer": "hello@meizuflux.com",
+        "currency": "USD",
+        "items": [{"sku": f"SKU{i:05}", "quantity": i % 10 + 1} for i in range(50)],
+        "metadata": {"source": "web", "tracking": list(range(100))},
+    }
+).encode()
+
+
+def bench(name: str, schema: cion.Schema, payload: bytes, number: int) -> None:
+    loads = min(repeat(lambda: schema.validate(dict(json.loads(payload))), number=number, repeat=5))
+    direct = min(repeat(lambda: schema.validate_json(payload), number=number, repeat=5))
+
+    print(
+        f"{name:<6} json.loads + validate {loads / number * 1e6:7.2f}us  "
+        f"validate_json {direct / number * 1e6:7.2f}us  speedup {loads / direct:5.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    bench("login", LOGIN, LOGIN_PAYLOAD, number=100_000)
+    bench("order", ORDER, ORDER_PAYLOAD, number=5_000)
@@ -0,0 +1,93 @@
+"""Compare the memory and the time it takes to validate rows into dicts with the outputs of :class:`cion.Schema`
+
+Run with ``python benchmarks/bench_output.py``, or ``python benchmarks/bench_output.py --rows 100000`` for a quick run
+
+Validating a single row takes about as long with every output. Keeping a million of them can take longer
+than keeping dicts though, since the garbage collector doesn't track dicts that only have atomic values,
+but does track every object, so consider ``gc.freeze()`` after loading a large batch.
+"""
+import argparse
+import dataclasses
+import gc
+import sys
+import tracemalloc
+from time import perf_counter
+from typing import Any, NamedTuple, Optional
+
+sys.path.insert(0, ".")
+
+import cion
+
+
+class Row(NamedTuple):
+    id: int
+    name: str
+    email: str
+    age: int
+    active: bool
+
+
+@dataclasses.dataclass(slots=True)
+class RowData:
+    id: int
+    name: str
+    email: str
+    age: int
+    active: bool
+
+
+OUTPUTS: dict[str, Optional[Any]] = {"dict": None, "slots": "slots", "NamedTuple": Row, "dataclass": RowData}
+
+
+def schema(output: Optional[Any]) -> cion.Schema:
+    return cion.Schema(
+        fields={
+            "id": cion.Field(filters=[cion.types.integer()], required=True),
+            "name": cion.Field(filters=[cion.types.string(), cion.validators.length(1, 64)], required=True),
+            "email": cion.Field(filters=[cion.types.string()], required=True),
+            "age": cion.Field(filters=[cion.converters.integer(), cion.validators.range_(0, 150)], default=18),
+            "active": cion.Field(filters=[cion.converters.boolean()], default=True),
+        },
+        options=cion.Options(mutate_data=False),
+        output=output,
+    )
+
+
+def bench(name: str, output: Optional[Any], rows: list[dict[str, Any]]) -> None:
+    validate = schema(output).validate
+    # tracemalloc slows down every allocation, so the time is measured in a separate run
+    gc.collect()
+    started = perf_counter()
+    validated = [validate(row) for row in rows]
+    elapsed = perf_counter() - started
+    del validated
+
+    gc.collect()
+    tracemalloc.start()
+    validated = [validate(row) for row in rows]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<12} {size / 2**20:8.1f}MiB {size / len(rows):7.1f}B/row  "
+        f"{elapsed:6.2f}s {len(rows) / elapsed / 1e6:5.2f}M rows/s"
+    )
+    del validated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="the number of rows that are validated")
+    args = parser.parse_args()
+
+    rows = [
+        {"id": i, "name": f"user{i}", "email": f"user{i}@example.com", "age": str(i % 100), "active": "true"}
+        for i in range(args.rows)
+    ]
+    print(f"{args.rows} rows, the memory is what the validated rows take, measured with tracemalloc")
+    for name, output in OUTPUTS.items():
+        bench(name, output, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Run the benchmark suite, write the results as JSON, and compare them with a baseline
+
+Run with ``python benchmarks/run.py``, or ``just bench``. Useful options:
+
+- ``-k schema/wide`` only runs the benchmarks whose name contains ``schema/wide``
+- ``--save-baseline`` stores the results as the baseline that later runs are compared with
+- ``--threshold 0.2`` fails when a benchmark is more than 20% slower than the baseline
+
+The exit code is 1 when a benchmark regressed, or when a built-in filter has no benchmark.
+"""
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+from timeit import Timer
+from typing import Any, Optional
+
+sys.path.insert(0, ".")
+sys.path.insert(0, str(Path(__file__).parent))
+
+import suite
+
+import cion
+
+HERE = Path(__file__).parent
+RESULTS = HERE / "results.json"
+BASELINE = HERE / "baseline.json"
+
+
+def measure(benchmark: suite.Benchmark, repeat: int) -> dict[str, Any]:
+    """Time a benchmark, the fastest of ``repeat`` runs of as many calls as fit in about 0.2 seconds"""
+    timer = Timer(benchmark)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return {"ns_per_call": best / number * 1e9, "number": number, "repeat": repeat}
+
+
+def run(selected: Optional[str], repeat: int) -> dict[str, Any]:
+    results = {}
+    for name, benchmark in suite.CASES.items():
+        if selected is not None and selected not in name:
+            continue
+        results[name] = measure(benchmark, repeat)
+        print(f"{name:<40} {results[name]['ns_per_call']:12.1f}ns", flush=True)
+
+    return {
+        "cion": cion.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Print how the results compare with the baseline, and return the names of the benchmarks that regressed"""
+    if (current["python"], current["implementation"]) != (baseline["python"], baseline["implementation"]):
+        print(f"warning: the baseline was recorded with {baseline['implementation']} {baseline['python']}")
+
+    regressed = []
+    print(f"\n{'benchmark':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"{name:<40} {'-':>12} {result['ns_per_call']:10.1f}ns {'new':>8}")
+            continue
+        change = result["ns_per_call"] / previous["ns_per_call"] - 1
+        marker = ""
+        if change > threshold:
+            regressed.append(name)
+            marker = "  REGRESSED"
+        print(f"{name:<40} {previous['ns_per_call']:10.1f}ns {result['ns_per_call']:10.1f}ns {change:+8.1%}{marker}")
+    return regressed
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="selected", help="only run the benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="the number of times every benchmark is timed")
+    parser.add_argument("--output", type=Path, default=RESULTS, help="where the results are written")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="the results to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=0.15, help="how much slower than the baseline counts as a regression"
+    )
+    args = parser.parse_args(argv)
+
+    missing = suite.uncovered()
+    if missing:
+        print(f"These built-in filters have no benchmark: {', '.join(missing)}")
+        return 1
+
+    current = run(args.selected, args.repeat)
+    output = args.baseline if args.save_baseline else args.output
+    output.write_text(json.dumps(current, indent=2) + "\n")
+    print(f"\nWrote {len(current['results'])} results to {output}")
+
+    if args.save_baseline:
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, create one with --save-baseline")
+        return 0
+
+    regressed = compare(current, json.loads(args.baseline.read_text()), args.threshold)
+    if regressed:
+        print(f"\n{len(regressed)} benchmarks are more than {args.threshold:.0%} slower than the baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
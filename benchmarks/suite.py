@@ -0,0 +1,182 @@
+"""The benchmarks that :mod:`run` times
+
+Every benchmark is a function that takes no arguments, registered under a name with :func:`case`.
+The names are grouped with slashes, like ``schema/wide/invalid``, so a group can be selected on its own.
+
+Every built-in filter in :mod:`cion.validators`, :mod:`cion.types` and :mod:`cion.converters`
+has a benchmark for a value that passes and one for a value that fails, which :func:`uncovered` checks.
+"""
+import sys
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable
+from uuid import UUID
+
+sys.path.insert(0, ".")
+
+import cion
+from cion.options import ExtraFields
+
+__all__ = ("CASES", "case", "uncovered")
+
+Benchmark = Callable[[], Any]
+
+#: Every benchmark, by its name
+CASES: dict[str, Benchmark] = {}
+
+
+def case(name: str, benchmark: Benchmark) -> None:
+    """Register a benchmark"""
+    if name in CASES:
+        raise ValueError(f"Duplicate benchmark: {name}")
+    CASES[name] = benchmark
+
+
+def _filter_case(name: str, filter_: Callable[[Any], Any], passing: Any, failing: Any) -> None:
+    """Benchmark a filter the way a schema calls it, through ``check`` when it has one"""
+    check = getattr(filter_, "check", None)
+    if check is None:
+        raise ValueError(f"{name} has no check")
+    case(f"{name}/pass", lambda: check(passing))
+    case(f"{name}/fail", lambda: check(failing))
+
+
+# filters
+
+_filter_case("validators/length", cion.validators.length(3, 64), "meizuflux", "m")
+_filter_case("validators/range_", cion.validators.range_(0, 150), 20, 200)
+_filter_case("validators/one_of", cion.validators.one_of("admin", "user", "guest"), "user", "root")
+_filter_case("validators/not_one_of", cion.validators.not_one_of("root", "system"), "user", "root")
+_filter_case("validators/equal_to", cion.validators.equal_to("yes"), "yes", "no")
+_filter_case("validators/uuid", cion.validators.uuid(), "9c10b73c-137f-4bc4-bf46-1f4ff29aac00", "9c10b73c")
+_filter_case("validators/regex", cion.validators.regex("[a-z]+"), "meizuflux", "Meizuflux1")
+_filter_case("validators/url", cion.validators.url(), "https://example.com", "https://" + "a" * 250 + "!")
+_filter_case(
+    "validators/url-parse", cion.validators.url(engine="parse"), "https://example.com", "https://" + "a" * 250 + "!"
+)
+_filter_case("validators/email", cion.validators.email(), "hello@meizuflux.com", "a" * 200 + "@" + "b." * 25 + "!")
+_filter_case(
+    "validators/email-fast",
+    cion.validators.email(engine="fast"),
+    "hello@meizuflux.com",
+    "a" * 200 + "@" + "b." * 25 + "!",
+)
+
+_filter_case("types/string", cion.types.string(), "meizuflux", 1)
+_filter_case("types/integer", cion.types.integer(), 1, "1")
+
+
+class _Unprintable:
+    def __str__(self) -> Any:
+        return None
+
+
+_filter_case("converters/string", cion.converters.string(), 1000, _Unprintable())
+_filter_case("converters/integer", cion.converters.integer(), "1000", "ten")
+_filter_case("converters/float_", cion.converters.float_(), "1.5", "one")
+_filter_case("converters/boolean", cion.converters.boolean(), "true", "maybe")
+_filter_case("converters/decimal", cion.converters.decimal(), "1.10", "ten")
+_filter_case("converters/datetime", cion.converters.datetime(), "2022-09-23T10:30:00Z", "yesterday")
+_filter_case("converters/uuid", cion.converters.uuid(), "9c10b73c-137f-4bc4-bf46-1f4ff29aac00", "9c10b73c")
+
+# the fast paths of the converters, for values that already have the target type
+
+for _name, _filter, _value in (
+    ("float_", cion.converters.float_(), 1.5),
+    ("decimal", cion.converters.decimal(), Decimal("1.10")),
+    ("datetime", cion.converters.datetime(), datetime(2022, 9, 23)),
+    ("uuid", cion.converters.uuid(), UUID("9c10b73c-137f-4bc4-bf46-1f4ff29aac00")),
+):
+    case(f"converters/{_name}/fast-path", lambda check=_filter.check, value=_value: check(value))
+
+# schemas
+
+
+def _narrow(**options: Any) -> cion.Schema:
+    return cion.Schema(
+        fields={
+            "username": cion.Field(filters=[cion.types.string(), cion.validators.length(3, 64)], required=True),
+            "age": cion.Field(filters=[cion.converters.integer(), cion.validators.range_(0, 150)], default=18),
+        },
+        options=cion.Options(**options),
+    )
+
+
+_NARROW_VALID = {"username": "meizuflux", "age": "20"}
+_NARROW_INVALID = {"username": "m", "age": "old"}
+
+WIDE_FIELDS = 50
+
+
+def _wide(**options: Any) -> cion.Schema:
+    return cion.Schema(
+        fields={
+            f"field{i}": cion.Field(filters=[cion.types.integer(), cion.validators.range_(0, 100)])
+            for i in range(WIDE_FIELDS)
+        },
+        options=cion.Options(**options),
+    )
+
+
+_WIDE_VALID = {f"field{i}": i for i in range(WIDE_FIELDS)}
+_WIDE_INVALID = {f"field{i}": i * 3 for i in range(WIDE_FIELDS)}
+
+
+def _validate(schema: cion.Schema, data: dict[str, Any]) -> Benchmark:
+    def benchmark() -> Any:
+        # fields that fail are removed from the data, so every call gets a fresh copy
+        try:
+            return schema.validate(dict(data))
+        except cion.ValidationError as error:
+            return error
+
+    return benchmark
+
+
+for _name, _build, _valid, _invalid in (
+    ("narrow", _narrow, _NARROW_VALID, _NARROW_INVALID),
+    ("wide", _wide, _WIDE_VALID, _WIDE_INVALID),
+):
+    case(f"schema/{_name}/valid", _validate(_build(), _valid))
+    case(f"schema/{_name}/invalid", _validate(_build(), _invalid))
+    case(f"schema/{_name}/stop-on-error", _validate(_build(stop_on_error=True), _invalid))
+    case(f"schema/{_name}/no-mutate", _validate(_build(mutate_data=False), _invalid))
+    for _extra in ExtraFields:
+        case(f"schema/{_name}/extra-{_extra.value}", _validate(_build(extra=_extra), {**_valid, "unexpected": 1}))
+
+_BATCH = [_NARROW_VALID if i % 10 else _NARROW_INVALID for i in range(1000)]
+_BATCH_SCHEMA = _narrow()
+case("schema/narrow/validate-many", lambda: _BATCH_SCHEMA.validate_many([dict(row) for row in _BATCH]))
+
+_PARTIAL_SCHEMA = _wide()
+_PARTIAL_BASE = _PARTIAL_SCHEMA.validate(dict(_WIDE_VALID))
+case("schema/wide/partial", lambda: _PARTIAL_SCHEMA.validate_partial({"field3": 4}, _PARTIAL_BASE))
+
+
+def _ascending(first: int, second: int) -> None:
+    if second < first:
+        raise cion.ValidatorError("Must not be less than the previous field")
+
+
+_CHECKED_SCHEMA = _wide()
+_CHECKED_SCHEMA.checks = [
+    cion.Check(_ascending, fields=[f"field{i - 1}", f"field{i}"]) for i in range(1, WIDE_FIELDS, 5)
+]
+case("schema/wide/checks", _validate(_CHECKED_SCHEMA, _WIDE_VALID))
+
+
+#: Public functions of the filter modules that aren't filters
+NOT_FILTERS = frozenset({"cion.validators.compile_pattern"})
+
+
+def uncovered() -> list[str]:
+    """The built-in filters that don't have a benchmark"""
+    missing = []
+    for module in (cion.validators, cion.types, cion.converters):
+        short = module.__name__.rpartition(".")[2]
+        for name in module.__all__:
+            if f"{module.__name__}.{name}" in NOT_FILTERS:
+                continue
+            if not any(case_name.startswith(f"{short}/{name}/") for case_name in CASES):
+                missing.append(f"{module.__name__}.{name}")
+    return missing
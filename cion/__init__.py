@@ -1,21 +1,62 @@
-"""Cion namespace"""
-from . import converters, exceptions, options, schema, types, validators
-from .exceptions import ValidationError, ValidatorError
-from .options import Options
-from .schema import Field, Schema
+"""Cion namespace
+
+The submodules, and the names that are re-exported from them, are imported the first time they are used,
+so ``import cion`` only costs what is actually used.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import converters, exceptions, options, profiling, schema, store, types, validators
+    from .exceptions import Invalid, ValidationError, ValidatorError
+    from .options import Options
+    from .schema import Check, Field, Schema
 
 __all__ = (
     "Schema",
     "Field",
+    "Check",
     "Options",
     "ValidatorError",
     "ValidationError",
+    "Invalid",
     "converters",
     "exceptions",
     "options",
+    "profiling",
     "schema",
+    "store",
     "types",
     "validators",
 )
 
 __version__ = "0.3.1"
+
+_SUBMODULES = frozenset({"converters", "exceptions", "options", "profiling", "schema", "store", "types", "validators"})
+#: The names that are re-exported, by the submodule they are defined in
+_EXPORTS = {
+    "Schema": "schema",
+    "Field": "schema",
+    "Check": "schema",
+    "Options": "options",
+    "ValidatorError": "exceptions",
+    "ValidationError": "exceptions",
+    "Invalid": "exceptions",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        value = import_module(f"{__name__}.{name}")
+    elif name in _EXPORTS:
+        value = getattr(import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # later lookups find it in the module, without calling this again
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
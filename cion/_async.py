@@ -0,0 +1,145 @@
+"""Asynchronous validation for :meth:`cion.Schema.validate_async`"""
+import asyncio
+from inspect import isawaitable
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from cion import _checks
+from cion.exceptions import Invalid, ValidationError, ValidatorError
+from cion.options import ExtraFields
+
+if TYPE_CHECKING:
+    from cion.schema import Field, Schema
+
+__all__ = ("validate_async",)
+
+_SKIP = object()
+
+
+async def validate_async(schema: "Schema", data: Any, concurrency: Optional[int]) -> dict[Any, Any]:
+    """Validate a dict with filters that may be coroutines, see :meth:`cion.Schema.validate_async`"""
+    from cion.schema import RESERVED_ERROR_KEY
+
+    semaphore = asyncio.Semaphore(concurrency) if concurrency is not None else None
+    stop_on_error = schema.options.stop_on_error is True
+    mutate = schema.options.mutate_data is True
+    # the values of the fields that finished without errors, which an error raised with stop_on_error carries
+    validated: dict[Any, Any] = {}
+
+    def validated_so_far() -> dict[Any, Any]:
+        return {name: validated[name] for name in schema.fields if name in validated}
+
+    async def call(filter_: Callable[[Any], Any], value: Any) -> Any:
+        result = filter_(value)
+        if isawaitable(result):
+            if semaphore is None:
+                return await result
+            async with semaphore:
+                return await result
+        return result
+
+    async def check_field(name: Any, field: "Field") -> tuple[Any, dict[Any, list[str]]]:
+        errors: dict[Any, list[str]] = {}
+
+        def error(message: str, *, delete_field: bool = True) -> None:
+            if delete_field is True and mutate is True:
+                data.pop(name, None)
+            if stop_on_error is True:
+                raise ValidationError({name: [message]}, validated_so_far())
+            errors.setdefault(name, []).append(message)
+
+        try:
+            value = data[name]
+        except KeyError:
+            if field.required is True and field.default is None:
+                error("This field is required", delete_field=False)
+                return _SKIP, errors
+            if field.default is None:
+                return _SKIP, errors
+            value = field.default
+
+        if value is None:
+            if field.nullable is not True:
+                error("This field is not allowed to be None")
+                return _SKIP, errors
+            return None, errors
+
+        for filter_ in field.filters:
+            if value is None:
+                break
+            try:
+                result = await call(getattr(filter_, "check", filter_), value)
+            except ValidatorError as validator_error:
+                error(validator_error.message)
+                continue
+            except Exception:
+                continue
+            if result.__class__ is Invalid:
+                error(result.message)
+                continue
+            value = result
+
+        if value is not None and (field.schema is not None or field.items is not None):
+            # nested schemas are validated synchronously
+            value, nested = field._validate_nested(name, value, mutate=mutate)
+            if nested is not None:
+                if mutate is True:
+                    data.pop(name, None)
+                if stop_on_error is True:
+                    key, messages = next(iter(nested.items()))
+                    raise ValidationError({key: messages[:1]}, validated_so_far())
+                for key, messages in nested.items():
+                    errors.setdefault(key, []).extend(messages)
+
+        return value, errors
+
+    async def validate_field(name: Any, field: "Field") -> tuple[Any, dict[Any, list[str]]]:
+        value, errors = await check_field(name, field)
+        if value is not _SKIP and not errors:
+            validated[name] = value
+        return value, errors
+
+    tasks = [asyncio.ensure_future(validate_field(name, field)) for name, field in schema.fields.items()]
+    if stop_on_error is True and tasks:
+        # stop the fields that are still running as soon as one of them fails
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        # every exception is retrieved, but only the one from the first field is raised
+        failures = [task.exception() for task in tasks if task in done]
+        for failure in failures:
+            if failure is not None:
+                raise failure
+    results = await asyncio.gather(*tasks)
+
+    errors: dict[Any, list[str]] = {}
+    filtered: dict[Any, Any] = {}
+    failed = []
+    for name, (value, field_errors) in zip(schema.fields, results):
+        errors.update(field_errors)
+        if field_errors:
+            failed.append(name)
+        if value is not _SKIP:
+            filtered[name] = value
+
+    # the checks are synchronous, and run once every field is validated
+    for key, messages in _checks.run(schema._generate(_checks.ordered), filtered, failed, stop_on_error).items():
+        if stop_on_error is True:
+            raise ValidationError({key: messages}, filtered)
+        errors.setdefault(key, []).extend(messages)
+
+    if schema.options.extra is ExtraFields.COMBINE:
+        for key in data:
+            if key not in schema.fields:
+                filtered[key] = data[key]
+    elif schema.options.extra is ExtraFields.ERROR:
+        extra = [key for key in data if key not in schema.fields]
+        if extra:
+            message = f"Found extra data: {', '.join(extra)}"
+            if stop_on_error is True:
+                raise ValidationError({RESERVED_ERROR_KEY: [message]}, filtered)
+            errors[RESERVED_ERROR_KEY] = [message]
+
+    if errors:
+        raise ValidationError(errors, filtered)
+
+    return filtered
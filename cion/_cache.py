@@ -0,0 +1,138 @@
+"""Caching of validation results, see :class:`cion.options.ResultCache`"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+from uuid import UUID
+
+from cion._compiler import CompiledValidator
+from cion.exceptions import Errors, ValidationError
+from cion.options import ExtraFields
+
+if TYPE_CHECKING:
+    from cion.schema import Schema
+
+__all__ = ("cached", "nondeterministic_fields")
+
+_MISSING = object()
+
+#: Types whose instances can't be changed, so they can be part of a cache key or a cached result
+_IMMUTABLE = frozenset(
+    (str, bytes, int, float, complex, bool, type(None), Decimal, UUID, date, datetime, time, timedelta)
+)
+
+
+def _freeze(value: Any) -> Optional[Any]:
+    """A key that is only equal to the key of an equal value of the same type, ``None`` if the value can be changed
+
+    The type is part of the key since ``1``, ``1.0`` and ``True`` are equal, while filters can treat them differently.
+    """
+    cls = value.__class__
+    if cls in _IMMUTABLE:
+        return cls, value
+    if cls is tuple or cls is frozenset:
+        items = []
+        for item in value:
+            frozen = _freeze(item)
+            if frozen is None:
+                return None
+            items.append(frozen)
+        return cls, cls(items)
+    return None
+
+
+def _immutable(values: Iterable[Any]) -> bool:
+    return all(_freeze(value) is not None for value in values)
+
+
+def nondeterministic_fields(schema: "Schema") -> list[str]:
+    """The names of the fields with a filter that has ``deterministic`` set to ``False``, nested ones included
+
+    The key of a check whose function has it set to ``False`` counts as such a field too.
+    """
+    names = []
+    for name, field in schema.fields.items():
+        if any(getattr(filter_, "deterministic", True) is False for filter_ in field.filters):
+            names.append(name)
+        for nested in (field.schema, field.items):
+            if nested is not None:
+                names.extend(f"{name}.{nested_name}" for nested_name in nondeterministic_fields(nested))
+    for check in schema.checks:
+        if getattr(check.function, "deterministic", True) is False and check.key not in names:
+            names.append(check.key)
+    return names
+
+
+def cached(schema: "Schema", compiled: CompiledValidator) -> CompiledValidator:
+    """Wrap a compiled schema, so that its results are kept in ``schema.options.cache``
+
+    Raises:
+        ValueError: If a filter or a check of the schema is marked as non-deterministic
+    """
+    cache = schema.options.cache
+    assert cache is not None
+
+    nondeterministic = nondeterministic_fields(schema)
+    if nondeterministic:
+        raise ValueError(
+            f"Cannot cache the results of non-deterministic filters or checks, in: {', '.join(nondeterministic)}"
+        )
+
+    fields = schema.fields
+    names = tuple(fields)
+    # with ExtraFields.IGNORE, the undeclared fields don't change the result, so they aren't part of the key
+    undeclared = schema.options.extra is not ExtraFields.IGNORE
+    mutate = schema.options.mutate_data is True
+
+    def validate(data: Any) -> dict[Any, Any]:
+        # the compiled function is part of the key, so schemas that share a cache don't share results
+        parts: list[Any] = [compiled]
+        for name in names:
+            value = data.get(name, _MISSING)
+            if value is _MISSING:
+                parts.append(_MISSING)
+                continue
+            frozen = _freeze(value)
+            if frozen is None:
+                return compiled(data)
+            parts.append(frozen)
+        if undeclared:
+            for name in data:
+                if name not in fields:
+                    frozen = _freeze(data[name])
+                    if frozen is None:
+                        return compiled(data)
+                    parts.append((name.__class__, name, frozen))
+        key = tuple(parts)
+
+        entry = cache._get(key)
+        if entry is not None:
+            result, errors, removed = entry
+            if mutate:
+                for name in removed:
+                    data.pop(name, None)
+            if errors is not None:
+                raise ValidationError(_copy_errors(errors), dict(result))
+            return dict(result)
+
+        present = [name for name in names if name in data]
+        try:
+            result = compiled(data)
+        except ValidationError as error:
+            valid = error.data or {}
+            if _immutable(valid.values()):
+                cache._put(key, (dict(valid), _copy_errors(error.errors), _removed(present, data)))
+            raise
+        if _immutable(result.values()):
+            cache._put(key, (dict(result), None, _removed(present, data)))
+        return result
+
+    return validate
+
+
+def _copy_errors(errors: Errors) -> Errors:
+    return {name: list(messages) for name, messages in errors.items()}
+
+
+def _removed(present: list[Any], data: Any) -> tuple[Any, ...]:
+    """The fields that were removed from the data while it was validated"""
+    return tuple(name for name in present if name not in data)
@@ -0,0 +1,154 @@
+"""Checks of several fields of a schema, see :class:`cion.Check`
+
+The checks are ordered by a dependency graph, which is built once, when the schema is compiled.
+A check runs as soon as the fields that it depends on are validated, and after every check whose errors are keyed
+by one of those fields, since it is skipped when one of them failed.
+Checks that depend on each other in a cycle, like two checks of the same fields, run in the order they were declared in.
+"""
+import heapq
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Collection, Mapping, Optional, Sequence
+
+from cion.exceptions import Invalid, ValidatorError
+
+if TYPE_CHECKING:
+    from cion.schema import Check, Schema
+
+__all__ = ("schedule", "ordered", "call", "run")
+
+
+def schedule(schema: "Schema") -> dict[int, list[tuple[int, "Check"]]]:
+    """The checks to run after every field, by the position of the field
+
+    Every check is paired with its position in ``schema.checks``.
+
+    Raises:
+        ValueError: If a check depends on a field that the schema doesn't have
+    """
+    positions = {name: position for position, name in enumerate(schema.fields)}
+    for check in schema.checks:
+        unknown = [name for name in check.fields if name not in positions]
+        if unknown:
+            raise ValueError(f"{check!r} depends on fields that the schema doesn't have: {', '.join(unknown)}")
+
+    # the checks that have to run before every check, because their errors are keyed by one of its fields
+    before: dict[int, list[int]] = {number: [] for number in range(len(schema.checks))}
+    for number, check in enumerate(schema.checks):
+        for other, dependency in enumerate(schema.checks):
+            if other != number and dependency.key in check.fields:
+                before[number].append(other)
+
+    # the checks that wait for each other in a cycle run together, in the order they were declared in,
+    # once their fields are validated and the groups that they wait for ran
+    groups = _cycles(before)
+    group_of = {number: index for index, group in enumerate(groups) for number in group}
+    waits_for = [
+        {group_of[other] for number in group for other in before[number]} - {index}
+        for index, group in enumerate(groups)
+    ]
+    ready = [max(positions[name] for number in group for name in schema.checks[number].fields) for group in groups]
+
+    scheduled: dict[int, list[tuple[int, "Check"]]] = defaultdict(list)
+    done: set[int] = set()
+    # starting with the groups that don't wait for another one, in the order that their fields are validated in
+    heap = [(ready[index], group[0], index) for index, group in enumerate(groups) if not waits_for[index]]
+    heapq.heapify(heap)
+    while heap:
+        position, _, index = heapq.heappop(heap)
+        scheduled[position].extend((number, schema.checks[number]) for number in groups[index])
+        done.add(index)
+        for other, waiting in enumerate(waits_for):
+            if index in waiting and other not in done and waiting <= done:
+                ready[other] = max(ready[other], *(ready[group] for group in waiting))
+                heapq.heappush(heap, (ready[other], groups[other][0], other))
+    return dict(scheduled)
+
+
+def _cycles(before: dict[int, list[int]]) -> list[list[int]]:
+    """Group the checks that wait for each other in a cycle, the strongly connected components of the graph
+
+    Every group is sorted by the order the checks were declared in, and the groups by their first check.
+    """
+    # Tarjan's algorithm, which is recursive, but there are only ever a few checks
+    index: dict[int, int] = {}
+    lowest: dict[int, int] = {}
+    stack: list[int] = []
+    groups: list[list[int]] = []
+
+    def visit(number: int) -> None:
+        index[number] = lowest[number] = len(index)
+        stack.append(number)
+        for other in before[number]:
+            if other not in index:
+                visit(other)
+                lowest[number] = min(lowest[number], lowest[other])
+            elif other in stack:
+                lowest[number] = min(lowest[number], index[other])
+        if lowest[number] == index[number]:
+            group = []
+            while True:
+                other = stack.pop()
+                group.append(other)
+                if other == number:
+                    break
+            groups.append(sorted(group))
+
+    for number in before:
+        if number not in index:
+            visit(number)
+    return sorted(groups)
+
+
+def ordered(schema: "Schema", mutate: bool = True) -> list["Check"]:
+    """The checks of the schema, in the order that they run in
+
+    It takes ``mutate`` like the compilers, so that :meth:`cion.Schema._generate` keeps the order
+    between validations, but the order doesn't depend on it.
+    """
+    scheduled = schedule(schema)
+    return [check for position in sorted(scheduled) for _, check in scheduled[position]]
+
+
+def call(check: "Check", arguments: Sequence[Any]) -> Optional[str]:
+    """Call a check, returning its error message if it failed"""
+    try:
+        result = check.function(*arguments)
+    except ValidatorError as error:
+        return error.message
+    except Exception:
+        return None
+    if result.__class__ is Invalid:
+        return result.message
+    return None
+
+
+def run(
+    checks: Sequence["Check"], values: Mapping[Any, Any], failed: Collection[Any], stop_on_error: bool
+) -> dict[Any, list[str]]:
+    """Run checks in order outside of a compiled schema, for the ways of validating that aren't compiled
+
+    Args:
+        checks: The checks, in the order returned by :func:`ordered`
+        values: The validated values
+        failed: The fields that failed to validate, whose checks are skipped
+        stop_on_error: Whether to stop after the first check that fails
+
+    Returns:
+        The errors of the checks
+    """
+    errors: dict[Any, list[str]] = {}
+    failed = set(failed)
+    for check in checks:
+        if any(name in failed for name in check.fields):
+            continue
+        arguments = [values.get(name) for name in check.fields]
+        if any(argument is None for argument in arguments):
+            continue
+        message = call(check, arguments)
+        if message is None:
+            continue
+        errors.setdefault(check.key, []).append(message)
+        failed.add(check.key)
+        if stop_on_error is True:
+            break
+    return errors
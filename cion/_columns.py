@@ -0,0 +1,297 @@
+"""Columnar validation for :meth:`cion.Schema.validate_columns`
+
+Built-in filters carry a ``vectorized`` attribute, a function that takes a column of values
+and returns a boolean mask of the values that pass. The vectorized functions work on lists,
+and on NumPy arrays when NumPy is installed. Any other filter is called once per value.
+"""
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Callable, Mapping, MutableSequence, Optional, Sequence
+
+from cion import _checks
+from cion.exceptions import ValidatorError
+from cion.options import ExtraFields
+
+if TYPE_CHECKING:
+    from cion.schema import Schema
+
+__all__ = (
+    "validate_columns",
+    "vectorize",
+    "isinstance_mask",
+    "range_mask",
+    "length_mask",
+    "membership_mask",
+)
+
+Mask = Sequence[bool]
+#: The masks that are returned, which the checks of the schema clear the rows of
+MutableMask = MutableSequence[bool]
+VectorFilter = Callable[[Any], Mask]
+
+_MISSING = object()
+_numpy: Any = None
+
+
+def numpy() -> Optional[Any]:
+    """Import NumPy the first time it is needed, ``None`` if it is not installed"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy as module
+        except ImportError:
+            module = False
+        _numpy = module
+    return _numpy or None
+
+
+def _array_module(column: Any) -> Any:
+    """NumPy if the column is an array, ``None`` otherwise"""
+    np = numpy()
+    if np is not None and isinstance(column, np.ndarray):
+        return np
+    return None
+
+
+def _is_array(column: Any) -> bool:
+    return _array_module(column) is not None
+
+
+def vectorize(filter_: Callable[[Any], Any], mask: VectorFilter) -> Callable[[Any], Any]:
+    """Attach a vectorized version to a filter"""
+    setattr(filter_, "vectorized", mask)
+    return filter_
+
+
+def isinstance_mask(type_: type, kinds: str) -> VectorFilter:
+    """Vectorized ``isinstance`` check
+
+    Args:
+        type_: The type the values must be an instance of
+        kinds: The NumPy dtype kinds whose items count as instances of ``type_``
+    """
+
+    def mask(column: Any) -> Mask:
+        np = _array_module(column)
+        if np is not None:
+            if column.dtype.kind in kinds:
+                return np.ones(len(column), dtype=bool)
+            if column.dtype.kind == "O":
+                return np.fromiter((isinstance(v, type_) for v in column), dtype=bool, count=len(column))
+            return np.zeros(len(column), dtype=bool)
+        return [isinstance(v, type_) for v in column]
+
+    return mask
+
+
+def range_mask(minimum: Optional[Any], maximum: Optional[Any]) -> VectorFilter:
+    """Vectorized range check, a single comparison for arrays"""
+
+    def mask(column: Any) -> Mask:
+        np = _array_module(column)
+        if np is not None:
+            result = np.ones(len(column), dtype=bool)
+            if minimum is not None:
+                result &= column >= minimum
+            if maximum is not None:
+                result &= column <= maximum
+            return result
+        if minimum is not None and maximum is not None:
+            return [minimum <= v <= maximum for v in column]
+        if minimum is not None:
+            return [v >= minimum for v in column]
+        if maximum is not None:
+            return [v <= maximum for v in column]
+        return [True] * len(column)
+
+    return mask
+
+
+def length_mask(minimum: Optional[int], maximum: Optional[int], equal_to: Optional[int]) -> VectorFilter:
+    """Vectorized length check, using ``numpy.char.str_len`` for arrays of strings"""
+
+    def mask(column: Any) -> Mask:
+        np = _array_module(column)
+        if np is not None and column.dtype.kind in "US":
+            lengths = np.char.str_len(column)
+            if equal_to is not None:
+                return lengths == equal_to
+            result = np.ones(len(column), dtype=bool)
+            if minimum is not None:
+                result &= lengths >= minimum
+            if maximum is not None:
+                result &= lengths <= maximum
+            return result
+
+        lengths = [len(v) for v in column]
+        if equal_to is not None:
+            return [length == equal_to for length in lengths]
+        return [(minimum is None or length >= minimum) and (maximum is None or length <= maximum) for length in lengths]
+
+    return mask
+
+
+#: The dtype kinds of the arrays whose items compare like values of these types
+_KINDS = {str: "U", bytes: "S", bool: "b", int: "iu", float: "f"}
+
+
+def membership_mask(values: Any, *, negate: bool = False) -> VectorFilter:
+    """Vectorized membership check, using ``numpy.isin`` for arrays
+
+    ``numpy.isin`` converts the values to a single dtype, like ``"1"`` and ``2`` to strings,
+    so it is only used when all of the values are of the type that the items of the column are.
+    """
+    kinds = {_KINDS.get(type(value)) for value in values}
+    kind = kinds.pop() if len(kinds) == 1 else None
+
+    def mask(column: Any) -> Mask:
+        np = _array_module(column)
+        if np is not None and kind is not None and column.dtype.kind in kind:
+            return np.isin(column, list(values), invert=negate)
+        if negate is True:
+            return [v not in values for v in column]
+        return [v in values for v in column]
+
+    return mask
+
+
+def _failures(mask: Mask) -> list[int]:
+    """The positions of the values that did not pass"""
+    np = _array_module(mask)
+    if np is not None:
+        return np.flatnonzero(np.logical_not(mask)).tolist()
+    return [position for position, ok in enumerate(mask) if not ok]
+
+
+def _take(values: Any, active: list[int]) -> Any:
+    if len(active) == len(values):
+        return values
+    if _is_array(values):
+        return values[active]
+    return [values[i] for i in active]
+
+
+def validate_columns(
+    schema: "Schema", columns: Mapping[Any, Any]
+) -> tuple[dict[Any, Any], dict[Any, MutableMask], dict[int, dict[Any, list[str]]]]:
+    """Validate a dict of columns, see :meth:`cion.Schema.validate_columns`"""
+    from cion.schema import RESERVED_ERROR_KEY
+
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length")
+    rows = lengths.pop() if lengths else 0
+
+    validated: dict[Any, Any] = {}
+    masks: dict[Any, MutableMask] = {}
+    errors: defaultdict[int, defaultdict[Any, list[str]]] = defaultdict(lambda: defaultdict(list))
+
+    for name, field in schema.fields.items():
+        column = columns.get(name, _MISSING)
+        passed = [True] * rows
+
+        def fail(row: int, message: str) -> None:
+            passed[row] = False
+            errors[row][name].append(message)
+
+        if column is _MISSING:
+            if field.required is True and field.default is None:
+                for row in range(rows):
+                    fail(row, "This field is required")
+            if field.default is None:
+                masks[name] = passed
+                continue
+            column = [field.default] * rows
+
+        # an array is kept as it is, for the vectorized filters, until a filter needs a list to write to
+        values: Any = column if _is_array(column) else list(column)
+        active = []
+        # arrays with a dtype other than object cannot contain None
+        if _is_array(values) and values.dtype.kind != "O":
+            active = list(range(rows))
+        else:
+            for row, value in enumerate(values):
+                if value is not None:
+                    active.append(row)
+                elif field.nullable is not True:
+                    fail(row, "This field is not allowed to be None")
+
+        for filter_ in field.filters:
+            vectorized: Optional[VectorFilter] = getattr(filter_, "vectorized", None)
+            if vectorized is not None:
+                try:
+                    result = vectorized(_take(values, active))
+                except Exception:
+                    # the values are of a type that the vectorized check can't handle,
+                    # the scalar filter decides what happens with them
+                    result = None
+
+                if result is not None:
+                    failed = set()
+                    for position in _failures(result):
+                        row = active[position]
+                        # only failures are passed through the scalar filter, to get its error message
+                        try:
+                            filter_(values[row])
+                        except ValidatorError as error:
+                            fail(row, error.message)
+                            failed.add(row)
+                        except Exception:
+                            pass
+                    if failed:
+                        active = [row for row in active if row not in failed]
+                    continue
+
+            if _is_array(values):
+                values = values.tolist()
+            remaining = []
+            for row in active:
+                try:
+                    value = filter_(values[row])
+                except ValidatorError as error:
+                    fail(row, error.message)
+                    continue
+                except Exception:
+                    remaining.append(row)
+                    continue
+                values[row] = value
+                if value is not None:
+                    remaining.append(row)
+            active = remaining
+
+        if field.schema is not None or field.items is not None:
+            if _is_array(values):
+                values = values.tolist()
+            for row in active:
+                value, nested = field._validate_nested(name, values[row], mutate=schema.options.mutate_data)
+                if nested is None:
+                    values[row] = value
+                    continue
+                passed[row] = False
+                for key, messages in nested.items():
+                    errors[row][key].extend(messages)
+
+        validated[name] = values
+        np = numpy()
+        masks[name] = np.array(passed, dtype=bool) if np is not None and _is_array(column) else passed
+
+    checks = schema._generate(_checks.ordered)
+    if checks:
+        # the checks are called once per row, with the values of the row that passed
+        for row in range(rows):
+            failed = [name for name, mask in masks.items() if not mask[row]]
+            values = {name: validated[name][row] for name in schema.fields if name in validated}
+            for key, messages in _checks.run(checks, values, failed, False).items():
+                errors[row][key].extend(messages)
+                if key in masks:
+                    masks[key][row] = False
+
+    extra = [name for name in columns if name not in schema.fields]
+    if schema.options.extra is ExtraFields.COMBINE:
+        for name in extra:
+            validated[name] = columns[name]
+    elif schema.options.extra is ExtraFields.ERROR and extra:
+        message = f"Found extra data: {', '.join(extra)}"
+        for row in range(rows):
+            errors[row][RESERVED_ERROR_KEY].append(message)
+
+    return validated, masks, {row: dict(errors[row]) for row in sorted(errors)}
@@ -0,0 +1,676 @@
+"""Code generation for :class:`cion.Schema`
+
+A schema is turned into a single flat function, with the loop over the fields unrolled,
+every option resolved ahead of time, and every filter bound as a constant of the generated function.
+"""
+import builtins
+from collections import defaultdict
+from functools import partial
+from hashlib import sha256
+from itertools import count
+from time import perf_counter_ns
+from types import CodeType, FunctionType
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+from cion import _checks, _output
+from cion.exceptions import Invalid, ValidationError, ValidatorError
+from cion.options import ExtraFields
+
+if TYPE_CHECKING:
+    from cion.schema import Check, Schema
+
+__all__ = ("compile_schema", "compile_collect", "compile_many", "compile_iter", "compile_partial")
+
+CompiledValidator = Callable[[Any], dict[Any, Any]]
+CompiledCollect = Callable[[Any], tuple[dict[Any, Any], Optional[dict[Any, list[str]]]]]
+CompiledMany = Callable[[Iterable[Any]], tuple[dict[int, dict[Any, Any]], dict[int, dict[Any, list[str]]]]]
+CompiledPartial = dict[Any, CompiledCollect]
+CompiledIter = Callable[
+    [Iterable[Any], Optional[int]],
+    Iterator[tuple[int, Optional[dict[Any, Any]], Optional[dict[Any, list[str]]]]],
+]
+
+_counter = count()
+
+#: The code of generated functions by the sha256 of their source,
+#: which :mod:`cion.store` fills in so that it isn't compiled again
+_precompiled: dict[str, CodeType] = {}
+
+
+def source_digest(source: str) -> str:
+    """The key of the code of a generated function in ``_precompiled``"""
+    return sha256(source.encode()).hexdigest()
+
+
+class _Source:
+    """Helper for building indented source code"""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.level = 0
+
+    def line(self, text: str) -> None:
+        self.lines.append("    " * self.level + text)
+
+    def indent(self) -> None:
+        self.level += 1
+
+    def dedent(self) -> None:
+        self.level -= 1
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _emit_error(
+    src: _Source,
+    key: str,
+    message: str,
+    stop: Optional[str],
+    *,
+    delete_field: bool,
+    counters: Sequence[str] = (),
+    compact: bool = False,
+    flag: Optional[str] = None,
+) -> None:
+    """Emit the code that records an error
+
+    ``key`` and ``message`` are source expressions, not values.
+    ``stop`` is the statement that ends validation with the error in ``stopped``, or ``None`` to keep going.
+    ``counters`` are the :class:`cion.profiling.Stats` whose failures are counted, when the schema is instrumented.
+    ``compact`` records the errors as a list of ``(key, message)`` pairs instead of a dictionary of lists.
+    ``flag`` is the variable that is set when the field fails, for the checks that depend on it
+    """
+    for counter in counters:
+        src.line(f"{counter}.failures += 1")
+    if flag is not None:
+        src.line(f"{flag} = True")
+    if delete_field is True:
+        src.line(f"data.pop({key}, None)")
+    if stop is not None:
+        if compact is True:
+            src.line(f"stopped = ({key}, {message})")
+        else:
+            src.line(f"stopped = {{{key}: [{message}]}}")
+        for statement in stop.splitlines():
+            src.line(statement)
+        return
+    if compact is True:
+        src.line("if errors is None:")
+        src.line("    errors = []")
+        src.line(f"errors.append(({key}, {message}))")
+        return
+    src.line("if errors is None:")
+    src.line("    errors = _defaultdict(list)")
+    src.line(f"errors[{key}].append({message})")
+
+
+def _emit_call(src: _Source, statement: str, counter: Optional[str]) -> None:
+    """Emit a statement that calls a filter, timing it when the schema is instrumented"""
+    if counter is None:
+        src.line(statement)
+        return
+    src.line("_started = _ns()")
+    src.line("try:")
+    src.line(f"    {statement}")
+    src.line("finally:")
+    src.line(f"    {counter}.calls += 1")
+    src.line(f"    {counter}.time_ns += _ns() - _started")
+
+
+def _first_error(errors: dict[Any, list[str]]) -> dict[Any, list[str]]:
+    """Only keep the first error, for ``stop_on_error``"""
+    key, messages = next(iter(errors.items()))
+    return {key: messages[:1]}
+
+
+def _merge_errors(errors: Optional[dict[Any, list[str]]], other: dict[Any, list[str]]) -> dict[Any, list[str]]:
+    if errors is None:
+        errors = defaultdict(list)
+    for key, messages in other.items():
+        errors[key].extend(messages)
+    return errors
+
+
+def _first_entry(errors: dict[Any, list[str]]) -> tuple[Any, str]:
+    """Only keep the first error of a nested schema, as a ``(key, message)`` pair"""
+    key, messages = next(iter(errors.items()))
+    return key, messages[0]
+
+
+def _merge_entries(errors: Optional[list[tuple[Any, str]]], other: dict[Any, list[str]]) -> list[tuple[Any, str]]:
+    if errors is None:
+        errors = []
+    for key, messages in other.items():
+        errors.extend((key, message) for message in messages)
+    return errors
+
+
+class _Output(NamedTuple):
+    """The code for a schema with an ``output``, which keeps the validated values in local variables"""
+
+    build: str  #: The expression that creates the output from the validated values
+    collect: str  #: The statement that sets ``filtered`` to a dict of the values that were validated so far
+
+
+def _output_code(schema: "Schema", namespace: dict[str, Any]) -> Optional[_Output]:
+    """Bind what the code for the ``output`` of the schema uses, or return ``None`` when the schema returns dicts"""
+    resolved = _output.resolve(schema)
+    if resolved is None:
+        return None
+    output, positions = resolved
+    namespace["_output"] = output
+    namespace["_missing"] = _output.MISSING
+    namespace["_present"] = partial(_output.present, tuple(schema.fields))
+
+    fields = list(schema.fields.values())
+    arguments = []
+    for index in positions:
+        field = fields[index]
+        if field.required is False and field.default is None:
+            # only optional fields without a default can still be missing when there are no errors
+            arguments.append(f"None if _v{index} is _missing else _v{index}")
+        else:
+            arguments.append(f"_v{index}")
+    values = ", ".join(f"_v{index}" for index in range(len(fields)))
+    return _Output(build=f"_output({', '.join(arguments)})", collect=f"filtered = _present({values})")
+
+
+def _emit_check(
+    src: _Source,
+    namespace: dict[str, Any],
+    number: int,
+    check: "Check",
+    positions: dict[Any, int],
+    flagged: set[Any],
+    stop: Optional[str],
+    *,
+    compact: bool,
+    output: Optional[_Output],
+) -> None:
+    """Emit the code that calls a check, unless one of its fields failed, is missing or is None"""
+    namespace[f"_c{number}"] = check.function
+    namespace[f"_ck{number}"] = check.key
+    flag = f"_failed{positions[check.key]}" if check.key in flagged else None
+    arguments = [f"_a{position}" for position in range(len(check.fields))]
+
+    src.line(f"# check {number}")
+    src.line("if " + " and ".join(f"not _failed{positions[name]}" for name in check.fields) + ":")
+    src.indent()
+    conditions = []
+    for argument, name in zip(arguments, check.fields):
+        index = positions[name]
+        if output is None:
+            src.line(f"{argument} = filtered.get(_k{index})")
+        else:
+            src.line(f"{argument} = _v{index}")
+            conditions.append(f"{argument} is not _missing")
+        conditions.append(f"{argument} is not None")
+    src.line("if " + " and ".join(conditions) + ":")
+    src.indent()
+    src.line("try:")
+    src.line(f"    result = _c{number}({', '.join(arguments)})")
+    src.line("except _ValidatorError as error:")
+    src.indent()
+    _emit_error(src, f"_ck{number}", "error.message", stop, delete_field=False, compact=compact, flag=flag)
+    src.dedent()
+    src.line("except Exception:")
+    src.line("    pass")
+    src.line("else:")
+    src.indent()
+    src.line("if result.__class__ is _Invalid:")
+    src.indent()
+    _emit_error(src, f"_ck{number}", "result.message", stop, delete_field=False, compact=compact, flag=flag)
+    src.dedent()
+    src.dedent()
+    src.dedent()
+    src.dedent()
+
+
+def _emit_body(
+    src: _Source,
+    schema: "Schema",
+    namespace: dict[str, Any],
+    stop: Optional[str],
+    mutate: bool,
+    compact: bool = False,
+    output: Optional[_Output] = None,
+) -> None:
+    """Emit the code that validates ``data`` into ``filtered`` and ``errors``
+
+    With ``compact``, ``errors`` is a list of ``(key, message)`` pairs rather than a dictionary of lists.
+    With ``output``, the values are kept in a local variable per field instead, see :func:`_output_code`
+    """
+    from cion.schema import RESERVED_ERROR_KEY
+
+    options = schema.options
+    profile = options.instrument
+    # fields that fail to validate are removed from the data, unless the data must be left alone
+    mutate = mutate is True and options.mutate_data is True
+    namespace["_declared"] = frozenset(schema.fields)
+    namespace["_reserved"] = RESERVED_ERROR_KEY
+
+    src.line("errors = None")
+    if output is None:
+        src.line("filtered = {}")
+    elif schema.fields:
+        src.line(" = ".join(f"_v{index}" for index in range(len(schema.fields))) + " = _missing")
+
+    # the checks run right after the fields that they depend on, which track whether they failed
+    scheduled = _checks.schedule(schema)
+    positions = {name: index for index, name in enumerate(schema.fields)}
+    flagged = {name for check in schema.checks for name in (*check.fields, check.key) if name in positions}
+    if flagged:
+        names = sorted(flagged, key=positions.__getitem__)
+        src.line(" = ".join(f"_failed{positions[name]}" for name in names) + " = False")
+
+    for index, (name, field) in enumerate(schema.fields.items()):
+        key = f"_k{index}"
+        namespace[key] = name
+        flag = f"_failed{index}" if name in flagged else None
+
+        src.line(f"# {name!r}")
+        # without a profile there is no instrumentation at all, rather than instrumentation that is switched off
+        counters: tuple[str, ...] = ()
+        if profile is not None:
+            counters = (f"_s{index}",)
+            namespace[f"_s{index}"] = profile._field(name)
+            src.line("_field_started = _ns()")
+            src.line("try:")
+            src.indent()
+
+        src.line("try:")
+        src.line(f"    value = data[{key}]")
+        src.line("except KeyError:")
+        src.indent()
+        if field.required is True and field.default is None:
+            _emit_error(
+                src,
+                key,
+                "'This field is required'",
+                stop,
+                delete_field=False,
+                counters=counters,
+                compact=compact,
+                flag=flag,
+            )
+        elif field.default is not None:
+            namespace[f"_d{index}"] = field.default
+            src.line(f"value = _d{index}")
+        else:
+            src.line("pass")
+        src.dedent()
+        if field.default is None:
+            # the value is only handled when it was found in the data
+            src.line("else:")
+            src.indent()
+
+        src.line("if value is None:")
+        src.indent()
+        if field.nullable is True:
+            src.line(f"filtered[{key}] = None" if output is None else f"_v{index} = None")
+        else:
+            _emit_error(
+                src,
+                key,
+                "'This field is not allowed to be None'",
+                stop,
+                delete_field=mutate,
+                counters=counters,
+                compact=compact,
+                flag=flag,
+            )
+        src.dedent()
+        src.line("else:")
+        src.indent()
+        for position, filter_ in enumerate(field.filters):
+            bound = f"_f{index}_{position}"
+            namespace[bound] = filter_
+            counter = None
+            filter_counters = counters
+            if profile is not None:
+                counter = f"_s{index}_{position}"
+                namespace[counter] = profile._filter(name, position, filter_)
+                filter_counters = (*counters, counter)
+            if position != 0:
+                # filters are not called on None, which a previous filter may have returned
+                src.line("if value is not None:")
+                src.indent()
+            check = getattr(filter_, "check", None)
+            if check is not None:
+                # the filter reports failure by returning Invalid, which is much cheaper than raising
+                namespace[bound] = check
+                src.line("try:")
+                src.indent()
+                _emit_call(src, f"result = {bound}(value)", counter)
+                src.dedent()
+                src.line("except _ValidatorError as error:")
+                src.indent()
+                _emit_error(
+                    src,
+                    key,
+                    "error.message",
+                    stop,
+                    delete_field=mutate,
+                    counters=filter_counters,
+                    compact=compact,
+                    flag=flag,
+                )
+                src.dedent()
+                src.line("except Exception:")
+                src.line("    pass")
+                src.line("else:")
+                src.indent()
+                src.line("if result.__class__ is _Invalid:")
+                src.indent()
+                _emit_error(
+                    src,
+                    key,
+                    "result.message",
+                    stop,
+                    delete_field=mutate,
+                    counters=filter_counters,
+                    compact=compact,
+                    flag=flag,
+                )
+                src.dedent()
+                src.line("else:")
+                src.line("    value = result")
+                src.dedent()
+            else:
+                src.line("try:")
+                src.indent()
+                _emit_call(src, f"value = {bound}(value)", counter)
+                src.dedent()
+                src.line("except _ValidatorError as error:")
+                src.indent()
+                _emit_error(
+                    src,
+                    key,
+                    "error.message",
+                    stop,
+                    delete_field=mutate,
+                    counters=filter_counters,
+                    compact=compact,
+                    flag=flag,
+                )
+                src.dedent()
+                src.line("except Exception:")
+                src.line("    pass")
+            if position != 0:
+                src.dedent()
+        if field.schema is not None or field.items is not None:
+            namespace[f"_n{index}"] = partial(field._validate_nested, name, mutate=mutate)
+            if field.filters:
+                src.line("if value is not None:")
+                src.indent()
+            src.line(f"value, nested = _n{index}(value)")
+            src.line("if nested is not None:")
+            src.indent()
+            for counter in counters:
+                src.line(f"{counter}.failures += 1")
+            if flag is not None:
+                src.line(f"{flag} = True")
+            if mutate is True:
+                src.line(f"data.pop({key}, None)")
+            if stop is not None:
+                src.line(f"stopped = {'_first_entry' if compact is True else '_first_error'}(nested)")
+                for statement in stop.splitlines():
+                    src.line(statement)
+            else:
+                src.line(f"errors = {'_merge_entries' if compact is True else '_merge_errors'}(errors, nested)")
+            src.dedent()
+            if field.filters:
+                src.dedent()
+        src.line(f"filtered[{key}] = value" if output is None else f"_v{index} = value")
+        src.dedent()
+
+        if field.default is None:
+            src.dedent()
+
+        if profile is not None:
+            src.dedent()
+            src.line("finally:")
+            src.line(f"    _s{index}.calls += 1")
+            src.line(f"    _s{index}.time_ns += _ns() - _field_started")
+
+        for number, check in scheduled.get(index, ()):
+            _emit_check(src, namespace, number, check, positions, flagged, stop, compact=compact, output=output)
+
+    # We don't need to account for ExtraFields.IGNORE
+    # since IGNORE means don't do anything
+    if options.extra is ExtraFields.COMBINE:
+        src.line("for key in data:")
+        src.line("    if key not in _declared:")
+        src.line("        filtered[key] = data[key]")
+    elif options.extra is ExtraFields.ERROR:
+        src.line("extra = [key for key in data if key not in _declared]")
+        src.line("if extra:")
+        src.indent()
+        _emit_error(
+            src, "_reserved", "'Found extra data: ' + ', '.join(extra)", stop, delete_field=False, compact=compact
+        )
+        src.dedent()
+
+
+def _generate(source: str, namespace: dict[str, Any], name: str) -> Callable[..., Any]:
+    # nothing is hashed unless code has been stored
+    code = _precompiled.get(source_digest(source)) if _precompiled else None
+    if code is None:
+        filename = f"<cion generated {name} {next(_counter)}>"
+        exec(compile(source, filename, "exec"), namespace)  # noqa: S102
+    else:
+        # compiling is most of the work of generating a function, and the code only depends on the source
+        filename = code.co_filename
+        namespace["__builtins__"] = builtins
+        namespace[name] = FunctionType(code, namespace, name)
+
+    # register the source so that tracebacks through the generated function are readable,
+    # linecache is imported here since it imports tokenize, which isn't needed until the first schema is compiled
+    import linecache
+
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    function = namespace[name]
+    function.__cion_source__ = source
+    return function
+
+
+def _namespace() -> dict[str, Any]:
+    return {
+        "_defaultdict": defaultdict,
+        "_ValidationError": ValidationError,
+        "_ValidatorError": ValidatorError,
+        "_Invalid": Invalid,
+        "_first_error": _first_error,
+        "_merge_errors": _merge_errors,
+        "_first_entry": _first_entry,
+        "_merge_entries": _merge_entries,
+        "_ns": perf_counter_ns,
+    }
+
+
+def compile_schema(schema: "Schema", mutate: bool = True) -> CompiledValidator:
+    """Generate a specialized validation function for a schema
+
+    The returned function behaves exactly like :meth:`cion.Schema.validate` does for the
+    fields and options that the schema had at the time of compilation.
+
+    Args:
+        schema: The schema to compile
+        mutate: Whether the generated function may remove fields from the data,
+            which it does when ``mutate_data`` is set in the options of the schema as well
+
+    Returns:
+        The generated function, which takes the data and returns the validated data
+    """
+    namespace = _namespace()
+    output = _output_code(schema, namespace)
+
+    src = _Source()
+    src.line("def validate(data):")
+    src.indent()
+    if schema.options.stop_on_error is True:
+        # the first error breaks out of the loop, which only runs once, instead of raising from the except clause
+        # that caught it, so the exception is created once, at the top level, without a context to chain
+        src.line("stopped = None")
+        src.line("while True:")
+        src.indent()
+        _emit_body(src, schema, namespace, "break", mutate, compact=True, output=output)
+        src.line("break")
+        src.dedent()
+        src.line("if stopped is not None:")
+        if output is not None:
+            src.line(f"    {output.collect}")
+        src.line("    raise _ValidationError._from_entries((stopped,), filtered)")
+    else:
+        _emit_body(src, schema, namespace, None, mutate, compact=True, output=output)
+        src.line("if errors is not None:")
+        if output is not None:
+            src.line(f"    {output.collect}")
+        src.line("    raise _ValidationError._from_entries(errors, filtered)")
+    src.line("return filtered" if output is None else f"return {output.build}")
+
+    return _generate(src.render(), namespace, "validate")
+
+
+def compile_collect(schema: "Schema", mutate: bool = True) -> CompiledCollect:
+    """Generate a specialized validation function that doesn't raise
+
+    Args:
+        schema: The schema to compile
+        mutate: Whether the generated function may remove fields from the data,
+            which it does when ``mutate_data`` is set in the options of the schema as well
+
+    Returns:
+        The generated function, which takes the data and returns the validated data and the errors,
+        which are ``None`` if there weren't any
+    """
+    namespace = _namespace()
+    output = _output_code(schema, namespace)
+    stop = "return filtered, stopped" if schema.options.stop_on_error is True else None
+    if stop is not None and output is not None:
+        stop = f"{output.collect}\n{stop}"
+
+    src = _Source()
+    src.line("def collect(data):")
+    src.indent()
+    _emit_body(src, schema, namespace, stop, mutate, output=output)
+    # the errors are collected in a defaultdict, which is returned as a dict, like the errors of validate
+    if output is None:
+        src.line("if errors is not None:")
+        src.line("    return filtered, dict(errors)")
+        src.line("return filtered, None")
+    else:
+        src.line("if errors is not None:")
+        src.line(f"    {output.collect}")
+        src.line("    return filtered, dict(errors)")
+        src.line(f"return {output.build}, None")
+
+    return _generate(src.render(), namespace, "collect")
+
+
+def compile_many(schema: "Schema", mutate: bool = True) -> CompiledMany:
+    """Generate a specialized function that validates a batch of records
+
+    The loop over the records is part of the generated function, so no function is called
+    and no exception is raised per record.
+
+    Args:
+        schema: The schema to compile
+        mutate: Whether the generated function may remove fields from the data,
+            which it does when ``mutate_data`` is set in the options of the schema as well
+
+    Returns:
+        The generated function, which takes an iterable of records
+        and returns the validated data and the errors, keyed by the position of the record
+    """
+    namespace = _namespace()
+    output = _output_code(schema, namespace)
+    stop = "invalid[index] = stopped\ncontinue" if schema.options.stop_on_error is True else None
+
+    src = _Source()
+    src.line("def validate_many(records):")
+    src.indent()
+    src.line("valid = {}")
+    src.line("invalid = {}")
+    src.line("for index, data in enumerate(records):")
+    src.indent()
+    _emit_body(src, schema, namespace, stop, mutate, output=output)
+    src.line("if errors is None:")
+    src.line("    valid[index] = filtered" if output is None else f"    valid[index] = {output.build}")
+    src.line("else:")
+    src.line("    invalid[index] = dict(errors)")
+    src.dedent()
+    src.line("return valid, invalid")
+
+    return _generate(src.render(), namespace, "validate_many")
+
+
+def compile_iter(schema: "Schema", mutate: bool = True) -> CompiledIter:
+    """Generate a specialized generator that lazily validates records
+
+    Args:
+        schema: The schema to compile
+        mutate: Whether the generated function may remove fields from the data,
+            which it does when ``mutate_data`` is set in the options of the schema as well
+
+    Returns:
+        The generated generator function, which takes an iterable of records and the number of errors to stop after,
+        and yields a tuple of the position of the record, the validated data and the errors for every record
+    """
+    namespace = _namespace()
+    output = _output_code(schema, namespace)
+    failed = "failures += 1\nif failures == max_errors:\n    return"
+    stop = f"yield index, None, stopped\n{failed}\ncontinue" if schema.options.stop_on_error is True else None
+
+    src = _Source()
+    src.line("def iter_validate(records, max_errors):")
+    src.indent()
+    src.line("failures = 0")
+    src.line("for index, data in enumerate(records):")
+    src.indent()
+    _emit_body(src, schema, namespace, stop, mutate, output=output)
+    src.line("if errors is None:")
+    src.line("    yield index, filtered, None" if output is None else f"    yield index, {output.build}, None")
+    src.line("else:")
+    src.indent()
+    src.line("yield index, None, dict(errors)")
+    for statement in failed.splitlines():
+        src.line(statement)
+
+    return _generate(src.render(), namespace, "iter_validate")
+
+
+def compile_partial(schema: "Schema", mutate: bool = True) -> CompiledPartial:
+    """Generate a validation function for every field of a schema, for :meth:`cion.Schema.validate_partial`
+
+    Every function is generated like :func:`compile_collect` for a schema with only that field,
+    which is never required and has no default, so it only validates the field when it is in the data.
+
+    Args:
+        schema: The schema to compile
+        mutate: Whether the generated functions may remove fields from the data,
+            which they do when ``mutate_data`` is set in the options of the schema as well
+
+    Returns:
+        The generated functions by the name of their field, which take the data
+        and return the validated field and the errors, which are ``None`` if there weren't any
+    """
+    from cion.options import Options
+    from cion.schema import Field, Schema
+
+    options = schema.options
+    compiled = {}
+    for name, field in schema.fields.items():
+        # never required and without a default, so that nothing happens when the field is missing
+        single_field = Field(filters=field.filters, nullable=field.nullable, schema=field.schema, items=field.items)
+        single = Schema(
+            fields={name: single_field},
+            # the extra fields are handled once for all of the fields, and the profile is shared with the schema
+            options=Options(
+                stop_on_error=options.stop_on_error, mutate_data=options.mutate_data, instrument=options.instrument
+            ),
+        )
+        compiled[name] = compile_collect(single, mutate)
+    return compiled
@@ -0,0 +1,89 @@
+"""Plain data descriptions of schemas, see :meth:`cion.Schema.describe`"""
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+
+from cion._filters import FilterSpec, build
+from cion.options import ExtraFields, Options, ResultCache
+
+if TYPE_CHECKING:
+    from cion.schema import Schema
+
+__all__ = ("describe", "from_description")
+
+#: A description of a schema, made up of dicts, lists, tuples and the filters that aren't built-in
+Description = dict[str, Any]
+
+
+def _describe_filter(filter_: Callable[[Any], Any]) -> Union[FilterSpec, Callable[[Any], Any]]:
+    return getattr(filter_, "spec", filter_)
+
+
+def _build_filter(described: Union[FilterSpec, Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    if isinstance(described, tuple):
+        return build(described)
+    return described
+
+
+def _describe_cache(cache: Optional[ResultCache]) -> Optional[dict[str, Any]]:
+    # only the settings of the cache are described, not the results in it
+    if cache is None:
+        return None
+    return {"maxsize": cache.maxsize, "ttl": cache.ttl}
+
+
+def describe(schema: "Schema") -> Description:
+    """Describe a schema with plain data, see :meth:`cion.Schema.describe`"""
+    return {
+        "fields": {
+            name: {
+                "filters": [_describe_filter(filter_) for filter_ in field.filters],
+                "default": field.default,
+                "nullable": field.nullable,
+                "required": field.required,
+                "schema": describe(field.schema) if field.schema is not None else None,
+                "items": describe(field.items) if field.items is not None else None,
+            }
+            for name, field in schema.fields.items()
+        },
+        "options": {
+            "extra": schema.options.extra.value,
+            "stop_on_error": schema.options.stop_on_error,
+            "mutate_data": schema.options.mutate_data,
+            "cache": _describe_cache(schema.options.cache),
+        },
+        "output": schema.output,
+        "checks": [
+            {"function": check.function, "fields": list(check.fields), "key": check.key} for check in schema.checks
+        ],
+    }
+
+
+def from_description(description: Description) -> "Schema":
+    """Build a schema from a description, see :meth:`cion.Schema.from_description`"""
+    from cion.schema import Check, Field, Schema
+
+    fields = {
+        name: Field(
+            filters=[_build_filter(filter_) for filter_ in field["filters"]],
+            default=field["default"],
+            nullable=field["nullable"],
+            required=field["required"],
+            schema=from_description(field["schema"]) if field.get("schema") is not None else None,
+            items=from_description(field["items"]) if field.get("items") is not None else None,
+        )
+        for name, field in description["fields"].items()
+    }
+    options = description["options"]
+    return Schema(
+        fields=fields,
+        options=Options(
+            extra=ExtraFields(options["extra"]),
+            stop_on_error=options["stop_on_error"],
+            mutate_data=options.get("mutate_data", True),
+            cache=ResultCache(**options["cache"]) if options.get("cache") is not None else None,
+        ),
+        output=description.get("output"),
+        checks=[
+            Check(check["function"], fields=check["fields"], key=check["key"])
+            for check in description.get("checks", [])
+        ],
+    )
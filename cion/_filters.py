@@ -0,0 +1,89 @@
+"""Helpers for building the built-in filters"""
+from functools import wraps
+from importlib import import_module
+from typing import Any, Callable, TypeVar
+
+from cion.exceptions import Invalid, ValidatorError
+
+__all__ = ("checked", "builtin", "unordered", "is_unordered", "build")
+
+Check = Callable[[Any], Any]
+Factory = TypeVar("Factory", bound=Callable[..., Callable[[Any], Any]])
+
+#: The module and name of the factory that built a filter, and the arguments it was called with
+FilterSpec = tuple[str, str, tuple[Any, ...], dict[str, Any]]
+
+#: The built-in filter factories, by their module and name, which are the only functions that :func:`build` calls
+_registry: dict[tuple[str, str], Callable[..., Callable[[Any], Any]]] = {}
+#: The factories whose positional arguments are a set of values, see :func:`unordered`
+_unordered: set[tuple[str, str]] = set()
+
+
+def builtin(factory: Factory) -> Factory:
+    """Mark a function as a built-in filter factory
+
+    The filters it returns carry a ``spec`` attribute, the :data:`FilterSpec` that :func:`build` can rebuild them from.
+    Filters are closures, which can't be pickled, while their spec can.
+    """
+
+    @wraps(factory)
+    def wrapper(*args: Any, **kwargs: Any) -> Callable[[Any], Any]:
+        filter_ = factory(*args, **kwargs)
+        setattr(filter_, "spec", (factory.__module__, factory.__name__, args, kwargs))
+        return filter_
+
+    _registry[factory.__module__, factory.__name__] = wrapper
+    return wrapper  # type: ignore[return-value]
+
+
+def unordered(factory: Factory) -> Factory:
+    """Mark a filter factory whose positional arguments are a set of values, so that their order doesn't matter
+
+    Applied below :func:`builtin`. Those arguments are often built from a set, whose order changes between processes,
+    so :func:`cion.store.fingerprint` sorts them.
+    """
+    _unordered.add((factory.__module__, factory.__name__))
+    return factory
+
+
+def is_unordered(spec: FilterSpec) -> bool:
+    """Whether the order of the positional arguments in the spec doesn't matter, see :func:`unordered`"""
+    return (spec[0], spec[1]) in _unordered
+
+
+def build(spec: FilterSpec) -> Callable[[Any], Any]:
+    """Rebuild a built-in filter from its spec
+
+    Raises:
+        ValueError: If the spec does not refer to a built-in filter factory
+    """
+    module, name, args, kwargs = spec
+    if module.partition(".")[0] != "cion":
+        raise ValueError(f"{module}.{name} is not a built-in filter")
+    if (module, name) not in _registry:
+        # the factories are registered when their module is imported, which is lazy
+        try:
+            import_module(module)
+        except ImportError:
+            pass
+    factory = _registry.get((module, name))
+    if factory is None:
+        raise ValueError(f"{module}.{name} is not a built-in filter")
+    return factory(*args, **kwargs)
+
+
+def checked(check: Check) -> Callable[[Any], Any]:
+    """Build a filter out of a function that returns :class:`cion.exceptions.Invalid` instead of raising
+
+    Calling the filter raises :class:`cion.exceptions.ValidatorError` as usual,
+    while :class:`cion.Schema` calls ``check`` directly, so that no exception is raised when the value is invalid.
+    """
+
+    def inner(value: Any) -> Any:
+        result = check(value)
+        if result.__class__ is Invalid:
+            raise ValidatorError(result.message)
+        return result
+
+    setattr(inner, "check", check)
+    return inner
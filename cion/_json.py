@@ -0,0 +1,60 @@
+"""JSON decoding for :meth:`cion.Schema.validate_json`, and encoding for :meth:`cion.ValidationError.to_json`
+
+orjson is used when it is installed, and the standard library otherwise
+"""
+from functools import partial
+from typing import Any, Callable, Optional, Union
+
+__all__ = ("loads", "dumps")
+
+Buffer = Union[bytes, bytearray, memoryview, str]
+
+_loads: Optional[Callable[[Buffer], Any]] = None
+_dumps: Optional[Callable[[Any], bytes]] = None
+
+
+def _stdlib_loads(buf: Buffer) -> Any:
+    import json
+
+    if isinstance(buf, memoryview):
+        buf = buf.tobytes()
+    return json.loads(buf)
+
+
+def loads(buf: Buffer) -> Any:
+    """Decode JSON with the fastest decoder that is installed
+
+    Raises:
+        ValueError: If ``buf`` is not valid JSON
+    """
+    global _loads
+    if _loads is None:
+        try:
+            import orjson
+        except ImportError:
+            _loads = _stdlib_loads
+        else:
+            _loads = orjson.loads
+    return _loads(buf)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    import json
+
+    return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode JSON with the fastest encoder that is installed
+
+    Keys that aren't strings are converted to strings, and so is anything that can't be encoded otherwise
+    """
+    global _dumps
+    if _dumps is None:
+        try:
+            import orjson
+        except ImportError:
+            _dumps = _stdlib_dumps
+        else:
+            _dumps = partial(orjson.dumps, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return _dumps(obj)
@@ -0,0 +1,138 @@
+"""The objects that :meth:`cion.Schema.validate` builds when a schema has an ``output``, instead of a dict"""
+import keyword
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from cion.options import ExtraFields
+
+if TYPE_CHECKING:
+    from cion.schema import Schema
+
+__all__ = ("SLOTS", "record_class", "resolve", "present")
+
+#: Generate a class with ``__slots__`` for the fields of the schema
+SLOTS = "slots"
+
+Output = Union[type, str]
+
+
+class Missing:
+    """The value of a field that wasn't in the data, while it is being validated"""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+MISSING = Missing()
+
+
+@lru_cache(maxsize=None)
+def record_class(names: tuple[str, ...]) -> type:
+    """Generate a class with ``__slots__`` for ``names``, which is created with their values in that order
+
+    Schemas with the same field names share the class, so recompiling a schema doesn't change the type of its records.
+
+    Raises:
+        ValueError: If a name can't be an attribute
+    """
+    for name in names:
+        if not isinstance(name, str) or not name.isidentifier() or keyword.iskeyword(name) or name.startswith("_"):
+            raise ValueError(f"{name!r} can't be the name of an attribute of a record")
+
+    arguments = ", ".join(names)
+    lines = [f"def __init__(self, {arguments}):" if names else "def __init__(self):"]
+    lines.extend(f"    self.{name} = {name}" for name in names)
+    if not names:
+        lines.append("    pass")
+    namespace: dict[str, Any] = {}
+    exec("\n".join(lines), namespace)  # noqa: S102
+
+    def __repr__(self: Any) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in names)
+        return f"{self.__class__.__name__}({values})"
+
+    def __eq__(self: Any, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in names)
+
+    def _asdict(self: Any) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in names}
+
+    def __reduce__(self: Any) -> tuple[Any, ...]:
+        # the class is generated, so it can't be pickled by name
+        return (_rebuild, (names, tuple(getattr(self, name) for name in names)))
+
+    return type(
+        "Record",
+        (),
+        {
+            "__slots__": names,
+            "__match_args__": names,
+            "_fields": names,
+            "__init__": namespace["__init__"],
+            "__repr__": __repr__,
+            "__eq__": __eq__,
+            "__hash__": None,
+            "_asdict": _asdict,
+            "__reduce__": __reduce__,
+            "__module__": __name__,
+        },
+    )
+
+
+def _rebuild(names: tuple[str, ...], values: tuple[Any, ...]) -> Any:
+    return record_class(names)(*values)
+
+
+def _field_names(output: type) -> tuple[str, ...]:
+    """The names of the arguments that ``output`` is created with, in order"""
+    names = getattr(output, "_fields", None)
+    if isinstance(names, tuple):
+        return names
+    # dataclasses imports inspect, which is slow to import
+    import dataclasses
+
+    if dataclasses.is_dataclass(output):
+        return tuple(field.name for field in dataclasses.fields(output) if field.init)
+    raise ValueError(f"output must be a NamedTuple, a dataclass or {SLOTS!r}, not {output!r}")
+
+
+def resolve(schema: "Schema") -> Optional[tuple[type, tuple[int, ...]]]:
+    """The class that validated data is built with, and the position of the field of every argument of that class
+
+    Returns:
+        ``None`` when the schema returns dicts
+
+    Raises:
+        ValueError: If the class doesn't have exactly the fields of the schema,
+            or the options of the schema can't be used with it
+    """
+    output = schema.output
+    if output is None:
+        return None
+    if output == SLOTS:
+        output = record_class(tuple(schema.fields))
+    if not isinstance(output, type):
+        raise ValueError(f"output must be a NamedTuple, a dataclass or {SLOTS!r}, not {output!r}")
+
+    names = _field_names(output)
+    if set(names) != set(schema.fields) or len(names) != len(schema.fields):
+        raise ValueError(
+            f"The fields of {output.__name__} ({', '.join(names)}) "
+            f"don't match the fields of the schema ({', '.join(map(str, schema.fields))})"
+        )
+    if schema.options.extra is ExtraFields.COMBINE:
+        raise ValueError("Cannot combine extra fields into an output, since it only has the fields of the schema")
+    if schema.options.cache is not None:
+        raise ValueError("Cannot cache the results of a schema with an output")
+
+    positions = {name: position for position, name in enumerate(schema.fields)}
+    return output, tuple(positions[name] for name in names)
+
+
+def present(names: tuple[Any, ...], *values: Any) -> dict[Any, Any]:
+    """The fields that have been validated, as a dict, for :attr:`cion.ValidationError.data`"""
+    return {name: value for name, value in zip(names, values) if value is not MISSING}
@@ -0,0 +1,51 @@
+"""Validation in a process pool, see :meth:`cion.Schema.validate_parallel`"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional
+
+from cion._description import Description, from_description
+
+if TYPE_CHECKING:
+    from cion.schema import BatchResult, Schema
+
+__all__ = ("validate_parallel",)
+
+#: The schema of the worker process, built once when the worker starts
+_schema: Optional["Schema"] = None
+
+
+def _initialize(description: Description) -> None:
+    global _schema
+    _schema = from_description(description)
+
+
+def _validate_chunk(chunk: list[Any]) -> "BatchResult":
+    assert _schema is not None, "worker was not initialized"
+    return _schema.validate_many(chunk)
+
+
+def _chunks(records: Iterable[Any], chunksize: int) -> Iterator[list[Any]]:
+    iterator = iter(records)
+    while chunk := list(islice(iterator, chunksize)):
+        yield chunk
+
+
+def validate_parallel(
+    schema: "Schema", records: Iterable[Any], workers: Optional[int], chunksize: int
+) -> tuple[dict[int, Any], dict[int, Any]]:
+    """Validate records in a process pool, see :meth:`cion.Schema.validate_parallel`"""
+    valid: dict[int, Any] = {}
+    errors: dict[int, Any] = {}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initialize, initargs=(schema.describe(),)) as pool:
+        offset = 0
+        # the results are yielded in the order that the chunks were submitted in
+        for chunk_valid, chunk_errors in pool.map(_validate_chunk, _chunks(records, chunksize)):
+            chunk_length = len(chunk_valid) + len(chunk_errors)
+            for index, data in chunk_valid.items():
+                valid[offset + index] = data
+            for index, record_errors in chunk_errors.items():
+                errors[offset + index] = record_errors
+            offset += chunk_length
+
+    return valid, errors
@@ -1,47 +1,218 @@
+"""Converters for use in a :class:`cion.Field`
+
+Each converter is built around a check that is created once, when this module is imported,
+so converting a value does not allocate anything besides the converted value itself.
+Values that already have the target type are returned as they are, without being converted again.
+"""
+from datetime import datetime as Datetime
+from decimal import Decimal, InvalidOperation
 from typing import Any
+from uuid import UUID
 
-from cion import types
-from cion.exceptions import ValidatorError
+from cion._filters import builtin, checked
+from cion.exceptions import Invalid
+from cion.types import _INVALID_INTEGER, _INVALID_STRING
 
 __all__ = (
     "string",
     "integer",
+    "float_",
+    "boolean",
+    "decimal",
+    "datetime",
+    "uuid",
 )
 
+_INVALID_FLOAT = Invalid("Field must be a valid float")
+_INVALID_BOOLEAN = Invalid("Field must be a valid boolean")
+_INVALID_DECIMAL = Invalid("Field must be a valid decimal")
+_INVALID_DATETIME = Invalid("Field must be a valid datetime")
+_INVALID_UUID = Invalid("Field must be a valid UUID")
+
+#: The strings that :func:`boolean` converts, compared after they are lowercased
+BOOLEAN_STRINGS = {
+    "true": True,
+    "1": True,
+    "yes": True,
+    "on": True,
+    "false": False,
+    "0": False,
+    "no": False,
+    "off": False,
+}
+
+
+def _convert_string(value: Any) -> Any:
+    if isinstance(value, str):
+        return value
+    try:
+        # str() raises a TypeError when __str__ doesn't return a string, so the result is always a string
+        return str(value)
+    except Exception:
+        return _INVALID_STRING
+
+
+def _convert_integer(value: Any) -> Any:
+    if isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except Exception:
+        return _INVALID_INTEGER
+
+
+def _convert_float(value: Any) -> Any:
+    if isinstance(value, float):
+        return value
+    try:
+        return float(value)
+    except Exception:
+        return _INVALID_FLOAT
+
+
+def _convert_boolean(value: Any) -> Any:
+    if value.__class__ is bool:
+        return value
+    if value.__class__ is int:
+        if value == 1:
+            return True
+        if value == 0:
+            return False
+    elif isinstance(value, str):
+        return BOOLEAN_STRINGS.get(value.lower(), _INVALID_BOOLEAN)
+    return _INVALID_BOOLEAN
+
+
+def _convert_decimal(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        # the shortest repr of a float, so that 0.1 becomes Decimal("0.1") instead of its binary expansion
+        value = repr(value)
+    try:
+        return Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        return _INVALID_DECIMAL
+
+
+def _convert_datetime(value: Any) -> Any:
+    if isinstance(value, Datetime):
+        return value
+    if not isinstance(value, str):
+        return _INVALID_DATETIME
+    try:
+        return Datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    # Python 3.10 does not understand the "Z" suffix for UTC
+    if value.endswith(("Z", "z")):
+        try:
+            return Datetime.fromisoformat(value[:-1] + "+00:00")
+        except ValueError:
+            pass
+    return _INVALID_DATETIME
+
 
+def _convert_uuid(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return value
+    if not isinstance(value, str):
+        return _INVALID_UUID
+    try:
+        return UUID(value)
+    except ValueError:
+        return _INVALID_UUID
+
+
+@builtin
 def string():
     """Attempts to convert a value to a string
 
     Most objects can be converted to a string, but if some things override the ``__str__`` method, this will not work and will error
 
+    Fast path: strings are returned as they are
+
     Returns:
         InnerValidator: The inner validator
     """
-
-    def inner(value: Any):
-        if not isinstance(value, str):
-            try:
-                value = str(value)
-            except:
-                raise ValidatorError("Field must be a valid string")
-        return types.string()(value)
-
-    return inner
+    return checked(_convert_string)
 
 
+@builtin
 def integer():
     """Attempts to convert a value to an integer
 
+    Fast path: integers (including booleans) are returned as they are
+
+    Returns:
+        InnerValidator: The inner validator
+    """
+    return checked(_convert_integer)
+
+
+@builtin
+def float_():
+    """Attempts to convert a value to a float, with :class:`float`
+
+    Fast path: floats are returned as they are
+
     Returns:
         InnerValidator: The inner validator
     """
+    return checked(_convert_float)
+
 
-    def inner(value: Any):
-        if not isinstance(value, int):
-            try:
-                value = int(value)
-            except:
-                raise ValidatorError("Field must be a valid integer")
-        return types.integer()(value)
+@builtin
+def boolean():
+    """Attempts to convert a value to a boolean
 
-    return inner
+    The integers ``0`` and ``1`` are converted, as are the strings in :data:`BOOLEAN_STRINGS`, in any case.
+    Anything else is an error, ``bool(value)`` is not used because any non-empty string, like ``"false"``, is true.
+
+    Fast path: booleans are returned as they are
+
+    Returns:
+        InnerValidator: The inner validator
+    """
+    return checked(_convert_boolean)
+
+
+@builtin
+def decimal():
+    """Attempts to convert a value to a :class:`decimal.Decimal`
+
+    Floats are converted from their shortest representation, so ``0.1`` becomes ``Decimal("0.1")``
+
+    Fast path: decimals are returned as they are
+
+    Returns:
+        InnerValidator: The inner validator
+    """
+    return checked(_convert_decimal)
+
+
+@builtin
+def datetime():
+    """Attempts to convert an ISO 8601 string to a :class:`datetime.datetime`
+
+    Strings are parsed with :meth:`datetime.datetime.fromisoformat`,
+    and a ``Z`` suffix is understood as UTC on every supported version of Python
+
+    Fast path: datetimes are returned as they are
+
+    Returns:
+        InnerValidator: The inner validator
+    """
+    return checked(_convert_datetime)
+
+
+@builtin
+def uuid():
+    """Attempts to convert a string to a :class:`uuid.UUID`
+
+    Fast path: UUIDs are returned as they are
+
+    Returns:
+        InnerValidator: The inner validator
+    """
+    return checked(_convert_uuid)
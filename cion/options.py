@@ -1,7 +1,16 @@
 """Options to be used with :class:`cion.Schema`"""
+from collections import OrderedDict
 from enum import Enum
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Hashable, Optional
+from weakref import WeakSet
 
-__all__ = ("Options", "ExtraFields")
+if TYPE_CHECKING:
+    from cion.profiling import Profile
+    from cion.schema import Schema
+
+__all__ = ("Options", "ExtraFields", "ResultCache")
 
 
 class ExtraFields(Enum):
@@ -12,17 +21,94 @@ class ExtraFields(Enum):
     ERROR = "error"  #: Return a :class:`cion.exceptions.ValidationError` with a list of the unexpected fields
 
 
+class ResultCache:
+    """A size bounded cache of validation results, for use with ``Options(cache=...)``
+
+    Entries are evicted least recently used first once there are ``maxsize`` of them,
+    and are thrown away once they are older than ``ttl`` seconds.
+    """
+
+    maxsize: int  #: The maximum number of results that are kept
+    ttl: Optional[float]  #: The number of seconds a result is kept for, forever if ``None``
+    hits: int  #: The number of times a result was found in the cache
+    misses: int  #: The number of times a result was not found in the cache
+
+    def __init__(self, maxsize: int = 1024, *, ttl: Optional[float] = None) -> None:
+        """Create a cache of validation results
+
+        Args:
+            maxsize: The maximum number of results that are kept
+            ttl: The number of seconds a result is kept for. By default results are kept until they are evicted
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} maxsize={self.maxsize} ttl={self.ttl} "
+            f"hits={self.hits} misses={self.misses} size={len(self)}>"
+        )
+
+    def clear(self) -> None:
+        """Remove every result from the cache, and reset the hits and misses"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            try:
+                expires, entry = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if self.ttl is not None and expires <= monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _put(self, key: Hashable, entry: Any) -> None:
+        expires = monotonic() + self.ttl if self.ttl is not None else 0.0
+        with self._lock:
+            self._entries[key] = (expires, entry)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
 class Options:
     """Schema Options"""
 
     extra: ExtraFields = ExtraFields.IGNORE
     stop_on_error: bool = False
+    mutate_data: bool = True
+    cache: Optional[ResultCache] = None
+    instrument: Optional["Profile"] = None
+
+    _schemas: "WeakSet[Schema]"
 
     def __init__(
         self,
         *,
         extra: ExtraFields = ExtraFields.IGNORE,
         stop_on_error: bool = False,
+        mutate_data: bool = True,
+        cache: Optional[ResultCache] = None,
+        instrument: Optional["Profile"] = None,
     ) -> None:
         """Class for creating Schema options
 
@@ -36,6 +122,42 @@ class Options:
                 If ``False``, when an error is raised, compile a list of errors and throw the error after validation is done
 
                 Essentially, this option dictates whether you want to receive any validated data on error, or wait to get all the valid data
+            mutate_data: Whether or not fields that fail to validate are removed from the data that is being validated
+
+                If ``False``, the data is never modified, so it doesn't have to be copied before it is validated,
+                and it can be any mapping, like a ``MultiDict`` or a :class:`types.MappingProxyType`
+            cache: A :class:`ResultCache` that :meth:`cion.Schema.validate` keeps its results in
+
+                Data is only looked up in the cache when the values of the declared fields are immutable,
+                like strings, numbers, and tuples of them. Every result is returned as a copy,
+                so changing it does not change the cached result. See :ref:`caching-results`
+            instrument: A :class:`cion.profiling.Profile` that records the calls, failures and time
+                of every field and filter, see :meth:`cion.Schema.profile`
+
+                The instrumentation is compiled into the schema, so it costs nothing when this is ``None``
         """
+        object.__setattr__(self, "_schemas", WeakSet())
+
         self.extra = extra
         self.stop_on_error = stop_on_error
+        self.mutate_data = mutate_data
+        self.cache = cache
+        self.instrument = instrument
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the schemas that use these options aren't part of them, so copies start without any
+        state = self.__dict__.copy()
+        del state["_schemas"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        object.__setattr__(self, "_schemas", WeakSet())
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+
+        # schemas using these options have them compiled in, so they have to be recompiled
+        for schema in self._schemas:
+            schema._invalidate()
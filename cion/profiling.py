@@ -0,0 +1,146 @@
+"""Profiling of schemas, see :meth:`cion.Schema.profile`"""
+from typing import Any, Callable, Optional
+
+__all__ = ("Profile", "Stats")
+
+
+class Stats:
+    """The statistics of a field, or of a filter of a field"""
+
+    __slots__ = ("calls", "failures", "time_ns")
+
+    calls: int  #: The number of times the field was validated, or the filter was called
+    failures: int  #: The number of errors that the field, or the filter, reported
+    time_ns: int  #: The total time spent, in nanoseconds as measured by :func:`time.perf_counter_ns`
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.failures = 0
+        self.time_ns = 0
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} calls={self.calls} failures={self.failures} time_ns={self.time_ns}>"
+
+    def to_dict(self) -> dict[str, int]:
+        return {"calls": self.calls, "failures": self.failures, "time_ns": self.time_ns}
+
+
+def _filter_name(filter_: Callable[[Any], Any]) -> str:
+    """The name of a filter, built-in filters are named after the function that built them"""
+    spec = getattr(filter_, "spec", None)
+    if spec is not None:
+        return f"{spec[0]}.{spec[1]}"
+    module = getattr(filter_, "__module__", None)
+    name = getattr(filter_, "__qualname__", None) or repr(filter_)
+    return f"{module}.{name}" if module else name
+
+
+def _escape(label: Any) -> str:
+    return str(label).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Profile:
+    """Call counts, failure counts and time spent, for every field of a schema and every filter of those fields
+
+    Instrumentation is compiled into a schema that has a profile in ``Options(instrument=...)``,
+    and is left out entirely otherwise, so a schema without a profile is not slowed down at all.
+    """
+
+    #: The statistics of every field, by the name of the field
+    fields: dict[Any, Stats]
+    #: The statistics of every filter, by the name of the field and the position of the filter in it
+    filters: dict[tuple[Any, int], Stats]
+
+    def __init__(self) -> None:
+        self.fields = {}
+        self.filters = {}
+        self._names: dict[tuple[Any, int], str] = {}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} fields={len(self.fields)} filters={len(self.filters)}>"
+
+    def _field(self, name: Any) -> Stats:
+        try:
+            return self.fields[name]
+        except KeyError:
+            stats = self.fields[name] = Stats()
+            return stats
+
+    def _filter(self, name: Any, position: int, filter_: Callable[[Any], Any]) -> Stats:
+        key = (name, position)
+        self._names[key] = _filter_name(filter_)
+        try:
+            return self.filters[key]
+        except KeyError:
+            stats = self.filters[key] = Stats()
+            return stats
+
+    def reset(self) -> None:
+        """Set every statistic back to zero"""
+        for stats in (*self.fields.values(), *self.filters.values()):
+            stats.calls = stats.failures = stats.time_ns = 0
+
+    def to_dict(self) -> dict[Any, dict[str, Any]]:
+        """Export the statistics as plain data
+
+        Returns:
+            The statistics of every field by its name, with the statistics of its filters under ``filters``,
+            in the order of the filters::
+
+                {"name": {"calls": 2, "failures": 1, "time_ns": 1500, "filters": [
+                    {"filter": "cion.types.string", "calls": 2, "failures": 1, "time_ns": 400},
+                ]}}
+        """
+        exported: dict[Any, dict[str, Any]] = {}
+        for name, stats in self.fields.items():
+            exported[name] = {**stats.to_dict(), "filters": []}
+        for (name, position), stats in sorted(self.filters.items(), key=lambda item: item[0][1]):
+            exported.setdefault(name, {**Stats().to_dict(), "filters": []})["filters"].append(
+                {"filter": self._names[name, position], **stats.to_dict()}
+            )
+        return exported
+
+    def to_prometheus(self, prefix: str = "cion", labels: Optional[dict[str, str]] = None) -> str:
+        """Export the statistics in the Prometheus text format
+
+        Args:
+            prefix: The prefix of the names of the metrics
+            labels: Labels to add to every sample, such as the name of the schema
+
+        Returns:
+            The ``<prefix>_field_calls_total``, ``<prefix>_field_failures_total`` and ``<prefix>_field_seconds_total``
+            counters with a ``field`` label, and the same counters for filters,
+            with ``field``, ``position`` and ``filter`` labels
+        """
+        common = "".join(f'{key}="{_escape(value)}",' for key, value in (labels or {}).items())
+        fields = [(f'field="{_escape(name)}"', stats) for name, stats in self.fields.items()]
+        filters = [
+            (f'field="{_escape(name)}",position="{position}",filter="{_escape(self._names[name, position])}"', stats)
+            for (name, position), stats in self.filters.items()
+        ]
+
+        lines = []
+        for metric, help_, samples, value in (
+            ("field_calls_total", "Number of times the field was validated", fields, _calls),
+            ("field_failures_total", "Number of errors reported for the field", fields, _failures),
+            ("field_seconds_total", "Time spent validating the field", fields, _seconds),
+            ("filter_calls_total", "Number of times the filter was called", filters, _calls),
+            ("filter_failures_total", "Number of errors reported by the filter", filters, _failures),
+            ("filter_seconds_total", "Time spent in the filter", filters, _seconds),
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {help_}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            lines.extend(f"{prefix}_{metric}{{{common}{label}}} {value(stats)}" for label, stats in samples)
+        return "\n".join(lines) + "\n"
+
+
+def _calls(stats: Stats) -> int:
+    return stats.calls
+
+
+def _failures(stats: Stats) -> int:
+    return stats.failures
+
+
+def _seconds(stats: Stats) -> float:
+    return stats.time_ns / 1e9
@@ -1,13 +1,38 @@
 """Objects for defining schema to validate data"""
-from collections import defaultdict
-from typing import Any, Callable, Optional
+from contextlib import contextmanager
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
 
-from cion.exceptions import ValidationError, ValidatorError
+from cion import _checks, _columns, _description, _json, _output
+from cion._compiler import (
+    CompiledValidator,
+    compile_collect,
+    compile_iter,
+    compile_many,
+    compile_partial,
+    compile_schema,
+)
+from cion.exceptions import Errors, ValidationError, ValidData
 from cion.options import ExtraFields, Options
+from cion.profiling import Profile
 
 __all__ = (
     "Field",
+    "Check",
     "Schema",
+    "BatchResult",
+    "ColumnsResult",
 )
 
 Validator = Callable[[Any], Any]
@@ -15,6 +40,11 @@ Validator = Callable[[Any], Any]
 RESERVED_ERROR_KEY = "__schema__"
 
 
+def _mutable(value: Any) -> bool:
+    """Whether failed fields can be removed from the value"""
+    return type(value) is dict or isinstance(value, MutableMapping)
+
+
 class Field:
     """A field in a Schema"""
 
@@ -22,6 +52,8 @@ class Field:
     default: Optional[Any] = None
     nullable: bool
     required: bool = False
+    schema: Optional["Schema"] = None
+    items: Optional["Schema"] = None
 
     def __init__(
         self,
@@ -30,6 +62,8 @@ class Field:
         default: Any = None,
         nullable: bool = False,
         required: bool = False,
+        schema: Optional["Schema"] = None,
+        items: Optional["Schema"] = None,
     ) -> None:
         """Create a field for use in a Schema
 
@@ -41,14 +75,119 @@ class Field:
             nullable: Whether the value can be None
                 When this is ``True`` and the value is None, no filters are called
             required: Whether or not the field is required to be in the data
+            schema: A schema that the value, which must be a dict, is validated against after the filters
+            items: A schema that every item of the value, which must be a list, is validated against after the filters
+
+                The errors of nested values are keyed by their path, for example ``items.3.price``
         """
         if required is True and default is not None:
             raise ValueError("Cannot have a default if value is not required")
+        if schema is not None and items is not None:
+            raise ValueError("Cannot have both a schema and items")
 
         self.filters = filters or []
         self.default = default
         self.nullable = nullable
         self.required = required
+        self.schema = schema
+        self.items = items
+
+    def _validate_nested(self, name: Any, value: Any, *, mutate: bool = True) -> tuple[Any, Optional[Errors]]:
+        """Validate the value against ``schema`` or ``items``
+
+        ``mutate`` is ``False`` when the nested data must not be modified,
+        because the options of the outer schema don't allow it
+
+        Returns:
+            The validated value, and the errors keyed by their path, or ``None`` if there weren't any.
+            The value is returned as is when there are errors
+        """
+        if self.schema is not None:
+            if not isinstance(value, Mapping):
+                return value, {name: ["Field must be an object"]}
+            # failed fields are only removed from nested data that can be changed, unlike a MappingProxyType
+            validated, errors = self.schema._collect(value, mutate and _mutable(value))
+            if errors is None:
+                return validated, None
+            return value, {f"{name}.{key}": messages for key, messages in errors.items()}
+
+        if not isinstance(value, (list, tuple)):
+            return value, {name: ["Field must be a list"]}
+        mutate = mutate and all(_mutable(item) for item in value)
+        # every item is validated in one call, without raising an exception for the ones that fail
+        valid, invalid = self.items._validate_many(value, mutate)  # type: ignore[union-attr]
+        if not invalid:
+            return list(valid.values()), None
+        return value, {
+            f"{name}.{index}.{key}": messages for index, errors in invalid.items() for key, messages in errors.items()
+        }
+
+
+class Check:
+    """A check of several fields of a Schema, which is called with their validated values"""
+
+    function: Callable[..., Any]
+    fields: tuple[str, ...]
+    key: str
+
+    def __init__(self, function: Callable[..., Any], *, fields: Sequence[str], key: Optional[str] = None) -> None:
+        """Create a check for use in a Schema
+
+        .. code-block:: py
+
+            def ends_after_start(start, end):
+                if end <= start:
+                    raise cion.ValidatorError("Must be after the start")
+
+            cion.Check(ends_after_start, fields=["start", "end"])
+
+        The check runs as soon as all of its fields are validated, and the checks whose errors are keyed by them ran.
+        It is skipped when one of them failed, is missing or is None,
+        and when another check whose errors are keyed by one of them failed.
+
+        Args:
+            function: Called with the validated value of every field in ``fields``, in that order.
+                Like a filter, it fails by raising :class:`cion.ValidatorError`, or by returning :class:`cion.Invalid`.
+                Anything else that it returns is ignored
+            fields: The names of the fields that the check depends on
+            key: The key of the errors of the check, the last of ``fields`` by default
+
+        Raises:
+            ValueError: If ``fields`` is empty
+        """
+        if not fields:
+            raise ValueError("A check must depend on at least one field")
+
+        self.function = function
+        self.fields = tuple(fields)
+        self.key = self.fields[-1] if key is None else key
+
+    def __repr__(self) -> str:
+        name = getattr(self.function, "__qualname__", None) or repr(self.function)
+        return f"<{self.__class__.__name__} {name} fields={self.fields!r} key={self.key!r}>"
+
+
+#: The position of a record, and its validated data or its errors
+ValidationResult = tuple[int, Optional[ValidData], Optional[Errors]]
+
+
+class BatchResult(NamedTuple):
+    """The result of :meth:`Schema.validate_many`
+
+    Both attributes are keyed by the position of the record in the input
+    """
+
+    valid: dict[int, ValidData]  #: The validated data of every record that had no errors
+    errors: dict[int, Errors]  #: The errors of every record that failed to validate
+
+
+class ColumnsResult(NamedTuple):
+    """The result of :meth:`Schema.validate_columns`"""
+
+    columns: dict[Any, Any]  #: The validated columns
+    #: A mask for every field, which is ``True`` for the rows where the field is valid
+    masks: dict[Any, MutableSequence[bool]]
+    errors: dict[int, Errors]  #: The errors of every row that failed to validate, keyed by the position of the row
 
 
 class Schema:
@@ -56,8 +195,19 @@ class Schema:
 
     fields: dict[str, Field]
     options: Options
+    output: Optional[_output.Output]
+    checks: list[Check]
+
+    _compiled: Optional[CompiledValidator] = None
+    _generated: dict[tuple[Callable[..., Any], bool], Any]
 
-    def __init__(self, fields: dict[str, Field], options: Optional[Options] = None) -> None:
+    def __init__(
+        self,
+        fields: dict[str, Field],
+        options: Optional[Options] = None,
+        output: Optional[_output.Output] = None,
+        checks: Optional[list[Check]] = None,
+    ) -> None:
         """Create schema instance
 
         Initializes a schema instance that can be used to validate data
@@ -65,10 +215,22 @@ class Schema:
         Args:
             fields: A dictionary of fields, with the keys being names and the values being an instance of :class:`cion.Field`
             options: Optional options to add extra functionality to the schema
+            output: What the validated data is returned as, instead of a dict.
+                ``"slots"`` generates a class with ``__slots__`` for the fields, see :attr:`output_class`,
+                and a ``NamedTuple`` or a dataclass (which can have ``slots=True``) with the same fields as the schema
+                is used as is. The object is created directly from the validated values, without building a dict,
+                and fields that are missing from the data are ``None``.
+
+                This applies to every method except :meth:`validate_async` and :meth:`validate_columns`,
+                which return dicts, and to the schema when it is nested in another one.
+                :attr:`cion.ValidationError.data` is always a dict.
+            checks: Checks of several fields, like comparing two dates, see :class:`cion.Check`
 
         Notes:
             ``__schema__`` is not allowed to be a field name, it is reserved for internal usage
 
+            Checks that depend on fields that the schema doesn't have raise :class:`ValueError` when it is compiled
+
         Raises:
             ValueError: If ``__schema__`` is included as a field name
         """
@@ -77,6 +239,102 @@ class Schema:
 
         self.fields = fields
         self.options = options or Options()
+        self.output = output
+        self.checks = checks or []
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+
+        if name == "options":
+            value._schemas.add(self)
+        if name in ("fields", "options", "output", "checks"):
+            self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Throw away the compiled validator, it is regenerated the next time it is needed"""
+        self._compiled = None
+        self._generated = {}
+
+    def _generate(self, compiler: Callable[..., Any], mutate: bool = True) -> Any:
+        """Get the function generated by ``compiler``, generating it if it hasn't been already"""
+        try:
+            return self._generated[compiler, mutate]
+        except KeyError:
+            generated = self._generated[compiler, mutate] = compiler(self, mutate)
+            return generated
+
+    @property
+    def output_class(self) -> Optional[type]:
+        """The class that the validated data is returned as, or ``None`` when it is returned as a dict
+
+        Raises:
+            ValueError: If the ``output`` doesn't have the same fields as the schema,
+                or can't be used with the options of the schema
+        """
+        resolved = _output.resolve(self)
+        return None if resolved is None else resolved[0]
+
+    def describe(self) -> _description.Description:
+        """Describe the schema with plain data
+
+        Built-in filters can't be pickled, since they are closures, so they are described by
+        the function that built them and the arguments it was called with. Other filters are kept as they are.
+
+        The description can be pickled as long as all of the filters that aren't built-in,
+        and the defaults, can be pickled.
+
+        Returns:
+            The description, which :meth:`from_description` can rebuild the schema from
+        """
+        return _description.describe(self)
+
+    @classmethod
+    def from_description(cls, description: _description.Description) -> "Schema":
+        """Build a schema from the description returned by :meth:`describe`
+
+        Args:
+            description: The description of the schema
+
+        Returns:
+            A new schema, equivalent to the one that was described
+
+        Raises:
+            ValueError: If a filter in the description refers to a function that isn't a built-in filter
+        """
+        return _description.from_description(description)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (_description.from_description, (self.describe(),))
+
+    def compile(self) -> CompiledValidator:
+        """Compile the schema into a specialized validation function
+
+        The generated function has the loop over the fields unrolled, the field options resolved ahead of time,
+        and the filters bound as constants, so none of that work is repeated when validating.
+
+        This is done automatically the first time :meth:`validate` is called, and again whenever
+        ``fields`` or ``options`` are changed.
+
+        Note:
+            Changes made to the ``fields`` dictionary or to a :class:`Field` in place are not detected.
+            Call this method again after making them.
+
+        Returns:
+            The compiled function, which behaves exactly like :meth:`validate`
+
+        Raises:
+            ValueError: If the options have a ``cache``, and a filter or a check is marked as non-deterministic
+            ValueError: If the ``output`` doesn't have the same fields as the schema,
+                or the options have a ``cache`` or combine extra fields, which an ``output`` can't be used with
+        """
+        self._invalidate()
+        compiled = compile_schema(self)
+        if self.options.cache is not None:
+            from cion import _cache
+
+            compiled = _cache.cached(self, compiled)
+        self._compiled = compiled
+        return compiled
 
     def validate(self, data: dict[Any, Any]) -> dict[Any, Any]:
         """Validate a dict according to the defined schema
@@ -84,8 +342,10 @@ class Schema:
         Goes through every item in the data and applies constraints to it
 
         Note:
-            It is important to ensure that ``data`` is an iterable that can have data removed.
-            It is highly reccomended to convert it to a dict before calling this method.
+            Fields that fail to validate are removed from ``data``.
+            It is highly reccomended to convert it to a dict before calling this method,
+            or to create the schema with ``Options(mutate_data=False)``, in which case ``data`` is never modified,
+            and can be any mapping.
 
         Args:
             data: The data to be validated
@@ -94,60 +354,308 @@ class Schema:
             The validated and transformed data depending on the specified validators
 
         Raises:
-            ValidationError: When ``self.stop_on_error`` is true and a field in the data does not validate properly
+            ValidationError: When ``self.stop_on_error`` is true and a field in the data does not validate properly.
+                Its data is the fields that were validated before that one
             ValidationError: When ``self.stop_on_error`` is false, this will contain all the errors, if any
         """
-        errors = defaultdict(list)
-        filtered: dict[str, Any] = {}
-
-        def raise_error(field_name: str, error_message: str, *, delete_field: bool = True):
-            if delete_field is True:
-                del data[field_name]
-            if self.options.stop_on_error is True:
-                raise ValidationError({field_name: [error_message]}, {})
-            errors[name].append(error_message)
-
-        for name, options in self.fields.items():
-            # We can't use dict.get since the value may be allowed to be None
-            try:
-                value = data[name]
-            except KeyError:
-                if options.required is True and options.default is None:
-                    raise_error(name, "This field is required", delete_field=False)
-                    continue
-                if options.default is not None:
-                    value = options.default
-                else:
-                    continue
+        compiled = self._compiled
+        if compiled is None:
+            compiled = self.compile()
+        return compiled(data)
 
-            if value is None:
-                if options.nullable is not True:
-                    raise_error(name, "This field is not allowed to be None")
-                    continue
+    def validate_json(self, buf: _json.Buffer) -> dict[Any, Any]:
+        """Decode JSON and validate it according to the defined schema
 
-            for filter_ in options.filters:
-                if value is not None:
-                    try:
-                        value = filter_(value)
-                    except Exception as error:
-                        if isinstance(error, ValidatorError):
-                            raise_error(name, error.message)
-                        continue
+        The JSON is decoded with orjson if it is installed, and with the :mod:`json` module otherwise.
+        The decoded object is validated as is, since nothing else has a reference to it, so it is never copied.
+        Results are cached like the ones of :meth:`validate`, when the options have a ``cache``.
+
+        Args:
+            buf: The JSON to decode, which must be an object
+
+        Returns
+            The validated and transformed data depending on the specified validators
 
-            filtered[name] = value
+        Raises:
+            ValidationError: When ``buf`` is not valid JSON, or is not an object
+            ValidationError: When the decoded object does not validate, see :meth:`validate`
+            ValueError: If the options have a ``cache``, and a filter or a check is marked as non-deterministic
+        """
+        try:
+            data = _json.loads(buf)
+        except ValueError as error:
+            raise ValidationError({RESERVED_ERROR_KEY: [f"Invalid JSON: {error}"]}, {}) from None
+        if not isinstance(data, dict):
+            raise ValidationError({RESERVED_ERROR_KEY: ["Must be a JSON object"]}, {})
+
+        if self.options.cache is not None:
+            # the results are cached by the same validator as the ones of validate, and shared with them
+            return self.validate(data)
+        # the decoded object can't be seen by anything else, so there is no point in removing failed fields from it
+        return self._generate(compile_schema, False)(data)
+
+    def validate_partial(self, changes: dict[Any, Any], base: Optional[Mapping[Any, Any]] = None) -> dict[Any, Any]:
+        """Validate only the fields that are in ``changes``, like the body of a ``PATCH`` request
+
+        Fields that aren't in ``changes`` are neither required nor given their default, and their filters aren't called,
+        so this takes time in proportion to the number of changes rather than the number of fields.
+        The fields that are in ``changes`` are validated exactly like :meth:`validate` does,
+        including the whole value of a field with a nested schema.
+        The checks that depend on a field in ``changes`` run too, with the other fields taken from ``base``.
 
-        # We don't need to account for ExtraFields.IGNORE
-        # since IGNORE means don't do anything
+        Note:
+            The result is always a dict, even if the schema has an ``output``,
+            since it doesn't have to contain every field.
 
-        # Since the validated data is deleted from the original data
-        # anything left over is extra
-        if self.options.extra is ExtraFields.COMBINE:
-            filtered = filtered | data
+        Args:
+            changes: The fields that changed, which are removed when they fail to validate, see :meth:`validate`
+            base: Data that was already validated, which the validated changes are merged into.
+                It is not validated again, nor modified
 
-        if self.options.extra is ExtraFields.ERROR:
-            raise_error(RESERVED_ERROR_KEY, f"Found extra data: {', '.join(data.keys())}", delete_field=False)
+        Returns:
+            The validated changes, merged into a copy of ``base`` if it is given
 
-        if bool(errors):  # Checks if there are any keys
+        Raises:
+            ValidationError: When ``self.stop_on_error`` is true and a field in the changes does not validate properly.
+                Its data is ``base``, with the fields that were validated before that one
+            ValidationError: When ``self.stop_on_error`` is false, this will contain all the errors, if any
+        """
+        validators = self._generate(compile_partial)
+        stop_on_error = self.options.stop_on_error
+        filtered = {} if base is None else dict(base)
+        errors: Optional[Errors] = None
+        extra = []
+        failed = []
+
+        # changes loses the fields that fail to validate, so it can't be iterated over directly
+        keys = list(changes)
+        for key in keys:
+            validator = validators.get(key)
+            if validator is None:
+                extra.append(key)
+                continue
+            validated, field_errors = validator(changes)
+            filtered.update(validated)
+            if field_errors is None:
+                continue
+            failed.append(key)
+            if stop_on_error is True:
+                raise ValidationError(field_errors, filtered)
+            if errors is None:
+                errors = {}
+            errors.update(field_errors)
+
+        # only the checks of fields that changed, with the other fields taken from base
+        checks = [check for check in self._generate(_checks.ordered) if any(name in keys for name in check.fields)]
+        check_errors = _checks.run(checks, filtered, failed, stop_on_error) if checks else None
+        if check_errors:
+            if stop_on_error is True:
+                raise ValidationError(check_errors, filtered)
+            if errors is None:
+                errors = {}
+            for key, messages in check_errors.items():
+                errors.setdefault(key, []).extend(messages)
+
+        if extra:
+            if self.options.extra is ExtraFields.COMBINE:
+                for key in extra:
+                    filtered[key] = changes[key]
+            elif self.options.extra is ExtraFields.ERROR:
+                if errors is None:
+                    errors = {}
+                errors[RESERVED_ERROR_KEY] = [f"Found extra data: {', '.join(extra)}"]
+
+        if errors is not None:
             raise ValidationError(errors, filtered)
-
         return filtered
+
+    async def validate_async(self, data: dict[Any, Any], *, concurrency: Optional[int] = None) -> dict[Any, Any]:
+        """Validate a dict according to the defined schema, with filters that may be coroutines
+
+        Filters can return an awaitable, such as a coroutine that checks a database, which is awaited
+        before the next filter of the field is called. The fields are validated concurrently,
+        so the awaitables of different fields run at the same time.
+
+        Other than that, this behaves exactly like :meth:`validate`
+
+        Args:
+            data: The data to be validated, see :meth:`validate`
+            concurrency: The maximum number of awaitables that are awaited at the same time.
+                By default there is no limit
+
+        Returns
+            The validated and transformed data depending on the specified validators
+
+        Raises:
+            ValidationError: When ``self.stop_on_error`` is true and a field in the data does not validate properly.
+                The other fields are cancelled, and its data is the fields that finished validating before that one
+            ValidationError: When ``self.stop_on_error`` is false, this will contain all the errors, if any
+        """
+        # asyncio is only imported when it is needed
+        from cion import _async
+
+        return await _async.validate_async(self, data, concurrency)
+
+    def validate_many(self, records: Iterable[dict[Any, Any]]) -> BatchResult:
+        """Validate a batch of dicts according to the defined schema
+
+        Every record is validated, regardless of whether the records before it failed,
+        and :class:`cion.ValidationError` is never raised.
+
+        This is faster than calling :meth:`validate` in a loop, since the loop over the records is compiled
+        together with the schema, and no exception is raised for records that fail to validate.
+
+        Args:
+            records: An iterable of the data to be validated, see :meth:`validate`
+
+        Returns:
+            The validated data and the errors, keyed by the position of the record
+        """
+        return BatchResult(*self._validate_many(records))
+
+    def _validate_many(
+        self, records: Iterable[Any], mutate: bool = True
+    ) -> tuple[dict[int, ValidData], dict[int, Errors]]:
+        return self._generate(compile_many, mutate)(records)
+
+    def _collect(self, data: Any, mutate: bool = True) -> tuple[ValidData, Optional[Errors]]:
+        """Validate data without raising, returning the validated data and the errors, if there were any"""
+        return self._generate(compile_collect, mutate)(data)
+
+    def validate_parallel(
+        self, records: Iterable[dict[Any, Any]], *, workers: Optional[int] = None, chunksize: int = 1000
+    ) -> BatchResult:
+        """Validate a batch of dicts in a pool of processes
+
+        Every worker process builds the schema once, from :meth:`describe`,
+        and then validates chunks of ``chunksize`` records with :meth:`validate_many`.
+        The results are merged back together in the order of the input.
+
+        Note:
+            The records are copied to the workers, so unlike :meth:`validate`, they are never modified.
+            All of the records, filters that aren't built-in, and defaults must be able to be pickled.
+
+        Args:
+            records: An iterable of the data to be validated, see :meth:`validate`
+            workers: The number of worker processes, which defaults to the number of processors
+            chunksize: The number of records that are sent to a worker at a time
+
+        Returns:
+            The validated data and the errors, keyed by the position of the record
+
+        Raises:
+            ValueError: If ``chunksize`` is less than 1
+        """
+        if chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+
+        # multiprocessing is only imported when it is needed
+        from cion import _parallel
+
+        return BatchResult(*_parallel.validate_parallel(self, records, workers, chunksize))
+
+    def iter_validate(
+        self, records: Iterable[dict[Any, Any]], *, max_errors: Optional[int] = None, chunksize: Optional[int] = None
+    ) -> Iterator[ValidationResult]:
+        """Lazily validate an iterable of dicts according to the defined schema
+
+        Only the record that is being validated is kept in memory (or a single chunk, if ``chunksize`` is set),
+        so this can be used for inputs of any size.
+        Like :meth:`validate_many`, :class:`cion.ValidationError` is never raised.
+
+        Args:
+            records: An iterable of the data to be validated, see :meth:`validate`
+            max_errors: Stop after this many records have failed to validate
+            chunksize: Take this many records at a time from ``records`` and validate them with :meth:`validate_many`
+
+        Yields:
+            A tuple of the position of the record, the validated data and the errors.
+            The validated data is ``None`` if there were errors, and the errors are ``None`` if there weren't any
+
+        Raises:
+            ValueError: If ``max_errors`` or ``chunksize`` is less than 1
+        """
+        if max_errors is not None and max_errors < 1:
+            raise ValueError("max_errors must be at least 1")
+        if chunksize is not None and chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+
+        if chunksize is None:
+            return self._generate(compile_iter)(records, max_errors)
+        return self._iter_chunks(records, max_errors, chunksize)
+
+    def _iter_chunks(
+        self, records: Iterable[dict[Any, Any]], max_errors: Optional[int], chunksize: int
+    ) -> Iterator[ValidationResult]:
+        iterator = iter(records)
+        offset = 0
+        failures = 0
+
+        while chunk := list(islice(iterator, chunksize)):
+            valid, errors = self.validate_many(chunk)
+            for index in range(len(chunk)):
+                if index in valid:
+                    yield offset + index, valid[index], None
+                    continue
+
+                yield offset + index, None, errors[index]
+                failures += 1
+                if failures == max_errors:
+                    return
+            offset += len(chunk)
+
+    def validate_columns(self, columns: Mapping[Any, Any]) -> ColumnsResult:
+        """Validate data that is stored as columns, rather than as a list of dicts
+
+        ``columns`` maps the field names to a column, which is a list of values, or a NumPy array.
+        Row ``i`` is made up of the ``i``-th value in every column.
+
+        The built-in filters in :mod:`cion.types` and :mod:`cion.validators` check a whole column at once
+        (a single array comparison for NumPy arrays), and every other filter is called once per value.
+
+        Note:
+            A filter is not called on a row that already failed one of the field's previous filters,
+            so each field reports at most one error per row, besides a missing or ``None`` value.
+            ``stop_on_error`` has no effect, since the rows are validated together.
+
+        Args:
+            columns: The columns to be validated, all of which must be the same length
+
+        Returns:
+            The validated columns, a mask of the valid rows for every field, and the errors keyed by the row
+
+        Raises:
+            ValueError: If the columns are not all the same length
+        """
+        return ColumnsResult(*_columns.validate_columns(self, columns))
+
+    @contextmanager
+    def profile(self) -> Iterator[Profile]:
+        """Record the calls, failures and time of every field and filter while the context manager is open
+
+        The schema is recompiled with the instrumentation when the context manager is entered,
+        and without it when it exits, so a schema that isn't being profiled isn't slowed down.
+        A profile can also be kept for longer, with ``Options(instrument=Profile())``.
+
+        .. code-block:: py
+
+            with schema.profile() as profile:
+                schema.validate_many(records)
+
+            print(profile.to_dict())
+
+        Note:
+            Every schema that shares these options is profiled as well, into the same profile.
+            Nested schemas are only profiled when their own options have a profile, their time is counted
+            as part of the field they are in.
+
+        Yields:
+            The :class:`cion.profiling.Profile` that the statistics are recorded in
+        """
+        previous = self.options.instrument
+        profile = Profile()
+        self.options.instrument = profile
+        try:
+            yield profile
+        finally:
+            self.options.instrument = previous
@@ -0,0 +1,290 @@
+"""Store schemas on disk, so that new processes can load them without building and compiling them again
+
+Most of the time it takes to get a schema ready is spent compiling the functions that are generated for it.
+A stored schema has its description (see :meth:`cion.Schema.describe`) along with the code of those functions,
+which is keyed by a hash of their source, so it is only used for a function that is generated with exactly that source.
+
+.. code-block:: py
+
+    store = cion.store.SchemaStore("/var/cache/schemas")
+
+    # when starting, the schemas are compiled the first time and loaded from the store after that
+    schemas = {tenant: store.prepare(build_schema(tenant)) for tenant in tenants}
+
+Warning:
+    Stored schemas are pickled, only load the ones that you trust.
+"""
+import marshal
+import os
+import pickle
+import sys
+import zlib
+from hashlib import sha256
+from pathlib import Path
+from types import CodeType
+from typing import TYPE_CHECKING, Any, Iterator, Union
+
+from cion import _compiler, _description, _filters
+
+if TYPE_CHECKING:
+    from cion.schema import Schema
+
+__all__ = ("FORMAT_VERSION", "fingerprint", "dumps", "loads", "SchemaStore")
+
+#: The version of the format of stored schemas, schemas stored in another version are not loaded
+FORMAT_VERSION = 1
+
+#: The functions that validating with a schema uses, besides the ones of its nested schemas
+_TOP_LEVEL = (
+    (_compiler.compile_schema, True),
+    (_compiler.compile_schema, False),
+    (_compiler.compile_many, True),
+    (_compiler.compile_iter, True),
+)
+
+
+def _pickle(value: Any) -> bytes:
+    try:
+        return pickle.dumps(value, protocol=4)
+    except (pickle.PicklingError, AttributeError, TypeError) as error:
+        raise ValueError(f"The schema can't be stored, since its description can't be pickled: {error}") from None
+
+
+def fingerprint(schema: "Schema") -> str:
+    """A hash of the definition of the schema, which is the same in every process
+
+    The values of :func:`cion.validators.one_of` and :func:`cion.validators.not_one_of`, and sets, are hashed
+    in sorted order, since they are often built from a set, whose order changes between processes.
+
+    Args:
+        schema: The schema to fingerprint
+
+    Returns:
+        The hash, as hexadecimal
+
+    Raises:
+        ValueError: If a filter that isn't built-in, or a default, can't be pickled
+    """
+    return _fingerprint(_description.describe(schema))
+
+
+def _encode(value: Any) -> str:
+    """Encode the value the same way in every process
+
+    Pickle isn't used for the containers, since the order of a set depends on the hash seed of the process,
+    and pickle shares equal values that are the same object, which depends on interning.
+    The values that aren't plain data, like functions, are pickled on their own.
+    """
+    cls = value.__class__
+    if value is None or cls in (bool, int, float, complex, str, bytes):
+        return f"{cls.__name__}:{value!r}"
+    if cls is list or cls is tuple:
+        return f"{cls.__name__}[{','.join(_encode(item) for item in value)}]"
+    if cls is set or cls is frozenset:
+        return f"{cls.__name__}[{','.join(sorted(_encode(item) for item in value))}]"
+    if cls is dict:
+        return f"dict{{{','.join(f'{_encode(key)}:{_encode(item)}' for key, item in value.items())}}}"
+    return f"pickle:{_pickle(value).hex()}"
+
+
+def _canonical(description: _description.Description) -> _description.Description:
+    """The description, with the arguments of filters that take a set of values in sorted order"""
+    fields = {}
+    for name, field in description["fields"].items():
+        filters = [
+            (
+                (filter_[0], filter_[1], tuple(sorted(filter_[2], key=_encode)), filter_[3])
+                if isinstance(filter_, tuple) and _filters.is_unordered(filter_)
+                else filter_
+            )
+            for filter_ in field["filters"]
+        ]
+        nested = {key: _canonical(field[key]) for key in ("schema", "items") if field.get(key) is not None}
+        fields[name] = {**field, "filters": filters, **nested}
+    return {**description, "fields": fields}
+
+
+def _fingerprint(description: _description.Description) -> str:
+    return sha256(_encode((FORMAT_VERSION, _canonical(description))).encode()).hexdigest()
+
+
+def _schemas(schema: "Schema") -> Iterator[tuple["Schema", bool]]:
+    """The schemas nested in ``schema``, and whether they validate the items of a list"""
+    for field in schema.fields.values():
+        for nested, items in ((field.schema, False), (field.items, True)):
+            if nested is not None:
+                yield nested, items
+                yield from _schemas(nested)
+
+
+def _rename(code: CodeType, filename: str) -> CodeType:
+    """Give the code a filename that doesn't depend on the order that the functions were generated in"""
+    consts = tuple(_rename(const, filename) if isinstance(const, CodeType) else const for const in code.co_consts)
+    return code.replace(co_filename=filename, co_consts=consts)
+
+
+def _code(schema: "Schema") -> dict[str, bytes]:
+    """Generate the functions that validating with the schema uses, and marshal their code by the hash of their source
+
+    The code is compressed, since it is mostly the same few instructions for every field
+    """
+    generated = [schema._generate(compiler, mutate) for compiler, mutate in _TOP_LEVEL]
+    for nested, items in _schemas(schema):
+        compiler = _compiler.compile_many if items else _compiler.compile_collect
+        generated.extend(nested._generate(compiler, mutate) for mutate in (True, False))
+
+    code = {}
+    for function in generated:
+        digest = _compiler.source_digest(function.__cion_source__)
+        filename = f"<cion stored {function.__name__} {digest[:16]}>"
+        code[digest] = zlib.compress(marshal.dumps(_rename(function.__code__, filename)), 1)
+    return code
+
+
+def dumps(schema: "Schema") -> bytes:
+    """Serialize the schema, along with the code of the functions that are generated for it
+
+    Args:
+        schema: The schema to serialize
+
+    Returns:
+        The serialized schema, which :func:`loads` loads
+
+    Raises:
+        ValueError: If a filter that isn't built-in, or a default, can't be pickled
+    """
+    description = _description.describe(schema)
+    return _pickle(
+        {
+            "format": FORMAT_VERSION,
+            "fingerprint": _fingerprint(description),
+            # marshalled code can only be loaded by the same version of Python
+            "python": sys.implementation.cache_tag,
+            "description": description,
+            "code": _code(schema),
+        }
+    )
+
+
+def _load(data: bytes) -> dict[str, Any]:
+    """Unpickle a stored schema, and make its code available to the compiler
+
+    Raises:
+        ValueError: If the data isn't a schema stored in this version of the format, including when it is truncated
+    """
+    try:
+        stored = pickle.loads(data)  # noqa: S301
+    except Exception as error:
+        # a truncated or corrupt file can fail in about any way while it is unpickled
+        raise ValueError(f"Not a stored schema: {error!r}") from None
+    if not isinstance(stored, dict) or stored.get("format") != FORMAT_VERSION or "description" not in stored:
+        raise ValueError(f"Not a schema stored in version {FORMAT_VERSION} of the format")
+
+    try:
+        if stored["python"] == sys.implementation.cache_tag:
+            code = {digest: marshal.loads(zlib.decompress(code)) for digest, code in stored["code"].items()}
+            _compiler._precompiled.update(code)
+    except Exception as error:
+        raise ValueError(f"Not a stored schema: {error!r}") from None
+    return stored
+
+
+def loads(data: bytes) -> "Schema":
+    """Load a schema serialized by :func:`dumps`
+
+    The code of the generated functions is only used by the version of Python that stored it,
+    other versions compile them as usual.
+
+    Args:
+        data: The serialized schema
+
+    Returns:
+        The schema, which is compiled with the stored code
+
+    Raises:
+        ValueError: If the data was stored in another version of the format
+    """
+    schema = _description.from_description(_load(data)["description"])
+    schema.compile()
+    return schema
+
+
+class SchemaStore:
+    """A directory of stored schemas, keyed by their :func:`fingerprint`
+
+    Every version of Python has its own files, like ``__pycache__`` does, so they can share the directory.
+    """
+
+    directory: Path  #: The directory that the schemas are stored in
+
+    def __init__(self, directory: Union[str, "os.PathLike[str]"]) -> None:
+        self.directory = Path(directory)
+
+    def path(self, fingerprint: str) -> Path:
+        """The file that the schema with this fingerprint is stored in"""
+        return self.directory / f"{fingerprint}.{sys.implementation.cache_tag}.cion"
+
+    def save(self, schema: "Schema") -> str:
+        """Store the schema
+
+        Args:
+            schema: The schema to store
+
+        Returns:
+            The fingerprint of the schema, which :meth:`load` loads it with
+
+        Raises:
+            ValueError: If a filter that isn't built-in, or a default, can't be pickled
+        """
+        key = fingerprint(schema)
+        self._write(self.path(key), dumps(schema))
+        return key
+
+    def _write(self, path: Path, data: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # written to a temporary file first, so that other processes never read a file that is half written
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+
+    def load(self, fingerprint: str) -> "Schema":
+        """Load a stored schema
+
+        Args:
+            fingerprint: The fingerprint that :meth:`save` returned
+
+        Returns:
+            The schema, which is compiled with the stored code
+
+        Raises:
+            KeyError: If there is no schema with the fingerprint
+            ValueError: If it was stored in another version of the format, or the file is corrupt
+        """
+        try:
+            data = self.path(fingerprint).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(fingerprint) from None
+        return loads(data)
+
+    def prepare(self, schema: "Schema") -> "Schema":
+        """Compile the schema with the code stored for it, storing it if it hasn't been already
+
+        Args:
+            schema: The schema to compile
+
+        Returns:
+            The same schema, compiled
+
+        Raises:
+            ValueError: If a filter that isn't built-in, or a default, can't be pickled
+        """
+        path = self.path(fingerprint(schema))
+        try:
+            _load(path.read_bytes())
+        except (OSError, ValueError):
+            # stored for the first time, or again when the file can't be read or loaded
+            data = dumps(schema)
+            self._write(path, data)
+            _load(data)
+        schema.compile()
+        return schema
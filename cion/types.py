@@ -1,12 +1,32 @@
 """Types of values to be used in :class:`cion.Field`"""
-from cion.exceptions import ValidatorError
+from typing import Any
+
+from cion._columns import isinstance_mask, vectorize
+from cion._filters import builtin, checked
+from cion.exceptions import Invalid
 
 __all__ = (
     "string",
     "integer",
 )
 
+_INVALID_STRING = Invalid("Field must be a valid string")
+_INVALID_INTEGER = Invalid("Field must be a valid integer")
+
+
+def _check_string(value: Any) -> Any:
+    if not isinstance(value, str):
+        return _INVALID_STRING
+    return value
+
+
+def _check_integer(value: Any) -> Any:
+    if not isinstance(value, int):
+        return _INVALID_INTEGER
+    return value
 
+
+@builtin
 def string():
     """A string type
 
@@ -15,15 +35,10 @@ def string():
     Returns:
         InnerValidator: The inner validator
     """
-
-    def inner(value: str):
-        if not isinstance(value, str):
-            raise ValidatorError("Field must be a valid string")
-        return value
-
-    return inner
+    return vectorize(checked(_check_string), isinstance_mask(str, "U"))
 
 
+@builtin
 def integer():
     """An integer type
 
@@ -32,10 +47,4 @@ def integer():
     Returns:
         InnerValidator: The inner validator
     """
-
-    def inner(value: int):
-        if not isinstance(value, int):
-            raise ValidatorError("Field must be a valid integer")
-        return value
-
-    return inner
+    return vectorize(checked(_check_integer), isinstance_mask(int, "iub"))
@@ -1,9 +1,12 @@
 """Validators for use in a :class:`cion.Field`"""
 import re
-from typing import Any, Callable, Iterable, Literal, Optional
-from uuid import UUID
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Callable, Collection, Iterable, Iterator, Literal, Optional
 
-from cion.exceptions import ValidatorError
+from cion._columns import length_mask, membership_mask, range_mask, vectorize
+from cion._filters import builtin, checked, unordered
+from cion.exceptions import Invalid
 
 __all__ = (
     "length",
@@ -15,11 +18,118 @@ __all__ = (
     "regex",
     "url",
     "email",
+    "compile_pattern",
 )
 
 InnerValidator = Callable[[Any], Any]
 
+#: The size of the cache used by :func:`compile_pattern`
+PATTERN_CACHE_SIZE = 512
 
+#: Characters outside of ASCII that match an ASCII letter when a pattern is compiled with :data:`re.IGNORECASE`,
+#: and the letters they match
+_CASELESS_LETTERS = {"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"}
+_ASCII_LETTERS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def _deletion_table(characters: str) -> dict[int, None]:
+    """A table for :meth:`str.translate` that deletes ``characters``, and the characters that match them caselessly
+
+    A string is made up of only ``characters`` when nothing is left after translating it
+    """
+    return dict.fromkeys(map(ord, characters + "".join(_CASELESS_LETTERS)))
+
+
+_LETTERS = _deletion_table(_ASCII_LETTERS)
+_EMAIL_LOCAL = _deletion_table(_ASCII_LETTERS + "0123456789_.+-")
+_EMAIL_DOMAIN = _deletion_table(_ASCII_LETTERS + "0123456789_.-")
+_URL_HOST = _deletion_table(_ASCII_LETTERS + "0123456789-@:%_+~#=")
+_URL_END = _ASCII_LETTERS + "0123456789-@:%_+.~#?&/=" + "".join(_CASELESS_LETTERS)
+_CASEFOLD = str.maketrans(_CASELESS_LETTERS)
+
+_EMAIL_PATTERN = r"^(?=.{6,254}$)[0-9a-zA-Z_.+-]{1,249}@[0-9a-zA-Z_.-]{1,249}"
+_EMAIL_PATTERNS = {
+    True: _EMAIL_PATTERN + r"\..{2,24}$",
+    False: _EMAIL_PATTERN + r"$",
+}
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(pattern: str, flags: Any = 0) -> "re.Pattern[str]":
+    """Compile a regex pattern, with a least recently used cache
+
+    :func:`regex`, :func:`url` and :func:`email` share this cache, so a pattern is only compiled once,
+    no matter how many schemas use it.
+
+    Use ``compile_pattern.cache_info()`` to see the hits and misses of the cache,
+    and ``compile_pattern.cache_clear()`` to clear it
+
+    Args:
+        pattern: The regex pattern to compile
+        flags: Flags to pass to :func:`re.compile`
+
+    Returns:
+        The compiled pattern
+    """
+    return re.compile(pattern, flags=flags)
+
+
+def _totally_ordered(value: Any) -> bool:
+    """Whether the value is made of types whose comparisons are a total order, like ints, strings and lists of them
+
+    Sets are only partially ordered by ``<``, and NaN isn't ordered at all, so searching them with bisect is wrong.
+    """
+    if type(value) in (list, tuple):
+        return all(_totally_ordered(item) for item in value)
+    if type(value) is float:
+        return value == value
+    return type(value) in (str, int, bool, bytes)
+
+
+class _SortedValues:
+    """Values that can't be hashed but can be ordered, which are searched with :func:`bisect.bisect_left`"""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: list[Any]) -> None:
+        self.values = values
+
+    def __contains__(self, value: Any) -> bool:
+        if not _totally_ordered(value):
+            return value in self.values
+        try:
+            index = bisect_left(self.values, value)
+        except TypeError:
+            # like a list of strings compared with a list of ints
+            return value in self.values
+        return index != len(self.values) and self.values[index] == value
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def _lookup(values: tuple[Any, ...]) -> Collection[Any]:
+    """Build the fastest container for checking if a value is one of ``values``
+
+    That is a frozenset when all of the values are hashable,
+    then a sorted list when all of the values are totally ordered, and the values themselves otherwise
+    """
+    try:
+        return frozenset(values)
+    except TypeError:
+        pass
+    if not all(_totally_ordered(value) for value in values):
+        return values
+    try:
+        return _SortedValues(sorted(values))
+    except TypeError:
+        return values
+
+
+@builtin
 def length(
     minimum: Optional[int] = None,
     maximum: Optional[int] = None,
@@ -76,20 +186,23 @@ def length(
         elif maximum is not None:
             error_message += _error_messages["maximum"].format(maximum=maximum)
 
-    def inner(value: str):
+    invalid = Invalid(error_message)
+
+    def check(value: str):
         if equal_to is None:
             if minimum is not None and len(value) < minimum:
-                raise ValidatorError(error_message)
+                return invalid
             if maximum is not None and len(value) > maximum:
-                raise ValidatorError(error_message)
+                return invalid
         elif len(value) != equal_to:
-            raise ValidatorError(error_message)
+            return invalid
 
         return value
 
-    return inner
+    return vectorize(checked(check), length_mask(minimum, maximum, equal_to))
 
 
+@builtin
 def range_(
     minimum: Optional[int] = None,
     maximum: Optional[int] = None,
@@ -104,23 +217,31 @@ def range_(
             You can use the ``minimum`` and ``maximum`` variables in the error message
     """
 
-    def inner(value: int):
+    below_minimum = Invalid(error_message.format(minimum=minimum, maximum=maximum or "infinity"))
+    above_maximum = Invalid(error_message.format(minimum=minimum or "0", maximum=maximum))
+
+    def check(value: int):
         if minimum is not None and value < minimum:
-            raise ValidatorError(error_message.format(minimum=minimum, maximum=maximum or "infinity"))
+            return below_minimum
         if maximum is not None and value > maximum:
-            raise ValidatorError(error_message.format(minimum=minimum or "0", maximum=maximum))
+            return above_maximum
 
         return value
 
-    return inner
+    return vectorize(checked(check), range_mask(minimum, maximum))
 
 
+@builtin
+@unordered
 def one_of(*values: Any, error_message: str = "Value must be one of {values}") -> InnerValidator:
     """Checks if the value is in a list of values
 
     Used as a constraint on a field with :class:`cion.Schema`
     No assumptions are made about the type of the value
 
+    When all of the values are hashable, they are stored in a :class:`frozenset`, so the check takes the same time
+    no matter how many values there are. Values that can't be hashed are kept sorted if they can be ordered.
+
     Args:
         values: Any non-keyword arguments are valid values
         error_message (str): The error message that is raised
@@ -130,20 +251,34 @@ def one_of(*values: Any, error_message: str = "Value must be one of {values}") -
         InnerValidator: The inner function that is called when validating schema
     """
 
-    def inner(value: Any):
-        if value not in values:
-            raise ValidatorError(error_message.format(values=", ".join(str(v) for v in values)))
+    invalid = Invalid(error_message.format(values=", ".join(str(v) for v in values)))
+
+    lookup = _lookup(values)
+
+    def check(value: Any):
+        try:
+            found = value in lookup
+        except TypeError:
+            # the value can't be hashed or ordered, so it has to be compared against every value
+            found = value in values
+        if not found:
+            return invalid
         return value
 
-    return inner
+    return vectorize(checked(check), membership_mask(lookup))
 
 
+@builtin
+@unordered
 def not_one_of(*values: Iterable[Any], error_message: str = "Value must not be one of {values}") -> InnerValidator:
     """Checks if the value is not in a list of values
 
     Used as a constraint on a field with :class:`cion.Schema`
     No assumptions are made about the type of the value
 
+    When all of the values are hashable, they are stored in a :class:`frozenset`, so the check takes the same time
+    no matter how many values there are. Values that can't be hashed are kept sorted if they can be ordered.
+
     Args:
         values: Any non-keyword arguments are valid values
         error_message (str): The error message that is raised
@@ -153,14 +288,24 @@ def not_one_of(*values: Iterable[Any], error_message: str = "Value must not be o
         InnerValidator: The inner function that is called when validating schema
     """
 
-    def inner(value: Any):
-        if value in values:
-            raise ValidatorError(error_message.format(values=", ".join(str(v) for v in values)))
+    invalid = Invalid(error_message.format(values=", ".join(str(v) for v in values)))
+
+    lookup = _lookup(values)
+
+    def check(value: Any):
+        try:
+            found = value in lookup
+        except TypeError:
+            # the value can't be hashed or ordered, so it has to be compared against every value
+            found = value in values
+        if found:
+            return invalid
         return value
 
-    return inner
+    return vectorize(checked(check), membership_mask(lookup, negate=True))
 
 
+@builtin
 def equal_to(value_: Any, error_message: str = "Must be equal to {equal_to}") -> InnerValidator:
     """Validator that ensures a value is equal to a certain value
 
@@ -173,26 +318,33 @@ def equal_to(value_: Any, error_message: str = "Must be equal to {equal_to}") ->
 
     """
 
-    def inner(value: Any) -> Any:
+    invalid = Invalid(error_message.format(equal_to=str(value_)))
+
+    def check(value: Any) -> Any:
         if value != value_:
-            raise ValidatorError(error_message.format(equal_to=str(equal_to)))
+            return invalid
 
         return value
 
-    return inner
+    return checked(check)
 
 
+@builtin
 def uuid(error_message: str = "Must be a valid UUID", **kwargs) -> InnerValidator:
-    def inner(value: str) -> UUID:
+    from uuid import UUID
+
+    invalid = Invalid(error_message)
+
+    def check(value: str) -> Any:
         try:
-            transformed = UUID(value, **kwargs)
+            return UUID(value, **kwargs)
         except (ValueError, AttributeError, TypeError):
-            raise ValidatorError(error_message)
-        return transformed
+            return invalid
 
-    return inner
+    return checked(check)
 
 
+@builtin
 def regex(
     pattern: str,
     *,
@@ -221,39 +373,93 @@ def regex(
         kwargs: Arguments to pass to the method used for matching (again, see regex docs related to the function)
 
     """
-    prog = re.compile(pattern, flags=flags)
+    prog = compile_pattern(pattern, flags)
     to_call = getattr(prog, function)
 
-    def inner(value: str) -> Any:
+    invalid = Invalid(error_message)
+
+    def check(value: str) -> Any:
         casted = str(value)
         match = to_call(casted, **kwargs)
         if match is None:
-            raise ValidatorError(error_message)
+            return invalid
 
         return casted if cast is True else value
 
-    return inner
+    return checked(check)
 
 
-def url(schemes: list[str] = ["http", "https"], *, error_message: str = "Must be a valid URL") -> InnerValidator:
+@builtin
+def url(
+    schemes: list[str] = ["http", "https"],
+    *,
+    engine: Literal["regex", "parse"] = "regex",
+    error_message: str = "Must be a valid URL",
+) -> InnerValidator:
     """Validates that a value is a valid URL
 
-    This implementation uses :func:`regex` under the hood
+    By default this uses :func:`regex` under the hood. With ``engine="parse"``, the value is split apart with
+    :meth:`str.partition` and each part is checked with :meth:`str.translate`, which accepts and rejects the same
+    values as the regex without running the regex engine. Values that are too short or too long are rejected
+    before anything else is looked at.
 
     Args:
         schemes: A list of http schemes that will be valid
+        engine: ``"regex"`` or ``"parse"``. The parse engine compares the schemes as plain strings
         error_message: The error message to raise if a value is not a valid URL
     """
-
-    return regex(
-        rf"({'|'.join(schemes)}):\/\/[-a-zA-Z0-9@:%_\+~#=]{{1,256}}\.[a-z]{{1,25}}[-a-zA-Z0-9@:%_\+.~#?&//=]",
-        cast=True,
-        flags=re.IGNORECASE,
-        error_message=error_message,
-    )
-
-
-def email(require_tld: bool = True, *, error_message="Must be an email") -> InnerValidator:
+    if engine == "regex":
+        return regex(
+            rf"({'|'.join(schemes)}):\/\/[-a-zA-Z0-9@:%_\+~#=]{{1,256}}\.[a-z]{{1,25}}[-a-zA-Z0-9@:%_\+.~#?&//=]",
+            cast=True,
+            flags=re.IGNORECASE,
+            error_message=error_message,
+        )
+    if engine != "parse":
+        raise ValueError(f"Unknown URL engine: {engine!r}")
+
+    names = frozenset(scheme.lower() for scheme in schemes) or frozenset([""])
+    # the scheme, "://", 1 to 256 characters of host, ".", 1 to 25 letters, and a final character
+    shortest = min(map(len, names)) + 7
+    longest = max(map(len, names)) + 286
+
+    invalid = Invalid(error_message)
+
+    def check(value: Any) -> Any:
+        casted = str(value)
+        if not shortest <= len(casted) <= longest:
+            return invalid
+        scheme, separator, rest = casted.partition("://")
+        if not separator or (scheme not in names and scheme.translate(_CASEFOLD).lower() not in names):
+            return invalid
+        # the host can't contain a dot, so the first one is the one before the letters
+        dot = rest.find(".")
+        if dot < 1 or dot > 256:
+            return invalid
+        letters = rest[dot + 1 : -1]
+        if not 1 <= len(letters) <= 25:
+            return invalid
+        if rest[-1] not in _URL_END:
+            return invalid
+        # most hosts are ASCII letters and digits, which are checked without translating
+        host = rest[:dot]
+        if not (host.isascii() and host.isalnum()) and host.translate(_URL_HOST):
+            return invalid
+        if not (letters.isascii() and letters.isalpha()) and letters.translate(_LETTERS):
+            return invalid
+
+        return casted
+
+    return checked(check)
+
+
+@builtin
+def email(
+    require_tld: bool = True,
+    *,
+    engine: Literal["regex", "fast"] = "regex",
+    error_message="Must be an email",
+) -> InnerValidator:
     """Validates an email address
 
     There are very many ways to match email addresses, ranging from just requiring the ``@`` symbol, to a large and slow regex.
@@ -261,14 +467,50 @@ def email(require_tld: bool = True, *, error_message="Must be an email") -> Inne
     This email validator is under development, and will, for the most part, validate valid email addresses: ie, no valid email address will be rejected. However, there are a great many strings that will still match, valid email or not.
     If you have your own method if validating email addresses, you can do that with a custom validator.
 
+    With ``engine="fast"``, the address is split at the ``@`` symbol and each part is checked with
+    :meth:`str.translate`, which accepts and rejects the same values as the regex without running the regex engine.
+    Values that are too short or too long are rejected before anything else is looked at.
+
     Args:
         require_tld: Whether or not to require a TLD, like, ".com".
 
             Example: with ``require_tld=False``, ``meizuflux@example`` will be valid.
             With ``require_tld=True``, it will not be, but adding a ``.com`` will make it valid.
+        engine: ``"regex"`` or ``"fast"``
         error_message: The error message to raise if the value is not a valid email
     """
-    to_compile = r"^(?=.{6,254}$)[0-9a-zA-Z_.+-]{1,249}@[0-9a-zA-Z_.-]{1,249}" + (
-        r"\..{2,24}$" if require_tld else r"$"
-    )
-    return regex(to_compile, cast=False, flags=re.IGNORECASE, error_message=error_message)
+    if engine == "regex":
+        return regex(_EMAIL_PATTERNS[bool(require_tld)], cast=False, flags=re.IGNORECASE, error_message=error_message)
+    if engine != "fast":
+        raise ValueError(f"Unknown email engine: {engine!r}")
+
+    invalid = Invalid(error_message)
+
+    def check(value: Any) -> Any:
+        casted = str(value)
+        length = len(casted)
+        if length < 6 or length > 254 or "\n" in casted:
+            return invalid
+        # the local part can't contain an @, so the address is split at the first one
+        local, at, domain = casted.partition("@")
+        if not at or not local or len(local) > 249:
+            return invalid
+        # most addresses are ASCII letters and digits, which are checked without translating
+        if not (local.isascii() and local.isalnum()) and local.translate(_EMAIL_LOCAL):
+            return invalid
+        if require_tld:
+            # the TLD is the 2 to 24 characters after a dot, the first dot that leaves at most 24 has the most
+            # chance of everything before it being allowed in a domain
+            length = len(domain)
+            dot = domain.find(".", length - 25 if length > 26 else 1)
+            if dot == -1 or dot > length - 3 or dot > 249:
+                return invalid
+            domain = domain[:dot]
+        elif not domain or len(domain) > 249:
+            return invalid
+        if not (domain.isascii() and domain.isalnum()) and domain.translate(_EMAIL_DOMAIN):
+            return invalid
+
+        return value
+
+    return checked(check)
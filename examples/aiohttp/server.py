@@ -16,7 +16,9 @@ LoginSchema = cion.Schema(
             filters=[cion.types.string(), cion.validators.length(3, 1024)],
             required=True,
         ),
-    }
+    },
+    # the form data is validated as is, without copying it to a dict first
+    options=cion.Options(mutate_data=False),
 )
 
 FORM = """
@@ -55,7 +57,7 @@ async def validate_data(request: web.Request):
     data = await request.post()
 
     try:
-        validated_data = LoginSchema.validate(dict(data))
+        validated_data = LoginSchema.validate(data)
     except cion.ValidationError as error:
         return web.Response(
             body=FORM.format(errors="<br>".join(f"{k}: {', '.join(v)}" for k, v in error.errors.items())).encode(
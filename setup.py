@@ -40,6 +40,12 @@ setup(
     version=version,
     install_requires=[],
     extras_require={
+        "numpy": [
+            "numpy",
+        ],
+        "json": [
+            "orjson",
+        ],
         "docs": [
             "sphinx",
             "sphinx-copybutton",
@@ -1,4 +1,7 @@
 from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
 
 import pytest
 
@@ -24,8 +27,84 @@ class CannotCast:
         (converters.integer, 1000, 1000, DOES_NOT_RAISE),
         (converters.integer, None, None, RAISES),
         (converters.integer, "1000", 1000, DOES_NOT_RAISE),
+        (converters.integer, "ten", None, RAISES),
+        (converters.float_, 1.5, 1.5, DOES_NOT_RAISE),
+        (converters.float_, "1.5", 1.5, DOES_NOT_RAISE),
+        (converters.float_, 2, 2.0, DOES_NOT_RAISE),
+        (converters.float_, None, None, RAISES),
+        (converters.float_, "one", None, RAISES),
+        (converters.boolean, True, True, DOES_NOT_RAISE),
+        (converters.boolean, 0, False, DOES_NOT_RAISE),
+        (converters.boolean, "TRUE", True, DOES_NOT_RAISE),
+        (converters.boolean, "off", False, DOES_NOT_RAISE),
+        (converters.boolean, "false", False, DOES_NOT_RAISE),
+        (converters.boolean, 2, None, RAISES),
+        (converters.boolean, 1.0, None, RAISES),
+        (converters.boolean, "maybe", None, RAISES),
+        (converters.decimal, Decimal("1.10"), Decimal("1.10"), DOES_NOT_RAISE),
+        (converters.decimal, "1.10", Decimal("1.10"), DOES_NOT_RAISE),
+        (converters.decimal, 0.1, Decimal("0.1"), DOES_NOT_RAISE),
+        (converters.decimal, 3, Decimal(3), DOES_NOT_RAISE),
+        (converters.decimal, "ten", None, RAISES),
+        (converters.decimal, None, None, RAISES),
+        (converters.datetime, datetime(2022, 9, 23), datetime(2022, 9, 23), DOES_NOT_RAISE),
+        (converters.datetime, "2022-09-23T10:30:00", datetime(2022, 9, 23, 10, 30), DOES_NOT_RAISE),
+        (
+            converters.datetime,
+            "2022-09-23T10:30:00+02:00",
+            datetime(2022, 9, 23, 10, 30, tzinfo=timezone(timedelta(hours=2))),
+            DOES_NOT_RAISE,
+        ),
+        (
+            converters.datetime,
+            "2022-09-23T10:30:00Z",
+            datetime(2022, 9, 23, 10, 30, tzinfo=timezone.utc),
+            DOES_NOT_RAISE,
+        ),
+        (converters.datetime, "yesterday", None, RAISES),
+        (converters.datetime, 1663929000, None, RAISES),
+        (
+            converters.uuid,
+            UUID("9c10b73c-137f-4bc4-bf46-1f4ff29aac00"),
+            UUID("9c10b73c-137f-4bc4-bf46-1f4ff29aac00"),
+            DOES_NOT_RAISE,
+        ),
+        (
+            converters.uuid,
+            "9c10b73c-137f-4bc4-bf46-1f4ff29aac00",
+            UUID("9c10b73c-137f-4bc4-bf46-1f4ff29aac00"),
+            DOES_NOT_RAISE,
+        ),
+        (converters.uuid, "9c10b73c", None, RAISES),
+        (converters.uuid, 1, None, RAISES),
     ],
 )
 def test_types(type_, value, expected_value, expectation):
     with expectation:
         assert type_()(value) == expected_value
+
+
+@pytest.mark.parametrize(
+    ("type_", "value"),
+    [
+        (converters.string, "1000"),
+        (converters.integer, 1000),
+        (converters.float_, 1.5),
+        (converters.boolean, False),
+        (converters.decimal, Decimal("1.10")),
+        (converters.datetime, datetime(2022, 9, 23)),
+        (converters.uuid, UUID("9c10b73c-137f-4bc4-bf46-1f4ff29aac00")),
+    ],
+)
+def test_fast_path(type_, value):
+    assert type_().check(value) is value
+
+
+class Interrupting:
+    def __int__(self):
+        raise KeyboardInterrupt
+
+
+def test_interrupts_are_not_caught():
+    with pytest.raises(KeyboardInterrupt):
+        converters.integer()(Interrupting())
@@ -1,3 +1,8 @@
+import pickle
+import sys
+
+import pytest
+
 import cion
 
 
@@ -10,3 +15,81 @@ def test_validation_error():
     assert str(error) == "Errors were raised: {'username': ['Must be a string']}"
 
     assert f"{error!r}" == "<ValidationError errors={'username': ['Must be a string']} data={'password': 'qwertyuiop'}>"
+
+
+def test_invalid():
+    invalid = cion.Invalid("Must be a string")
+
+    assert invalid.message == "Must be a string"
+    assert f"{invalid!r}" == "<Invalid message='Must be a string'>"
+
+
+def test_validation_error_pickle():
+    error = pickle.loads(pickle.dumps(cion.ValidationError({"username": ["Must be a string"]}, {"age": 20})))
+
+    assert error.errors == {"username": ["Must be a string"]}
+    assert error.data == {"age": 20}
+    assert str(error) == "Errors were raised: {'username': ['Must be a string']}"
+
+
+def test_validator_error_slots():
+    error = cion.ValidatorError("Must be a string")
+
+    assert error.message == "Must be a string"
+    assert "message" in cion.ValidatorError.__slots__
+    assert "data" in cion.ValidationError.__slots__
+
+
+def test_validation_error_entries():
+    error = cion.ValidationError._from_entries(
+        [("username", "Must be a string"), ("age", "Must be an integer"), ("username", "Too short")], {}
+    )
+
+    assert error.errors == {"username": ["Must be a string", "Too short"], "age": ["Must be an integer"]}
+    assert error.errors is error.errors
+    assert str(error) == (
+        "Errors were raised: {'username': ['Must be a string', 'Too short'], 'age': ['Must be an integer']}"
+    )
+
+    error.errors = {"age": ["Must be an integer"]}
+    assert error.errors == {"age": ["Must be an integer"]}
+    assert error.args == ({"age": ["Must be an integer"]}, {})
+
+
+def test_validation_error_args():
+    schema = cion.Schema(fields={"name": cion.Field(filters=[cion.types.string()]), "age": cion.Field()})
+
+    with pytest.raises(cion.ValidationError) as info:
+        schema.validate({"name": 1, "age": 20})
+    error = info.value
+
+    assert error.args == ({"name": ["Field must be a valid string"]}, {"name": 1, "age": 20})
+    assert repr(error) == (
+        "<ValidationError errors={'name': ['Field must be a valid string']} data={'name': 1, 'age': 20}>"
+    )
+    assert pickle.loads(pickle.dumps(error)).args == error.args
+    # the attributes are kept in slots, not in a __dict__
+    assert error.__dict__ == {}
+
+
+def test_validation_error_to_dict():
+    error = cion.ValidationError({"username": ["Must be a string"]}, {})
+
+    assert error.to_dict() == {"errors": {"username": ["Must be a string"]}}
+
+
+def test_validation_error_to_json(monkeypatch):
+    import json
+
+    import cion._json
+
+    error = cion.ValidationError({"username": ["Must be a string"], 1: ["Must be an integer"]}, {})
+    expected = {"errors": {"username": ["Must be a string"], "1": ["Must be an integer"]}}
+
+    assert json.loads(error.to_json()) == expected
+
+    # without orjson
+    monkeypatch.setattr(cion._json, "_dumps", None)
+    monkeypatch.setitem(sys.modules, "orjson", None)
+
+    assert json.loads(error.to_json()) == expected
@@ -0,0 +1,57 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import cion
+
+#: Modules that must not be imported by ``import cion`` and the use of a schema with the types
+UNUSED = (
+    "asyncio",
+    "concurrent.futures",
+    "multiprocessing",
+    "dataclasses",
+    "inspect",
+    "decimal",
+    "uuid",
+    "datetime",
+    "cion.converters",
+    "cion.validators",
+    "cion._async",
+    "cion._cache",
+    "cion._parallel",
+)
+
+#: How many modules that the interpreter didn't already have may be imported,
+#: which is checked instead of the import time, since that depends on the machine
+MODULE_BUDGET = 40
+
+SCRIPT = """
+import json, sys
+before = set(sys.modules)
+import cion
+cion.Schema(fields={"name": cion.Field(filters=[cion.types.string()])}).validate({"name": "John"})
+print(json.dumps(sorted(set(sys.modules) - before)))
+"""
+
+
+def run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True)
+
+
+def test_import_modules():
+    imported = json.loads(run("-c", SCRIPT).stdout)
+
+    assert [name for name in UNUSED if name in imported] == []
+    assert len(imported) <= MODULE_BUDGET, imported
+
+
+def test_lazy_attributes():
+    assert cion.Schema is cion.schema.Schema
+    assert cion.ValidationError is cion.exceptions.ValidationError
+    assert cion.converters.integer is not None
+    assert set(cion.__all__) <= set(dir(cion))
+
+    with pytest.raises(AttributeError):
+        cion.missing
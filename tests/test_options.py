@@ -1,3 +1,6 @@
+import copy
+import pickle
+
 import cion
 
 
@@ -6,3 +9,15 @@ def test_options():
 
     assert options.extra == cion.options.ExtraFields.COMBINE
     assert options.stop_on_error == False
+    assert options.mutate_data == True
+
+
+def test_options_copy():
+    options = cion.Options(extra=cion.options.ExtraFields.ERROR, stop_on_error=True)
+    schema = cion.Schema(fields={"name": cion.Field()}, options=options)
+
+    for copied in (pickle.loads(pickle.dumps(options)), copy.copy(options), copy.deepcopy(options)):
+        assert (copied.extra, copied.stop_on_error, copied.mutate_data) == (cion.options.ExtraFields.ERROR, True, True)
+        # the copy isn't used by the schema of the original
+        assert list(copied._schemas) == []
+        assert list(options._schemas) == [schema]
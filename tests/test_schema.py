@@ -1,3 +1,11 @@
+import asyncio
+import copy
+import dataclasses
+import pickle
+import sys
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
 import pytest
 
 import cion
@@ -63,3 +71,1040 @@ def test_schema():
 
     with pytest.raises(ValidationError):
         schema.validate({"name": "John", "weight": 67})
+
+
+def test_compile():
+    schema = cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string()], required=True),
+            "age": cion.Field(filters=[cion.types.integer(), cion.validators.range_(0, 150)], default=10),
+            "nickname": cion.Field(filters=[cion.types.string()], nullable=True),
+        }
+    )
+
+    compiled = schema.compile()
+    assert schema.validate({"name": "John"}) == compiled({"name": "John"}) == {"name": "John", "age": 10}
+    assert compiled({"name": "John", "nickname": None}) == {"name": "John", "age": 10, "nickname": None}
+
+    with pytest.raises(ValidationError) as error:
+        compiled({"age": "old", "nickname": 5})
+    assert error.value.errors == {
+        "name": ["This field is required"],
+        "age": ["Field must be a valid integer"],
+        "nickname": ["Field must be a valid string"],
+    }
+
+    # filters that raise something other than a ValidatorError are ignored
+    assert cion.Schema({"a": cion.Field(filters=[int])}).validate({"a": "a"}) == {"a": "a"}
+
+    # a filter that returns None stops the rest of the filters from being called
+    assert cion.Schema({"a": cion.Field(filters=[lambda _: None, cion.types.string()])}).validate({"a": 1}) == {
+        "a": None
+    }
+
+
+def test_compile_options_change():
+    schema = cion.Schema(fields={"name": cion.Field(filters=[cion.types.string()])})
+    data = {"name": "John", "weight": 67}
+
+    assert schema.validate(dict(data)) == {"name": "John"}
+
+    schema.options.extra = ExtraFields.COMBINE
+    assert schema.validate(dict(data)) == data
+
+    schema.options.extra = ExtraFields.ERROR
+    with pytest.raises(ValidationError) as error:
+        schema.validate(dict(data))
+    assert error.value.errors == {cion.schema.RESERVED_ERROR_KEY: ["Found extra data: weight"]}
+
+    schema.options = cion.Options(stop_on_error=True)
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"name": 1})
+    assert error.value.errors == {"name": ["Field must be a valid string"]}
+    assert error.value.data == {}
+
+
+def test_stop_on_error():
+    schema = cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string()], required=True),
+            "age": cion.Field(filters=[cion.converters.integer(), cion.validators.range_(0, 150)]),
+            "role": cion.Field(filters=[lambda value: value]),
+        },
+        options=cion.Options(stop_on_error=True),
+    )
+
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"name": "John", "age": "200", "role": "admin"})
+    assert error.value.errors == {"age": ["Number must be between 0 and 150"]}
+    # the fields that were validated before the error are kept
+    assert error.value.data == {"name": "John"}
+    # the error is raised at the top level of the validator, not while handling another exception
+    assert error.value.__context__ is None
+
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"name": "John", "age": "old"})
+    assert error.value.errors == {"age": ["Field must be a valid integer"]}
+    assert error.value.__context__ is None
+
+
+def test_validate_many():
+    schema = cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string()], required=True),
+            "age": cion.Field(filters=[cion.types.integer()]),
+        }
+    )
+
+    result = schema.validate_many(iter([{"name": "John"}, {"name": 1}, {"age": 5}, {"name": "Jane", "age": 5}]))
+
+    assert result.valid == {0: {"name": "John"}, 3: {"name": "Jane", "age": 5}}
+    assert result.errors == {1: {"name": ["Field must be a valid string"]}, 2: {"name": ["This field is required"]}}
+    # the errors are plain dicts, like the ones of validate, so reading a missing key doesn't add it
+    assert [type(errors) for errors in result.errors.values()] == [dict, dict]
+    assert [type(errors) for _, _, errors in schema.iter_validate([{"name": 1}])] == [dict]
+
+    schema.options.stop_on_error = True
+    valid, errors = schema.validate_many([{"age": "5"}, {"name": "John"}])
+
+    assert valid == {1: {"name": "John"}}
+    assert errors == {0: {"name": ["This field is required"]}}
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, 2, 10])
+def test_iter_validate(chunksize):
+    schema = cion.Schema(fields={"name": cion.Field(filters=[cion.types.string()], required=True)})
+
+    def records():
+        yield {"name": "John"}
+        yield {"name": 1}
+        yield {}
+        yield {"name": "Jane"}
+
+    assert list(schema.iter_validate(records(), chunksize=chunksize)) == [
+        (0, {"name": "John"}, None),
+        (1, None, {"name": ["Field must be a valid string"]}),
+        (2, None, {"name": ["This field is required"]}),
+        (3, {"name": "Jane"}, None),
+    ]
+    assert list(schema.iter_validate(records(), max_errors=1, chunksize=chunksize)) == [
+        (0, {"name": "John"}, None),
+        (1, None, {"name": ["Field must be a valid string"]}),
+    ]
+
+    schema.options.stop_on_error = True
+    assert [index for index, _, errors in schema.iter_validate(records(), chunksize=chunksize) if errors] == [1, 2]
+
+    with pytest.raises(ValueError):
+        schema.iter_validate(records(), max_errors=0, chunksize=chunksize)
+    with pytest.raises(ValueError):
+        schema.iter_validate(records(), chunksize=0)
+
+
+def test_validate_columns():
+    def double(value):
+        if value > 100:
+            raise cion.ValidatorError("Too large")
+        return value * 2
+
+    schema = cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string(), cion.validators.length(1, 4)], required=True),
+            "age": cion.Field(filters=[cion.types.integer(), cion.validators.range_(0, 150), double]),
+            "role": cion.Field(filters=[cion.validators.one_of("admin", "user")], default="user", nullable=True),
+        }
+    )
+
+    validated, masks, errors = schema.validate_columns(
+        {
+            "name": ["John", "Jonathan", 5, None],
+            "age": [20, 151, "20", 101],
+            "role": ["admin", None, "root", "user"],
+        }
+    )
+
+    assert validated["age"] == [40, 151, "20", 101]
+    assert masks == {
+        "name": [True, False, False, False],
+        "age": [True, False, False, False],
+        "role": [True, True, False, True],
+    }
+    assert errors == {
+        1: {"name": ["Length must be greater than 1 and less than 4"], "age": ["Number must be between 0 and 150"]},
+        2: {
+            "name": ["Field must be a valid string"],
+            "age": ["Field must be a valid integer"],
+            "role": ["Value must be one of admin, user"],
+        },
+        3: {"name": ["This field is not allowed to be None"], "age": ["Too large"]},
+    }
+
+    validated, masks, errors = schema.validate_columns({"age": [1, 2]})
+    assert validated == {"age": [2, 4], "role": ["user", "user"]}
+    assert errors == {0: {"name": ["This field is required"]}, 1: {"name": ["This field is required"]}}
+
+    with pytest.raises(ValueError):
+        schema.validate_columns({"name": ["John"], "age": []})
+
+
+def test_validate_columns_numpy():
+    np = pytest.importorskip("numpy")
+
+    schema = cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string(), cion.validators.length(maximum=4)]),
+            "age": cion.Field(filters=[cion.types.integer(), cion.validators.range_(0, 150)]),
+            "role": cion.Field(filters=[cion.validators.one_of("admin", "user")]),
+        }
+    )
+
+    _, masks, errors = schema.validate_columns(
+        {
+            "name": np.array(["John", "Jonathan"]),
+            "age": np.array([20, 151]),
+            "role": np.array(["admin", "root"]),
+        }
+    )
+
+    assert masks["name"].tolist() == masks["age"].tolist() == masks["role"].tolist() == [True, False]
+    assert list(errors) == [1]
+
+    # values of different types are not converted to the dtype of the column
+    schema = cion.Schema(fields={"code": cion.Field(filters=[cion.validators.one_of("1", 2)])})
+    _, masks, errors = schema.validate_columns({"code": np.array(["2", "1"])})
+    assert masks["code"].tolist() == [False, True]
+    assert list(errors) == [0]
+    _, masks, _ = schema.validate_columns({"code": np.array([2, 1])})
+    assert masks["code"].tolist() == [True, False]
+
+
+def test_check_filters():
+    def filter_(value):
+        raise AssertionError("the schema should call check")
+
+    invalid = cion.Invalid("Must be positive")
+    filter_.check = lambda value: value if value > 0 else invalid
+
+    schema = cion.Schema(fields={"number": cion.Field(filters=[filter_])})
+
+    assert schema.validate({"number": 1}) == {"number": 1}
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"number": -1})
+    assert error.value.errors == {"number": ["Must be positive"]}
+
+    # like any other filter, exceptions other than ValidatorError are ignored
+    assert schema.validate({"number": "1"}) == {"number": "1"}
+
+
+def test_validate_async():
+    running = 0
+    most_running = 0
+    calls = []
+
+    def exists(name):
+        async def inner(value):
+            nonlocal running, most_running
+            running += 1
+            most_running = max(running, most_running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            calls.append(name)
+            if value == "missing":
+                raise cion.ValidatorError(f"{name} does not exist")
+            return value
+
+        return inner
+
+    schema = cion.Schema(
+        fields={
+            "user": cion.Field(filters=[cion.types.string(), exists("user"), cion.validators.length(3)]),
+            "team": cion.Field(filters=[exists("team"), exists("team again")], required=True),
+            "age": cion.Field(filters=[cion.types.integer()], default=10),
+        }
+    )
+
+    assert asyncio.run(schema.validate_async({"user": "meizuflux", "team": "cion"})) == {
+        "user": "meizuflux",
+        "team": "cion",
+        "age": 10,
+    }
+    assert most_running == 2
+    # filters of the same field are called in order
+    assert calls.index("team") < calls.index("team again")
+
+    most_running = 0
+    asyncio.run(schema.validate_async({"user": "meizuflux", "team": "cion"}, concurrency=1))
+    assert most_running == 1
+
+    with pytest.raises(ValidationError) as error:
+        asyncio.run(schema.validate_async({"user": "missing", "team": "missing", "age": "10"}))
+    assert error.value.errors == {
+        "user": ["user does not exist"],
+        "team": ["team does not exist", "team again does not exist"],
+        "age": ["Field must be a valid integer"],
+    }
+
+    schema.options.stop_on_error = True
+    with pytest.raises(ValidationError) as error:
+        asyncio.run(schema.validate_async({"user": "missing", "team": "cion", "age": "10"}))
+    assert error.value.errors == {"age": ["Field must be a valid integer"]}
+    # like validate, the error carries the fields that were validated before it, here none of the slow ones
+    assert error.value.data == {}
+
+    with pytest.raises(ValidationError) as error:
+        asyncio.run(schema.validate_async({"user": "meizuflux", "team": "missing", "age": 10}))
+    assert error.value.errors == {"team": ["team does not exist"]}
+    assert error.value.data == {"user": "meizuflux", "age": 10}
+
+
+def even(value):
+    if value % 2 != 0:
+        raise cion.ValidatorError("Must be even")
+    return value
+
+
+def parallel_schema():
+    return cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string(), cion.validators.length(3, 64)], required=True),
+            "age": cion.Field(filters=[cion.converters.integer(), cion.validators.range_(0, 150), even], default=10),
+            "role": cion.Field(filters=[cion.validators.one_of("admin", "user")], nullable=True),
+            "email": cion.Field(filters=[cion.validators.email()]),
+        },
+        options=cion.Options(extra=ExtraFields.ERROR),
+    )
+
+
+def test_describe():
+    schema = parallel_schema()
+    description = schema.describe()
+
+    assert description["fields"]["name"]["filters"][1] == ("cion.validators", "length", (3, 64), {})
+    assert description["fields"]["age"]["filters"][2] is even
+    assert description["options"] == {"extra": "error", "stop_on_error": False, "mutate_data": True, "cache": None}
+    assert description["output"] is None
+
+    for rebuilt in (cion.Schema.from_description(description), pickle.loads(pickle.dumps(schema))):
+        assert rebuilt.options.extra is ExtraFields.ERROR
+        assert rebuilt.validate({"name": "John", "age": "20", "email": "john@example.com"}) == {
+            "name": "John",
+            "age": 20,
+            "email": "john@example.com",
+        }
+        with pytest.raises(ValidationError) as error:
+            rebuilt.validate({"name": "J", "age": 21, "role": "root", "email": "john"})
+        assert set(error.value.errors) == {"name", "age", "role", "email"}
+
+    description["fields"]["name"]["filters"][0] = ("os", "system", ("true",), {})
+    with pytest.raises(ValueError):
+        cion.Schema.from_description(description)
+    # functions of cion that aren't filter factories aren't called either
+    for module, name in (("cion._compiler", "_generate"), ("cion.validators", "compile_pattern"), ("cion.nope", "x")):
+        description["fields"]["name"]["filters"][0] = (module, name, ("print(1)", {}, "name"), {})
+        with pytest.raises(ValueError, match="not a built-in filter"):
+            cion.Schema.from_description(description)
+
+
+def test_validate_parallel():
+    schema = parallel_schema()
+    records = [{"name": "John", "age": i} for i in range(100)]
+
+    valid, errors = schema.validate_parallel(records, workers=2, chunksize=7)
+
+    assert valid == {i: {"name": "John", "age": i} for i in range(0, 100, 2)}
+    assert errors == {i: {"age": ["Must be even"]} for i in range(1, 100, 2)}
+    assert list(valid) == sorted(valid)
+
+    with pytest.raises(ValueError):
+        schema.validate_parallel(records, chunksize=0)
+
+
+def nested_schema():
+    item = cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string()], required=True),
+            "price": cion.Field(filters=[cion.converters.integer(), cion.validators.range_(minimum=0)], required=True),
+        }
+    )
+    address = cion.Schema(fields={"city": cion.Field(filters=[cion.types.string()], required=True)})
+    return cion.Schema(
+        fields={
+            "address": cion.Field(schema=address, required=True),
+            "items": cion.Field(filters=[cion.validators.length(maximum=100)], items=item, default=[]),
+        }
+    )
+
+
+def test_nested():
+    schema = nested_schema()
+
+    assert schema.validate({"address": {"city": "Paris", "zip": 75001}, "items": [{"name": "a", "price": "5"}]}) == {
+        "address": {"city": "Paris"},
+        "items": [{"name": "a", "price": 5}],
+    }
+    assert schema.validate({"address": {"city": "Paris"}}) == {"address": {"city": "Paris"}, "items": []}
+
+    data = {
+        "address": {"city": 1},
+        "items": [{"name": "a", "price": 5}] * 3 + [{"name": "b", "price": -1}, {"price": "free"}],
+    }
+    expected = {
+        "address.city": ["Field must be a valid string"],
+        "items.3.price": ["Number must be between 0 and infinity"],
+        "items.4.name": ["This field is required"],
+        "items.4.price": ["Field must be a valid integer"],
+    }
+    with pytest.raises(ValidationError) as error:
+        schema.validate(copy.deepcopy(data))
+    assert error.value.errors == expected
+
+    assert schema.validate_many([copy.deepcopy(data)]).errors == {0: expected}
+    with pytest.raises(ValidationError) as error:
+        asyncio.run(schema.validate_async(copy.deepcopy(data)))
+    assert error.value.errors == expected
+    columns = copy.deepcopy({"address": [data["address"]], "items": [data["items"]]})
+    assert schema.validate_columns(columns).errors == {0: expected}
+    assert pickle.loads(pickle.dumps(schema)).validate_many([copy.deepcopy(data)]).errors == {0: expected}
+
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"address": "Paris", "items": {"name": "a"}})
+    assert error.value.errors == {"address": ["Field must be an object"], "items": ["Field must be a list"]}
+
+    schema.options.stop_on_error = True
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"address": {"city": "Paris"}, "items": data["items"]})
+    assert error.value.errors == {"items.3.price": ["Number must be between 0 and infinity"]}
+
+    with pytest.raises(ValueError):
+        cion.Field(schema=schema, items=schema)
+
+
+def test_nested_read_only():
+    schema = nested_schema()
+    address = MappingProxyType({"city": 1})
+    data = {"address": address, "items": [MappingProxyType({"name": "a", "price": -1})]}
+
+    # nested mappings that can't be changed are validated without removing the failed fields from them
+    with pytest.raises(ValidationError) as error:
+        schema.validate(data)
+    assert error.value.errors == {
+        "address.city": ["Field must be a valid string"],
+        "items.0.price": ["Number must be between 0 and infinity"],
+    }
+    assert dict(address) == {"city": 1}
+
+
+def test_nested_columns_numpy():
+    np = pytest.importorskip("numpy")
+    schema = nested_schema()
+
+    addresses = np.empty(2, dtype=object)
+    addresses[:] = [{"city": "Paris"}, {"city": 1}]
+    validated, masks, errors = schema.validate_columns({"address": addresses})
+
+    # the array is validated into a list, since the nested schemas return new values
+    assert isinstance(validated["address"], list)
+    assert validated["address"][0] == {"city": "Paris"}
+    assert masks["address"].tolist() == [True, False]
+    assert errors == {1: {"address.city": ["Field must be a valid string"]}}
+
+
+@pytest.mark.parametrize("extra", list(ExtraFields))
+def test_mutate_data(extra):
+    schema = cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string()], required=True),
+            "age": cion.Field(filters=[cion.types.integer()]),
+            "address": cion.Field(schema=cion.Schema({"city": cion.Field(filters=[cion.types.string()])})),
+        },
+        options=cion.Options(extra=extra, mutate_data=False),
+    )
+    data = {"name": 1, "age": None, "address": {"city": 1}, "weight": 67}
+    view = MappingProxyType(data)
+
+    with pytest.raises(ValidationError):
+        schema.validate(view)
+    with pytest.raises(ValidationError):
+        asyncio.run(schema.validate_async(view))
+    schema.validate_many([view])
+    assert data == {"name": 1, "age": None, "address": {"city": 1}, "weight": 67}
+
+    if extra is ExtraFields.COMBINE:
+        assert schema.validate(MappingProxyType({"name": "John", "weight": 67})) == {"name": "John", "weight": 67}
+    if extra is ExtraFields.IGNORE:
+        assert schema.validate(MappingProxyType({"name": "John", "weight": 67})) == {"name": "John"}
+
+
+@pytest.mark.parametrize("orjson", [True, False])
+def test_validate_json(orjson, monkeypatch):
+    if orjson is True:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setattr(cion._json, "_loads", None)
+
+    schema = cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string()], required=True),
+            "tags": cion.Field(filters=[cion.validators.length(maximum=2)]),
+        }
+    )
+    payload = b'{"name": "John", "tags": ["a", "b"], "extra": {"nested": [1, 2, 3]}}'
+
+    assert schema.validate_json(payload) == {"name": "John", "tags": ["a", "b"]}
+    assert schema.validate_json(memoryview(payload)) == {"name": "John", "tags": ["a", "b"]}
+    assert schema.validate_json(payload.decode()) == {"name": "John", "tags": ["a", "b"]}
+
+    with pytest.raises(ValidationError) as error:
+        schema.validate_json(b'{"name": 1}')
+    assert error.value.errors == {"name": ["Field must be a valid string"]}
+
+    with pytest.raises(ValidationError) as error:
+        schema.validate_json(b'{"name": ')
+    assert list(error.value.errors) == [cion.schema.RESERVED_ERROR_KEY]
+    assert error.value.errors[cion.schema.RESERVED_ERROR_KEY][0].startswith("Invalid JSON")
+
+    with pytest.raises(ValidationError) as error:
+        schema.validate_json(b"[]")
+    assert error.value.errors == {cion.schema.RESERVED_ERROR_KEY: ["Must be a JSON object"]}
+
+
+def test_result_cache():
+    calls = []
+
+    def counted(value):
+        calls.append(value)
+        return value
+
+    cache = cion.options.ResultCache(maxsize=2)
+    schema = cion.Schema(
+        fields={
+            "name": cion.Field(filters=[counted, cion.types.string()], required=True),
+            "age": cion.Field(filters=[cion.converters.integer()]),
+            "tags": cion.Field(),
+        },
+        options=cion.Options(cache=cache),
+    )
+
+    first = schema.validate({"name": "John", "age": "20", "ignored": [1]})
+    assert first == {"name": "John", "age": 20}
+    first["name"] = "changed"
+    # undeclared fields are not part of the key when they are ignored
+    assert schema.validate({"name": "John", "age": "20", "ignored": [2]}) == {"name": "John", "age": 20}
+    assert calls == ["John"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # values of a different type are not mixed up, even when they are equal
+    assert schema.validate({"name": "John", "age": 20}) == {"name": "John", "age": 20}
+    assert schema.validate({"name": "John", "age": True}) == {"name": "John", "age": True}
+    assert len(cache) == 2
+    assert calls == ["John"] * 3
+
+    # mutable values are never cached
+    schema.validate({"name": "John", "tags": ["a"]})
+    schema.validate({"name": "John", "tags": ["a"]})
+    assert calls == ["John"] * 5
+    assert schema.validate({"name": "John", "tags": ("a",)}) == {"name": "John", "tags": ("a",)}
+    assert schema.validate({"name": "John", "tags": ("a",)}) == {"name": "John", "tags": ("a",)}
+    assert calls == ["John"] * 6
+
+    # failures are cached too, along with the fields that they remove from the data
+    for _ in range(2):
+        data = {"name": 1, "age": "20"}
+        with pytest.raises(ValidationError) as error:
+            schema.validate(data)
+        assert error.value.errors == {"name": ["Field must be a valid string"]}
+        assert error.value.data == {"name": 1, "age": 20}
+        assert data == {"age": "20"}
+        error.value.errors["name"].append("changed")
+    assert calls == ["John"] * 6 + [1]
+
+    # validate_json shares the results of validate
+    with pytest.raises(ValidationError) as error:
+        schema.validate_json(b'{"name": 1, "age": "20"}')
+    assert error.value.errors == {"name": ["Field must be a valid string"]}
+    assert calls == ["John"] * 6 + [1]
+
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
+
+
+def test_result_cache_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cion.options, "monotonic", lambda: now[0])
+
+    cache = cion.options.ResultCache(ttl=10)
+    schema = cion.Schema(fields={"name": cion.Field(filters=[cion.types.string()])}, options=cion.Options(cache=cache))
+
+    schema.validate({"name": "John"})
+    now[0] += 5
+    schema.validate({"name": "John"})
+    now[0] += 10
+    schema.validate({"name": "John"})
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_result_cache_nondeterministic():
+    def now(value):
+        return value
+
+    now.deterministic = False
+
+    nested = cion.Schema(fields={"at": cion.Field(filters=[now])})
+    schema = cion.Schema(
+        fields={"event": cion.Field(schema=nested)}, options=cion.Options(cache=cion.options.ResultCache())
+    )
+    with pytest.raises(ValueError, match="event.at"):
+        schema.validate({"event": {"at": 1}})
+    with pytest.raises(ValueError, match="event.at"):
+        schema.validate_json(b'{"event": {"at": 1}}')
+
+    schema.options.cache = None
+    assert schema.validate({"event": {"at": 1}}) == {"event": {"at": 1}}
+
+    # so are checks
+    calls = []
+
+    def recent(at):
+        calls.append(at)
+
+    recent.deterministic = False
+    schema = cion.Schema(
+        fields={"at": cion.Field()},
+        options=cion.Options(cache=cion.options.ResultCache()),
+        checks=[cion.Check(recent, fields=["at"])],
+    )
+    with pytest.raises(ValueError, match="in: at"):
+        schema.validate({"at": 1})
+    schema.options.cache = None
+    for _ in range(2):
+        schema.validate({"at": 1})
+    assert calls == [1, 1]
+
+
+def profiled_schema(**options):
+    return cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string(), cion.validators.length(3, 64)], required=True),
+            "age": cion.Field(filters=[cion.converters.integer(), cion.validators.range_(0, 150)]),
+            "role": cion.Field(filters=[lambda value: value]),
+        },
+        options=cion.Options(**options),
+    )
+
+
+def test_profile():
+    schema = profiled_schema()
+    assert "_ns" not in schema.compile().__cion_source__
+
+    with schema.profile() as profile:
+        schema.validate({"name": "John", "age": "20", "role": "admin"})
+        with pytest.raises(ValidationError):
+            schema.validate({"name": "J", "age": "old"})
+        schema.validate_many([{"name": "John"}, {}])
+
+    assert schema.options.instrument is None
+    assert "_ns" not in schema.compile().__cion_source__
+
+    exported = profile.to_dict()
+    assert {name: (stats["calls"], stats["failures"]) for name, stats in exported.items()} == {
+        "name": (4, 2),
+        "age": (4, 1),
+        "role": (4, 0),
+    }
+    assert [(stats["filter"], stats["calls"], stats["failures"]) for stats in exported["name"]["filters"]] == [
+        ("cion.types.string", 3, 0),
+        ("cion.validators.length", 3, 1),
+    ]
+    assert [(stats["filter"], stats["calls"], stats["failures"]) for stats in exported["age"]["filters"]] == [
+        ("cion.converters.integer", 2, 1),
+        # the filter fails on "old" with a TypeError, which is not counted as a failure
+        ("cion.validators.range_", 2, 0),
+    ]
+    assert exported["role"]["filters"][0]["filter"].startswith("tests.test_schema.profiled_schema.<locals>.<lambda>")
+    assert all(stats["time_ns"] > 0 for stats in exported.values())
+    assert exported["name"]["time_ns"] >= sum(stats["time_ns"] for stats in exported["name"]["filters"])
+
+    profile.reset()
+    assert profile.to_dict()["name"]["calls"] == 0
+
+
+def test_profile_stop_on_error():
+    profile = cion.profiling.Profile()
+    schema = profiled_schema(stop_on_error=True, instrument=profile)
+
+    with pytest.raises(ValidationError):
+        schema.validate({"name": "John", "age": 200})
+
+    assert (profile.fields["age"].calls, profile.fields["age"].failures) == (1, 1)
+    assert (profile.filters["age", 1].calls, profile.filters["age", 1].failures) == (1, 1)
+    assert profile.fields["role"].calls == 0
+
+
+def test_profile_prometheus():
+    profile = cion.profiling.Profile()
+    schema = profiled_schema(instrument=profile)
+    schema.validate({"name": "John"})
+
+    lines = profile.to_prometheus(labels={"schema": 'user"s'}).splitlines()
+    assert "# TYPE cion_field_calls_total counter" in lines
+    assert 'cion_field_calls_total{schema="user\\"s",field="name"} 1' in lines
+    assert (
+        'cion_filter_failures_total{schema="user\\"s",field="name",position="1",filter="cion.validators.length"} 0'
+        in lines
+    )
+    assert any(line.startswith('cion_field_seconds_total{schema="user\\"s",field="name"} ') for line in lines)
+
+
+class User(NamedTuple):
+    email: Optional[str]
+    name: str
+    age: int
+
+
+@dataclasses.dataclass(slots=True)
+class UserData:
+    name: str
+    age: int
+    email: Optional[str]
+
+
+def output_schema(output, **options):
+    return cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string()], required=True),
+            "age": cion.Field(filters=[cion.converters.integer()], default=18),
+            "email": cion.Field(filters=[cion.validators.email()]),
+        },
+        options=cion.Options(**options),
+        output=output,
+    )
+
+
+@pytest.mark.parametrize("output", ["slots", User, UserData])
+@pytest.mark.parametrize("stop_on_error", [False, True])
+def test_output(output, stop_on_error):
+    schema = output_schema(output, stop_on_error=stop_on_error)
+    cls = schema.output_class
+
+    validated = schema.validate({"name": "John", "age": "20", "email": "john@example.com"})
+    assert validated.__class__ is cls
+    assert (validated.name, validated.age, validated.email) == ("John", 20, "john@example.com")
+    assert not hasattr(validated, "__dict__")
+    # missing fields are None
+    assert schema.validate({"name": "John"}) == cls(name="John", age=18, email=None)
+
+    # the data of the error is the same dict that a schema without an output has
+    with pytest.raises(ValidationError) as expected:
+        output_schema(None, stop_on_error=stop_on_error).validate({"name": "John", "age": "old"})
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"name": "John", "age": "old"})
+    assert error.value.errors == expected.value.errors == {"age": ["Field must be a valid integer"]}
+    assert error.value.data == expected.value.data
+
+    valid, errors = schema.validate_many([{"name": "John"}, {"name": 1}])
+    assert valid == {0: cls(name="John", age=18, email=None)}
+    assert errors == {1: {"name": ["Field must be a valid string"]}}
+
+    assert list(schema.iter_validate([{"name": 1}, {"name": "Jane", "age": 30}])) == [
+        (0, None, {"name": ["Field must be a valid string"]}),
+        (1, cls(name="Jane", age=30, email=None), None),
+    ]
+
+    assert pickle.loads(pickle.dumps(validated)) == validated
+
+
+def test_output_slots():
+    schema = output_schema("slots")
+    record = schema.validate({"name": "John", "age": 20})
+
+    assert schema.output_class.__slots__ == ("name", "age", "email")
+    assert output_schema("slots").output_class is schema.output_class
+    assert repr(record) == "Record(name='John', age=20, email=None)"
+    assert record._asdict() == {"name": "John", "age": 20, "email": None}
+
+    with pytest.raises(ValueError):
+        cion.Schema(fields={"first name": cion.Field()}, output="slots").validate({})
+
+
+def test_output_nested():
+    schema = cion.Schema(
+        fields={
+            "user": cion.Field(schema=output_schema(User), required=True),
+            "friends": cion.Field(items=output_schema("slots"), default=[]),
+        }
+    )
+
+    validated = schema.validate({"user": {"name": "John"}, "friends": [{"name": "Jane"}]})
+    assert validated["user"] == User(name="John", age=18, email=None)
+    assert validated["friends"][0]._asdict() == {"name": "Jane", "age": 18, "email": None}
+
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"user": {"name": 1}})
+    assert error.value.errors == {"user.name": ["Field must be a valid string"]}
+
+
+def test_output_parallel():
+    schema = output_schema(User)
+
+    valid, errors = schema.validate_parallel([{"name": "John"}, {"name": 1}], workers=1)
+    assert valid == {0: User(name="John", age=18, email=None)}
+    assert pickle.loads(pickle.dumps(schema)).output is User
+
+
+def test_output_invalid():
+    class Point(NamedTuple):
+        x: int
+        y: int
+
+    with pytest.raises(ValueError):
+        output_schema(Point).validate({"name": "John"})
+    with pytest.raises(ValueError):
+        output_schema(dict).validate({"name": "John"})
+    with pytest.raises(ValueError):
+        output_schema(User, extra=ExtraFields.COMBINE).validate({"name": "John"})
+    with pytest.raises(ValueError):
+        output_schema(User, cache=cion.options.ResultCache()).validate({"name": "John"})
+
+
+@pytest.mark.parametrize("stop_on_error", [False, True])
+def test_validate_partial(stop_on_error):
+    schema = cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string(), cion.validators.length(minimum=3)], required=True),
+            "age": cion.Field(filters=[cion.converters.integer()], default=18),
+            "address": cion.Field(schema=cion.Schema(fields={"city": cion.Field(required=True)})),
+        },
+        options=cion.Options(extra=ExtraFields.ERROR, stop_on_error=stop_on_error),
+    )
+    base = schema.validate({"name": "John", "age": "20"})
+
+    # missing fields are not required and don't get their default
+    assert schema.validate_partial({}) == {}
+    assert schema.validate_partial({"age": "30"}) == {"age": 30}
+    assert schema.validate_partial({"age": "30"}, base) == {"name": "John", "age": 30}
+    assert base == {"name": "John", "age": 20}
+
+    changes = {"name": "Jo", "age": "21"}
+    with pytest.raises(ValidationError) as error:
+        schema.validate_partial(changes, base)
+    assert error.value.errors == {"name": ["Length must be greater than 3"]}
+    assert changes == {"age": "21"}
+
+    with pytest.raises(ValidationError) as error:
+        schema.validate_partial({"address": {}, "role": "admin"})
+    if stop_on_error:
+        assert error.value.errors == {"address.city": ["This field is required"]}
+    else:
+        assert error.value.errors == {
+            "address.city": ["This field is required"],
+            "__schema__": ["Found extra data: role"],
+        }
+
+    schema.options = cion.Options(extra=ExtraFields.COMBINE)
+    assert schema.validate_partial({"role": "admin"}, base) == {"name": "John", "age": 20, "role": "admin"}
+
+
+def test_validate_partial_filters():
+    calls = []
+
+    def counted(value):
+        calls.append(value)
+        return value
+
+    schema = cion.Schema(fields={f"field{i}": cion.Field(filters=[counted], required=True) for i in range(10)})
+
+    assert schema.validate_partial({"field3": 3}) == {"field3": 3}
+    assert calls == [3]
+
+
+def ends_after_start(start, end):
+    if end <= start:
+        raise cion.ValidatorError("Must be after the start")
+
+
+def at_most_a_week(start, end):
+    if (end - start).days > 7:
+        return cion.Invalid("Must be at most a week after the start")
+
+
+def booking_schema(stop_on_error=False, output=None):
+    date = cion.converters.datetime()
+    return cion.Schema(
+        fields={
+            "start": cion.Field(filters=[date], required=True),
+            "end": cion.Field(filters=[date], required=True),
+            "nights": cion.Field(filters=[cion.converters.integer()]),
+        },
+        options=cion.Options(stop_on_error=stop_on_error),
+        output=output,
+        checks=[
+            cion.Check(ends_after_start, fields=["start", "end"]),
+            cion.Check(at_most_a_week, fields=["start", "end"]),
+            cion.Check(lambda nights: nights > 0 or cion.Invalid("Must be positive"), fields=["nights"]),
+        ],
+    )
+
+
+VALID_BOOKING = {"start": "2022-01-01", "end": "2022-01-03", "nights": "2"}
+
+
+def test_checks():
+    schema = booking_schema()
+
+    assert schema.validate(dict(VALID_BOOKING))["nights"] == 2
+
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"start": "2022-01-03", "end": "2022-01-01", "nights": "0"})
+    # the second check of the end is skipped, since the first one failed
+    assert error.value.errors == {"end": ["Must be after the start"], "nights": ["Must be positive"]}
+
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"start": "2022-01-01", "end": "2022-02-01"})
+    assert error.value.errors == {"end": ["Must be at most a week after the start"]}
+
+    # the checks of a field that failed, or is missing, are skipped
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"start": "soon", "end": "2022-01-01"})
+    assert error.value.errors == {"start": ["Field must be a valid datetime"]}
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"end": "2022-01-01"})
+    assert error.value.errors == {"start": ["This field is required"]}
+
+    result = schema.validate_many([dict(VALID_BOOKING), {"start": "2022-01-03", "end": "2022-01-01"}])
+    assert result.errors == {1: {"end": ["Must be after the start"]}}
+
+    schema.options = cion.Options(stop_on_error=True)
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"start": "2022-01-03", "end": "2022-01-01", "nights": "0"})
+    assert error.value.errors == {"end": ["Must be after the start"]}
+
+
+def test_checks_order():
+    calls = []
+
+    def record(name):
+        def check(*values):
+            calls.append(name)
+            if name == "first":
+                raise cion.ValidatorError("First failed")
+
+        return check
+
+    # each check runs as soon as its fields are validated, after the checks whose errors are keyed by its fields
+    schema = cion.Schema(
+        fields={name: cion.Field() for name in "abc"},
+        checks=[
+            cion.Check(record("late"), fields=["c"]),
+            cion.Check(record("dependent"), fields=["a", "b"]),
+            cion.Check(record("first"), fields=["a"], key="b"),
+        ],
+    )
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"a": 1, "b": 2, "c": 3})
+    assert calls == ["first", "late"]
+    assert error.value.errors == {"b": ["First failed"]}
+
+    # a check waits for the checks that are keyed by its fields, even when their own fields are validated later
+    calls.clear()
+    schema.checks = [
+        cion.Check(record("dependent"), fields=["a", "b"]),
+        cion.Check(record("first"), fields=["c"], key="a"),
+    ]
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"a": 1, "b": 2, "c": 3})
+    assert calls == ["first"]
+    assert error.value.errors == {"a": ["First failed"]}
+    assert [check.key for check in cion._checks.ordered(schema)] == ["a", "b"]
+
+    # but checks that wait for each other run in the order that they were declared in
+    calls.clear()
+    schema.checks = [
+        cion.Check(record("late"), fields=["c"], key="a"),
+        cion.Check(record("first"), fields=["a"], key="c"),
+        cion.Check(record("dependent"), fields=["b"], key="c"),
+    ]
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"a": 1, "b": 2, "c": 3})
+    assert calls == ["dependent", "late", "first"]
+    assert error.value.errors == {"c": ["First failed"]}
+
+    # a check that waits for a cycle runs after the whole cycle, even though it is declared first
+    calls.clear()
+    schema.checks = [
+        cion.Check(record("late"), fields=["a"], key="other"),
+        cion.Check(record("first"), fields=["a", "b"], key="a"),
+        cion.Check(record("dependent"), fields=["a", "b"], key="a"),
+    ]
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"a": 1, "b": 2, "c": 3})
+    assert calls == ["first"]
+    assert error.value.errors == {"a": ["First failed"]}
+    assert [check.key for check in cion._checks.ordered(schema)] == ["a", "a", "other"]
+
+    with pytest.raises(ValueError, match="missing"):
+        cion.Schema(fields={"a": cion.Field()}, checks=[cion.Check(record("a"), fields=["a", "missing"])]).compile()
+    with pytest.raises(ValueError):
+        cion.Check(record("a"), fields=[])
+
+
+@pytest.mark.parametrize("output", [None, "slots"])
+def test_checks_output(output):
+    schema = booking_schema(output=output)
+
+    assert schema.validate(dict(VALID_BOOKING)) is not None
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"start": "2022-01-03", "end": "2022-01-01"})
+    assert error.value.errors == {"end": ["Must be after the start"]}
+
+
+@pytest.mark.parametrize("stop_on_error", [False, True])
+def test_checks_async(stop_on_error):
+    schema = booking_schema(stop_on_error=stop_on_error)
+
+    assert asyncio.run(schema.validate_async(dict(VALID_BOOKING)))["nights"] == 2
+    with pytest.raises(ValidationError) as error:
+        asyncio.run(schema.validate_async({"start": "2022-01-03", "end": "2022-01-01", "nights": "0"}))
+    if stop_on_error:
+        assert error.value.errors == {"end": ["Must be after the start"]}
+        assert set(error.value.data) == {"start", "end", "nights"}
+    else:
+        assert error.value.errors == {"end": ["Must be after the start"], "nights": ["Must be positive"]}
+
+
+def test_checks_partial():
+    schema = booking_schema()
+    base = schema.validate(dict(VALID_BOOKING))
+
+    assert schema.validate_partial({"nights": "3"}, base)["nights"] == 3
+    with pytest.raises(ValidationError) as error:
+        schema.validate_partial({"end": "2021-12-31"}, base)
+    assert error.value.errors == {"end": ["Must be after the start"]}
+    # the checks of fields that didn't change don't run
+    assert schema.validate_partial({"nights": "3"}, {**base, "end": base["start"]})["nights"] == 3
+
+
+def test_checks_columns():
+    schema = booking_schema()
+
+    validated, masks, errors = schema.validate_columns(
+        {"start": ["2022-01-01", "2022-01-03", "soon"], "end": ["2022-01-02", "2022-01-01", "2022-01-01"]}
+    )
+    assert masks["start"] == [True, True, False]
+    assert masks["end"] == [True, False, True]
+    assert errors == {1: {"end": ["Must be after the start"]}, 2: {"start": ["Field must be a valid datetime"]}}
+
+
+def test_checks_describe():
+    schema = booking_schema()
+    schema.checks = schema.checks[:2]
+    description = schema.describe()
+
+    assert description["checks"][0] == {"function": ends_after_start, "fields": ["start", "end"], "key": "end"}
+    rebuilt = pickle.loads(pickle.dumps(schema))
+    with pytest.raises(ValidationError) as error:
+        rebuilt.validate({"start": "2022-01-03", "end": "2022-01-01"})
+    assert error.value.errors == {"end": ["Must be after the start"]}
+
+    del description["checks"]
+    assert cion.Schema.from_description(description).checks == []
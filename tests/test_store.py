@@ -0,0 +1,183 @@
+import copy
+import os
+import pickle
+import subprocess
+import sys
+import traceback
+from pathlib import Path
+
+import pytest
+
+import cion
+from cion import _compiler
+from cion.exceptions import ValidationError
+from cion.store import SchemaStore
+
+
+def even(value):
+    if value % 2:
+        raise cion.ValidatorError("Must be even")
+    return value
+
+
+def tenant_schema(tenant="acme"):
+    address = cion.Schema(fields={"city": cion.Field(filters=[cion.types.string()], required=True)})
+    item = cion.Schema(fields={"price": cion.Field(filters=[cion.converters.integer(), even], required=True)})
+    return cion.Schema(
+        fields={
+            "name": cion.Field(filters=[cion.types.string(), cion.validators.regex(f"{tenant}-[a-z]+")], required=True),
+            "email": cion.Field(filters=[cion.validators.email()]),
+            "role": cion.Field(filters=[cion.validators.one_of("admin", "user")], default="user"),
+            "address": cion.Field(schema=address),
+            "items": cion.Field(items=item, default=[]),
+        },
+        options=cion.Options(extra=cion.options.ExtraFields.ERROR),
+    )
+
+
+VALID = {"name": "acme-john", "address": {"city": "Paris"}, "items": [{"price": "2"}]}
+INVALID = {"name": "john", "email": "john", "address": {"city": 1}, "items": [{"price": 3}], "age": 20}
+
+
+@pytest.fixture
+def no_compile(monkeypatch):
+    """Fail if a generated function is compiled, instead of being loaded from the store"""
+
+    def compile_(*args, **kwargs):
+        raise AssertionError("compiled")
+
+    monkeypatch.setattr(_compiler, "_precompiled", {})
+    yield lambda: monkeypatch.setattr(_compiler, "compile", compile_, raising=False)
+
+
+def check(schema):
+    assert schema.validate(copy.deepcopy(VALID)) == {
+        "name": "acme-john",
+        "role": "user",
+        "address": {"city": "Paris"},
+        "items": [{"price": 2}],
+    }
+    with pytest.raises(ValidationError) as error:
+        schema.validate(copy.deepcopy(INVALID))
+    assert error.value.errors == {
+        "name": ["Must match regex"],
+        "email": ["Must be an email"],
+        "address.city": ["Field must be a valid string"],
+        "items.0.price": ["Must be even"],
+        "__schema__": ["Found extra data: age"],
+    }
+    assert schema.validate_json(b'{"name": "acme-jane"}')["name"] == "acme-jane"
+    assert schema.validate_many(copy.deepcopy([VALID, INVALID])).errors.keys() == {1}
+
+
+def test_dumps_loads(no_compile):
+    data = cion.store.dumps(tenant_schema())
+
+    no_compile()
+    schema = cion.store.loads(data)
+    check(schema)
+
+    # the filters aren't part of the source, so the code is shared with schemas that only differ in them
+    check(tenant_schema())
+    # but a schema with different source is compiled
+    with pytest.raises(AssertionError, match="compiled"):
+        cion.Schema(fields={"name": cion.Field()}).validate({})
+
+
+def test_fingerprint():
+    assert cion.store.fingerprint(tenant_schema()) == cion.store.fingerprint(tenant_schema())
+    assert cion.store.fingerprint(tenant_schema()) != cion.store.fingerprint(tenant_schema("other"))
+
+    with pytest.raises(ValueError):
+        cion.store.fingerprint(cion.Schema(fields={"name": cion.Field(filters=[lambda value: value])}))
+
+
+def test_fingerprint_other_processes():
+    # the values are in the order of a set, which changes with the hash seed of the process
+    script = """
+import cion
+currency = cion.validators.one_of(*{"usd", "eur", "gbp", "jpy", "chf"})
+tags = cion.Field(default=frozenset({"a", "b", "c", "d"}))
+print(cion.store.fingerprint(cion.Schema(fields={"currency": cion.Field(filters=[currency]), "tags": tags})))
+"""
+    root = Path(__file__).parents[1]
+    fingerprints = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=root,
+            env={**os.environ, "PYTHONHASHSEED": str(seed)},
+        ).stdout.strip()
+        for seed in range(4)
+    }
+    assert len(fingerprints) == 1
+
+
+def test_schema_store(tmp_path, no_compile):
+    store = SchemaStore(tmp_path / "schemas")
+    key = store.save(tenant_schema())
+
+    assert store.path(key).exists()
+    assert [path.name for path in store.directory.iterdir()] == [store.path(key).name]
+    with pytest.raises(KeyError):
+        store.load("0" * 64)
+
+    no_compile()
+    check(store.load(key))
+    check(store.prepare(tenant_schema()))
+
+
+def test_schema_store_prepare(tmp_path):
+    store = SchemaStore(tmp_path)
+    schema = store.prepare(tenant_schema())
+
+    check(schema)
+    assert store.path(cion.store.fingerprint(schema)).exists()
+
+    # a file that can't be loaded is replaced
+    store.path(cion.store.fingerprint(schema)).write_bytes(b"garbage")
+    check(store.prepare(tenant_schema()))
+    assert store.load(cion.store.fingerprint(schema))
+
+    with pytest.raises(ValueError):
+        cion.store.loads(b"garbage")
+
+    # so is a file that was cut short, or whose code is corrupt, whatever the error it fails with
+    data = cion.store.dumps(schema)
+    stored = pickle.loads(data)
+    stored["code"] = {digest: code[:10] for digest, code in stored["code"].items()}
+    for corrupt in (data[: len(data) // 2], data[:-1], pickle.dumps(stored), pickle.dumps({"format": 1})):
+        store.path(cion.store.fingerprint(schema)).write_bytes(corrupt)
+        with pytest.raises(ValueError):
+            cion.store.loads(corrupt)
+        check(store.prepare(tenant_schema()))
+        assert store.load(cion.store.fingerprint(schema))
+
+
+def test_traceback(no_compile):
+    data = cion.store.dumps(cion.Schema(fields={"name": cion.Field(filters=[cion.types.string()])}))
+    no_compile()
+    schema = cion.store.loads(data)
+
+    with pytest.raises(ValidationError) as error:
+        schema.validate({"name": 1})
+    formatted = "".join(traceback.format_exception(error.value))
+    # the source of the stored code is registered, under a name that doesn't depend on the order of compilation
+    assert "<cion stored validate" in formatted
+    assert "raise _ValidationError._from_entries(errors, filtered)" in formatted
+
+
+def test_other_process(tmp_path):
+    script = f"""
+from tests.test_store import tenant_schema
+from cion.store import SchemaStore
+print(SchemaStore({str(tmp_path)!r}).save(tenant_schema()))
+"""
+    root = Path(__file__).parents[1]
+    key = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True, cwd=root
+    ).stdout.strip()
+
+    check(SchemaStore(tmp_path).load(key))
@@ -1,3 +1,4 @@
+import re
 from contextlib import nullcontext
 from uuid import UUID
 
@@ -47,3 +48,69 @@ DOES_NOT_RAISE = nullcontext()
 def test_types(type_, value, expected_value, expectation):
     with expectation:
         assert type_(value) == expected_value
+
+
+@pytest.mark.parametrize(
+    ("validator", "value", "message"),
+    [
+        (validators.range_(minimum=3), 1, "Number must be between 3 and infinity"),
+        (validators.range_(maximum=3), 5, "Number must be between 0 and 3"),
+        (validators.one_of("a", 1), "b", "Value must be one of a, 1"),
+        (validators.not_one_of("a", 1), 1, "Value must not be one of a, 1"),
+        (validators.equal_to("a"), "b", "Must be equal to a"),
+    ],
+)
+def test_error_messages(validator, value, message):
+    with pytest.raises(cion.exceptions.ValidatorError) as error:
+        validator(value)
+    assert error.value.message == message
+
+
+NAN = float("nan")
+
+
+@pytest.mark.parametrize(
+    ("values", "value", "expected"),
+    [
+        (tuple(range(10_000)), 9_999, True),
+        (tuple(range(10_000)), 10_000, False),
+        ((1, 2), True, True),  # True == 1
+        ((True,), 1, True),
+        ((0,), False, True),
+        ((1, 2), [1], False),  # unhashable value, hashable values
+        (([1], [2]), [2], True),  # unhashable values that can be ordered
+        (([1], [2]), [3], False),
+        (([1], [2]), 1, False),  # a value that can't be compared to the values
+        (([1], {"a": 1}), {"a": 1}, True),  # unhashable values that can't be ordered
+        (([1], {"a": 1}), {"a": 2}, False),
+        (({1, 2}, {3}), {3}, True),  # sets are only partially ordered
+        (({1, 2}, {3}), {4}, False),
+        (([1], [NAN], [0]), [0], True),  # NaN isn't ordered
+        (([1], [NAN], [0]), [NAN], True),  # the same NaN, which membership finds by identity
+        (([1], ["a"]), ["a"], True),  # values of different types
+    ],
+)
+def test_one_of_lookup(values, value, expected):
+    with DOES_NOT_RAISE if expected else RAISES:
+        validators.one_of(*values)(value)
+    with RAISES if expected else DOES_NOT_RAISE:
+        validators.not_one_of(*values)(value)
+
+
+def test_pattern_cache():
+    validators.compile_pattern.cache_clear()
+
+    validators.email()
+    validators.url()
+    validators.regex("[a-z]+")
+    assert validators.compile_pattern.cache_info().misses == 3
+
+    for _ in range(10):
+        validators.email()
+        validators.url()
+        validators.regex("[a-z]+", error_message="Must be lowercase")
+    info = validators.compile_pattern.cache_info()
+    assert (info.hits, info.misses) == (30, 3)
+
+    assert validators.compile_pattern("[a-z]+") is validators.compile_pattern("[a-z]+")
+    assert validators.compile_pattern("[a-z]+") is not validators.compile_pattern("[a-z]+", re.IGNORECASE)
@@ -0,0 +1,67 @@
+import random
+from contextlib import nullcontext
+
+import pytest
+
+import cion
+
+RAISES = pytest.raises(cion.exceptions.ValidatorError)
+DOES_NOT_RAISE = nullcontext()
+
+ENGINES = ("regex", "parse")
+
+urls = []
+with open("tests/url/urls", encoding="utf-8") as f:
+    for line in f.readlines():
+        if line.startswith("#") or line.startswith("\n"):
+            continue
+        url, raises = line.rstrip("\n").rsplit(",", 1)
+        urls.append((url, raises == "true"))
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize(("url", "raises"), urls)
+def test_url(url, raises, engine):
+    with RAISES if raises else DOES_NOT_RAISE:
+        assert cion.validators.url(engine=engine)(url) == url
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_url_schemes(engine):
+    assert cion.validators.url(["ftp"], engine=engine)("FTP://example.com") == "FTP://example.com"
+    with RAISES:
+        cion.validators.url(["ftp"], engine=engine)("https://example.com")
+
+
+def _random_urls(count):
+    generator = random.Random(0)
+    alphabet = "aZ09-@:%_+~#=.?&/ \nſıİKé"
+    for _ in range(count):
+        host, letters, end = (
+            "".join(generator.choices(characters, k=generator.randint(0, length)))
+            for characters, length in ((alphabet[:17], 8), ("aZ", 4), (alphabet[:17], 1))
+        )
+        if generator.random() < 0.3:
+            host, letters, end = (part + generator.choice(alphabet) for part in (host, letters, end))
+        scheme = generator.choice(["http", "https", "HTTPS", "ftp", ""])
+        yield f"{scheme}://{host}.{letters}{end}" if generator.random() < 0.8 else f"{host}{letters}{end}"
+
+
+def test_url_engines_agree():
+    regex = cion.validators.url().check
+    parse = cion.validators.url(engine="parse").check
+    accepted = 0
+    for url in _random_urls(5000):
+        expected = regex(url)
+        if expected.__class__ is cion.Invalid:
+            assert parse(url).__class__ is cion.Invalid, url
+        else:
+            assert parse(url) == expected, url
+            accepted += 1
+    # the generated URLs are not all rejected
+    assert accepted > 100
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        cion.validators.url(engine="slow")